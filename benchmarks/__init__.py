@@ -0,0 +1,6 @@
+"""Offline performance benchmarks for OSINT Hunter.
+
+``corpus`` builds synthetic problems, ``stub_server`` stands in for the provider
+APIs and ``runner`` times the agent against both and compares the numbers with
+a stored baseline. See ``python -m benchmarks.runner --help``.
+"""
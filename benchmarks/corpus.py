@@ -0,0 +1,80 @@
+"""Deterministic synthetic problem corpus covering the main input shapes."""
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import Dict, List, Optional
+
+KINDS = ("text", "urls", "ips", "images", "dump")
+
+_WORDS = (
+    "flag hidden tower station river bridge profile archive account photo posted "
+    "festival museum street mirror server login leaked backup domain snapshot"
+).split()
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def _ip(rng: random.Random) -> str:
+    return ".".join(str(rng.randint(1, 254)) for _ in range(4))
+
+
+def _handle(rng: random.Random) -> str:
+    return f"user_{rng.randint(1000, 9999)}"
+
+
+def _write_images(image_dir: Path, count: int) -> List[str]:
+    from PIL import Image
+
+    image_dir.mkdir(parents=True, exist_ok=True)
+    paths: List[str] = []
+    for i in range(count):
+        path = image_dir / f"bench_{i}.jpg"
+        if not path.exists():
+            Image.new("RGB", (64, 48), (40 * i % 255, 90, 160)).save(path, "JPEG")
+        paths.append(str(path))
+    return paths
+
+
+def build_corpus(per_kind: int = 3, image_dir: Optional[Path] = None, seed: int = 1337) -> List[Dict]:
+    """Return ``per_kind`` problems of each kind as batch-style records.
+
+    Local images are written to ``image_dir`` (skipped when it is None).
+    """
+
+    rng = random.Random(seed)
+    images = _write_images(image_dir, per_kind) if image_dir is not None else []
+    problems: List[Dict] = []
+    for n in range(per_kind):
+        handle = _handle(rng)
+        problems.append(
+            {"id": f"text-{n}", "kind": "text", "prompt": f"{_sentence(rng)} @{handle} #{rng.choice(_WORDS)}", "urls": [], "images": []}
+        )
+        urls = [f"https://{rng.choice(_WORDS)}{i}.example.com/@{_handle(rng)}/post/{rng.randint(1, 99999)}" for i in range(8)]
+        problems.append(
+            {"id": f"urls-{n}", "kind": "urls", "prompt": f"{_sentence(rng)} see {urls[0]} and {urls[1]}.", "urls": urls[2:], "images": []}
+        )
+        ips = [_ip(rng) for _ in range(5)]
+        problems.append(
+            {"id": f"ips-{n}", "kind": "ips", "prompt": f"{_sentence(rng)} hosts {', '.join(ips)} on corp{n}.example.org", "urls": [], "images": []}
+        )
+        problems.append(
+            {
+                "id": f"images-{n}",
+                "kind": "images",
+                "prompt": f"Where was this taken? {_sentence(rng, 6)} 35.{rng.randint(1000, 9999)}, 139.{rng.randint(1000, 9999)}",
+                "urls": [],
+                "images": images[n : n + 1] + [f"https://img.example.com/{n}.jpg"],
+            }
+        )
+        lines = []
+        for i in range(2000):
+            lines.append(
+                f"[{i:05d}] {_sentence(rng, 8)} {_ip(rng)} admin{i}@corp{n}.example.org "
+                f"https://leak{i % 50}.example.net/{_handle(rng)} @{_handle(rng)}"
+            )
+        problems.append({"id": f"dump-{n}", "kind": "dump", "prompt": "\n".join(lines), "urls": [], "images": []})
+    return problems
@@ -0,0 +1,107 @@
+"""Measure CLI start-up cost: import time and an offline one-shot run.
+
+Each sample is a fresh interpreter, so numbers include module loading::
+
+    PYTHONPATH=src python -m benchmarks.import_time --budget-ms 1500
+
+Also fails if an offline text-only run loads a dependency it should not need.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Only needed with an LLM key, images, or a Tavily key respectively.
+LAZY_MODULES = ("langchain_openai", "openai", "PIL", "tavily")
+
+_OFFLINE_RUN = (
+    "import json, sys\n"
+    "from osinthunter.main import main\n"
+    "main(['Find the flag from @sample_user at https://example.com'])\n"
+    "print(json.dumps(sorted(m for m in {mods!r} if m in sys.modules)), file=sys.stderr)\n"
+)
+
+
+def _clean_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    for key in ("OPENAI_API_KEY", "OPENROUTER_API_KEY", "TAVILY_API_KEY"):
+        env.pop(key, None)
+    env["OSINTHUNTER_ALLOW_NETWORK"] = "false"
+    return env
+
+
+def import_profile(module: str) -> Tuple[float, List[Tuple[int, str]]]:
+    """Total import time of ``module`` (ms) and the heaviest second-level imports."""
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=_clean_env(), check=True,
+    )
+    total_us = 0
+    heavy: List[Tuple[int, str]] = []
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if not line.startswith("import time:") or len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        cumulative, raw_name = int(parts[1]), parts[2]
+        # -X importtime indents two spaces per nesting level after one separator space.
+        level = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        if level == 0:
+            total_us += cumulative
+        elif level == 1:
+            heavy.append((cumulative, raw_name.strip()))
+    return total_us / 1000, sorted(heavy, reverse=True)[:8]
+
+
+def offline_run() -> Tuple[float, List[str]]:
+    """Wall time (ms) of a one-shot offline CLI run and the lazy modules it loaded."""
+
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", _OFFLINE_RUN.format(mods=LAZY_MODULES)],
+        capture_output=True, text=True, env=_clean_env(), check=True,
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    return elapsed, json.loads(proc.stderr.strip().splitlines()[-1])
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure OSINT Hunter import and CLI start-up time")
+    parser.add_argument("--module", default="osinthunter.agent")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=0.0, help="Fail if the median import exceeds this")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    imports = [import_profile(args.module) for _ in range(args.repeat)]
+    runs = [offline_run() for _ in range(args.repeat)]
+
+    median_import = statistics.median(total for total, _ in imports)
+    median_run = statistics.median(ms for ms, _ in runs)
+    print(f"import {args.module}: median {median_import:.0f} ms over {args.repeat} runs")
+    for cumulative, name in imports[-1][1]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    print(f"offline CLI run: median {median_run:.0f} ms")
+
+    failed = False
+    loaded = sorted({m for _, mods in runs for m in mods})
+    if loaded:
+        print(f"FAIL: offline run imported {', '.join(loaded)}")
+        failed = True
+    if args.budget_ms and median_import > args.budget_ms:
+        print(f"FAIL: import exceeds budget of {args.budget_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
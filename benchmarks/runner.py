@@ -0,0 +1,242 @@
+"""Time the agent on the synthetic corpus against the stub providers.
+
+Reports per-node and per-tool latency percentiles, per-kind problem latency,
+throughput and peak memory, and compares them with a stored baseline::
+
+    PYTHONPATH=src python -m benchmarks.runner                    # compare
+    PYTHONPATH=src python -m benchmarks.runner --update-baseline  # re-record
+
+Exits with status 1 when a metric regressed beyond ``--tolerance``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional
+
+from osinthunter.agent import OSINTAgent
+from osinthunter.config import load_config
+from osinthunter.langgraph_runner import shutdown, warmup
+from osinthunter.models import ProblemInput
+from osinthunter.tools.http import PROVIDER_BASE_URL_ENV
+
+from .corpus import build_corpus
+from .stub_server import StubProviderServer
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+# Dummy credentials so every network agent takes its API path to the stub.
+_BENCH_ENV = {
+    "OSINTHUNTER_ALLOW_NETWORK": "true",
+    "OSINTHUNTER_CACHE": "false",
+    "OSINTHUNTER_IMAGE_INDEX": "false",
+    "OSINTHUNTER_EVIDENCE_DB": "false",
+    # The stub server has no quota; measure the pipeline, not the configured rates.
+    "OSINTHUNTER_RATE_LIMIT": "false",
+    "SERPAPI_API_KEY": "bench",
+    "SHODAN_API_KEY": "bench",
+    "CENSYS_API_ID": "bench",
+    "CENSYS_API_SECRET": "bench",
+    "HUNTER_API_KEY": "bench",
+    "BUILTWITH_API_KEY": "bench",
+}
+# Real services and LLMs stay out of the measurement.
+_UNSET_ENV = ("OPENAI_API_KEY", "OPENROUTER_API_KEY", "TAVILY_API_KEY", "BING_API_KEY")
+
+
+@contextmanager
+def bench_env(base_url: str, workdir: Path) -> Iterator[None]:
+    saved = {key: os.environ.get(key) for key in (*_BENCH_ENV, *_UNSET_ENV, PROVIDER_BASE_URL_ENV, "OSINTHUNTER_LOG_PATH")}
+    os.environ.update(_BENCH_ENV)
+    os.environ[PROVIDER_BASE_URL_ENV] = base_url
+    # Benchmark runs must not land in the user's run log.
+    os.environ["OSINTHUNTER_LOG_PATH"] = str(workdir / "agent_runs.jsonl")
+    for key in _UNSET_ENV:
+        os.environ.pop(key, None)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def _describe(samples: Mapping[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    return {
+        name: {
+            "count": len(values),
+            "mean_ms": 1000 * sum(values) / len(values),
+            "p50_ms": 1000 * percentile(values, 50),
+            "p95_ms": 1000 * percentile(values, 95),
+            "p99_ms": 1000 * percentile(values, 99),
+        }
+        for name, values in sorted(samples.items())
+        if values
+    }
+
+
+def _solve(agent: OSINTAgent, record: Dict, nodes: Dict, tools: Dict) -> None:
+    problem = ProblemInput(text=record["prompt"], urls=list(record["urls"]), image_paths=list(record["images"]))
+    last = time.perf_counter()
+    for node, payload in agent.stream(problem, tool_events=True):
+        if node == "tool":
+            tools[payload["tool"]].append(payload["elapsed"])
+            continue
+        now = time.perf_counter()
+        nodes[node].append(now - last)
+        last = now
+
+
+def run_benchmark(problems: List[Dict], repeat: int = 1, measure_memory: bool = True) -> Dict:
+    """Run ``problems`` ``repeat`` times and return the report (env must be set up)."""
+
+    config = load_config()
+    warmup(config)
+    agent = OSINTAgent(config=config)
+    _solve(agent, problems[0], defaultdict(list), defaultdict(list))  # connections, lazy imports
+
+    nodes: Dict[str, List[float]] = defaultdict(list)
+    tools: Dict[str, List[float]] = defaultdict(list)
+    kinds: Dict[str, List[float]] = defaultdict(list)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for record in problems:
+            t0 = time.perf_counter()
+            _solve(agent, record, nodes, tools)
+            kinds[record["kind"]].append(time.perf_counter() - t0)
+    wall = time.perf_counter() - started
+
+    peak_mb = 0.0
+    if measure_memory:
+        # Separate pass: tracemalloc slows allocation-heavy code and would skew latencies.
+        tracemalloc.start()
+        for record in problems:
+            _solve(agent, record, defaultdict(list), defaultdict(list))
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+
+    runs = repeat * len(problems)
+    return {
+        "problems": runs,
+        "wall_s": wall,
+        "throughput_per_s": runs / wall if wall else 0.0,
+        "peak_traced_mb": peak_mb,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "kinds": _describe(kinds),
+        "nodes": _describe(nodes),
+        "tools": _describe(tools),
+    }
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float = 0.25, floor_ms: float = 2.0) -> List[str]:
+    """List metrics that are more than ``tolerance`` worse than ``baseline``.
+
+    Latency changes smaller than ``floor_ms`` are ignored as noise.
+    """
+
+    regressions: List[str] = []
+    for section in ("kinds", "nodes", "tools"):
+        for name, base in baseline.get(section, {}).items():
+            current = report.get(section, {}).get(name)
+            if current is None:
+                continue
+            for metric in ("p50_ms", "p95_ms"):
+                old, new = base[metric], current[metric]
+                if new > old * (1 + tolerance) and new - old > floor_ms:
+                    regressions.append(f"{section}.{name}.{metric}: {old:.1f} -> {new:.1f}")
+    if report["throughput_per_s"] < baseline.get("throughput_per_s", 0.0) / (1 + tolerance):
+        regressions.append(f"throughput_per_s: {baseline['throughput_per_s']:.2f} -> {report['throughput_per_s']:.2f}")
+    base_peak = baseline.get("peak_traced_mb", 0.0)
+    if base_peak and report["peak_traced_mb"] > base_peak * (1 + tolerance):
+        regressions.append(f"peak_traced_mb: {base_peak:.1f} -> {report['peak_traced_mb']:.1f}")
+    return regressions
+
+
+def format_report(report: Dict) -> str:
+    lines = [
+        f"{report['problems']} problems in {report['wall_s']:.2f}s "
+        f"({report['throughput_per_s']:.2f}/s), peak traced {report['peak_traced_mb']:.1f} MB, "
+        f"max RSS {report['max_rss_mb']:.0f} MB"
+    ]
+    for section in ("kinds", "nodes", "tools"):
+        lines.append(f"\n# {section}")
+        for name, stats in report[section].items():
+            lines.append(
+                f"- {name:<20} n={stats['count']:<4} p50={stats['p50_ms']:8.1f}ms "
+                f"p95={stats['p95_ms']:8.1f}ms p99={stats['p99_ms']:8.1f}ms"
+            )
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline OSINT Hunter benchmark")
+    parser.add_argument("--per-kind", type=int, default=3, help="Problems per corpus kind")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Stub provider latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of stub responses that are HTTP 500")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown before failing")
+    parser.add_argument("--json", type=Path, help="Also write the full report here")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    stub = StubProviderServer(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, error_rate=args.error_rate)
+    with tempfile.TemporaryDirectory(prefix="osinthunter-bench-") as tmp, stub, bench_env(stub.base_url, Path(tmp)):
+        problems = build_corpus(per_kind=args.per_kind, image_dir=Path(tmp))
+        try:
+            report = run_benchmark(problems, repeat=args.repeat)
+        finally:
+            shutdown()
+        report["settings"] = {
+            "per_kind": args.per_kind,
+            "repeat": args.repeat,
+            "latency_ms": args.latency_ms,
+            "error_rate": args.error_rate,
+        }
+        report["stub_requests"] = dict(stub.requests)
+
+    print(format_report(report))
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one")
+        return 0
+    regressions = compare(report, json.loads(args.baseline.read_text(encoding="utf-8")), tolerance=args.tolerance)
+    if regressions:
+        print("\n# Regressions")
+        print("\n".join(f"- {line}" for line in regressions))
+        return 1
+    print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""Local stand-in for the provider APIs the network agents call.
+
+Requests arrive as ``/<original host>/<original path>`` (see
+``OSINTHUNTER_PROVIDER_BASE_URL`` in ``osinthunter.tools.http``) and get canned
+JSON shaped like the real SerpAPI, Bing, Shodan, Censys, BuiltWith, Hunter,
+Wayback and Lens responses. Latency and error rate are configurable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+Params = Mapping[str, str]
+
+
+def _serpapi(path: str, params: Params) -> Any:
+    if params.get("engine") == "google_lens":
+        return {"visual_matches": [{"title": f"Lens match {i}", "link": f"https://match{i}.example.com/"} for i in range(3)]}
+    q = params.get("q", "")
+    return {"organic_results": [{"title": f"{q} #{i}", "link": f"https://r{i}.example.com/", "snippet": q} for i in range(3)]}
+
+
+def _bing(path: str, params: Params) -> Any:
+    q = params.get("q", "")
+    return {"webPages": {"value": [{"name": f"{q} #{i}", "url": f"https://b{i}.example.com/", "snippet": q} for i in range(3)]}}
+
+
+def _shodan(path: str, params: Params) -> Any:
+    return {"ip_str": path.rsplit("/", 1)[-1], "org": "Stub Org", "isp": "Stub ISP", "ports": [22, 80, 443]}
+
+
+def _censys(path: str, params: Params) -> Any:
+    return {"result": {"ip": path.rsplit("/", 1)[-1], "services": [{"service_name": "HTTP"}, {"service_name": "SSH"}]}}
+
+
+def _builtwith(path: str, params: Params) -> Any:
+    return {"Results": [{"Paths": [{"Technologies": [{"Name": "nginx"}, {"Name": "React"}]}]}]}
+
+
+def _hunter(path: str, params: Params) -> Any:
+    domain = params.get("domain", "example.com")
+    return {"data": {"pattern": "{first}", "emails": [{"value": f"admin@{domain}"}, {"value": f"info@{domain}"}]}}
+
+
+def _wayback(path: str, params: Params) -> Any:
+    target = params.get("url", "")
+    return {"archived_snapshots": {"closest": {"available": True, "timestamp": "20200101000000", "url": f"https://web.archive.org/web/2020/{target}"}}}
+
+
+PROVIDERS: Dict[str, Tuple[str, Callable[[str, Params], Any]]] = {
+    "serpapi.com": ("serpapi", _serpapi),
+    "api.bing.microsoft.com": ("bing", _bing),
+    "api.shodan.io": ("shodan", _shodan),
+    "search.censys.io": ("censys", _censys),
+    "api.builtwith.com": ("builtwith", _builtwith),
+    "api.hunter.io": ("hunter", _hunter),
+    "archive.org": ("wayback", _wayback),
+}
+
+
+class StubProviderServer:
+    """Threaded HTTP server answering like the real providers.
+
+    ``latency`` (seconds) plus up to ``jitter`` is slept before every answer;
+    ``per_provider_latency`` overrides it by provider name. A fraction
+    ``error_rate`` of requests gets HTTP 500.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        per_provider_latency: Optional[Mapping[str, float]] = None,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.per_provider_latency = dict(per_provider_latency or {})
+        self.requests: Counter = Counter()
+        self.errors: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubProviderServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-providers", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+
+    def __enter__(self) -> "StubProviderServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _plan(self, provider: str) -> Tuple[float, bool]:
+        with self._lock:
+            self.requests[provider] += 1
+            delay = self.per_provider_latency.get(provider, self.latency) + self._rng.uniform(0, self.jitter)
+            fail = self._rng.random() < self.error_rate
+            if fail:
+                self.errors[provider] += 1
+        return delay, fail
+
+    def _handler_class(self) -> type:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                parts = urlsplit(self.path)
+                host, _, path = parts.path.lstrip("/").partition("/")
+                params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                provider, respond = PROVIDERS.get(host, (host or "unknown", None))
+                delay, fail = stub._plan(provider)
+                time.sleep(delay)
+                if respond is None:
+                    self._send(404, {"error": f"unknown provider host {host!r}"})
+                elif fail:
+                    self._send(500, {"error": "injected failure"})
+                else:
+                    self._send(200, respond("/" + path, params))
+
+            def _send(self, status: int, payload: Any) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+def parse_args(argv: Optional[list] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve canned provider responses for offline runs")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list] = None) -> None:
+    args = parse_args(argv)
+    server = StubProviderServer(
+        port=args.port, latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, error_rate=args.error_rate
+    )
+    print(f"Stub providers on {server.base_url}; export OSINTHUNTER_PROVIDER_BASE_URL={server.base_url}")
+    server.start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,18 @@
 """OSINT Hunter package for building agentic CTF solvers."""
 
-from .agent import OSINTAgent
+from __future__ import annotations
+
+from typing import Any
+
 from .models import ProblemInput, AgentResult, Evidence
 
 __all__ = ["OSINTAgent", "ProblemInput", "AgentResult", "Evidence"]
+
+
+def __getattr__(name: str) -> Any:
+    # The agent pulls in LangGraph; only import it when it is actually used.
+    if name == "OSINTAgent":
+        from .agent import OSINTAgent
+
+        return OSINTAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,5 @@
+"""Allow ``python -m osinthunter`` (and ``python -m osinthunter batch``)."""
+
+from .main import main
+
+main()
@@ -6,67 +6,36 @@ LangGraph 版の多段エージェントは langgraph_runner.build_langgraph_app
 from __future__ import annotations
 
 import re
-from typing import Iterable, List, Sequence
+import uuid
+import weakref
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
 
 from .config import OSINTConfig, load_config
+from .executor import ToolExecutor
 from .memory import EvidenceStore
 from .models import AgentResult, Evidence, PlanStep, ProblemInput
-from .tools import (
-    GeolocationAgent,
-    ImageOSINTAgent,
-    SNSOSINTAgent,
-    TavilySearchAgent,
-    TextAnalysisAgent,
-    URLInvestigationAgent,
-    WebSearchAgent,
-    GoogleLensAgent,
-    ShodanAgent,
-    CensysAgent,
-    WhoisAgent,
-    BuiltWithAgent,
-    HunterAgent,
-    PhonebookAgent,
-    WaybackAgent,
-    SocialSearchAgent,
-    SherlockAgent,
-    EarthViewAgent,
-    YandexReverseImageAgent,
-)
 from .tools.base import Agent as SubAgent
-from .langgraph_runner import build_langgraph_app
+from .langgraph_runner import build_langgraph_app, get_compiled_app, get_tools
 
 
 class OSINTAgent:
     def __init__(self, config: OSINTConfig | None = None, tools: Sequence[SubAgent] | None = None) -> None:
         self.config = config or load_config()
-        self.tools: List[SubAgent] = list(tools) if tools is not None else self._default_tools()
+        # Default tools and the compiled graph are process-wide and shared by
+        # every OSINTAgent with the same config; custom tools get a private graph.
+        self.tools: List[SubAgent] = list(tools) if tools is not None else get_tools(self.config)
+        self._custom_app = None
+        if tools is not None:
+            executor = ToolExecutor(max_workers=self.config.tool_workers, timeout=self.config.tool_timeout)
+            self._custom_app = build_langgraph_app(self.config, tools=self.tools, executor=executor).compile()
+            # The private graph's tool threads go away with the agent, or on close().
+            self._release = weakref.finalize(self, executor.shutdown)
 
-    def _default_tools(self) -> List[SubAgent]:
-        return [
-            TextAnalysisAgent(),
-            URLInvestigationAgent(),
-            SNSOSINTAgent(),
-            WebSearchAgent(
-                serpapi_api_key=self.config.serpapi_api_key,
-                bing_api_key=self.config.bing_api_key,
-                allow_network=self.config.allow_network,
-            ),
-            GeolocationAgent(),
-            ImageOSINTAgent(),
-            TavilySearchAgent(api_key=self.config.tavily_api_key, allow_network=self.config.allow_network),
-            GoogleLensAgent(serpapi_api_key=self.config.serpapi_api_key, allow_network=self.config.allow_network),
-            ShodanAgent(api_key=self.config.shodan_api_key, allow_network=self.config.allow_network),
-            CensysAgent(api_id=self.config.censys_api_id, api_secret=self.config.censys_api_secret, allow_network=self.config.allow_network),
-            WhoisAgent(),
-            BuiltWithAgent(api_key=self.config.builtwith_api_key, allow_network=self.config.allow_network),
-            HunterAgent(api_key=self.config.hunter_api_key, allow_network=self.config.allow_network),
-            PhonebookAgent(),
-            WaybackAgent(allow_network=self.config.allow_network),
-            SocialSearchAgent(),
-            SherlockAgent(),
-            EarthViewAgent(),
-            YandexReverseImageAgent(),
-        ]
+    def close(self) -> None:
+        """Stop the tool threads of a private graph; a no-op for the shared one."""
+
+        if self._custom_app is not None:
+            self._release()
 
     def plan(self, problem: ProblemInput) -> List[PlanStep]:
         return [
@@ -80,8 +49,27 @@ class OSINTAgent:
 
     def run(self, problem: ProblemInput) -> AgentResult:
         # デフォルトは LangGraph を使う（鍵が無くてもオフライン動作）
-        app = build_langgraph_app(self.config).compile()
-        state = {
+        final_state = self._app().invoke(self.initial_state(problem))
+        return self.result_from_state(problem, final_state)
+
+    def stream(self, problem: ProblemInput, tool_events: bool = False) -> Iterator[Tuple[str, Dict]]:
+        """Yield ``(node, state)`` after each graph node finishes.
+
+        With ``tool_events`` the tools node also yields ``("tool", event)`` as
+        each sub-agent completes. Feed the last node state to
+        ``result_from_state`` to get the final result.
+        """
+
+        modes = ["updates", "custom"] if tool_events else ["updates"]
+        for mode, chunk in self._app().stream(self.initial_state(problem), stream_mode=modes):
+            if mode == "custom":
+                yield "tool", chunk
+                continue
+            for node, state in chunk.items():
+                yield node, state
+
+    def initial_state(self, problem: ProblemInput) -> Dict:
+        return {
             "input": problem.text,
             "urls": problem.urls,
             "images": problem.image_paths,
@@ -90,9 +78,18 @@ class OSINTAgent:
             "flags": [],
             "loop": 0,
             "stop": False,
+            "tool_inputs": {},
+            "timings": {},
+            "validated_upto": 0,
+            "evidence_summary": [],
+            "run_id": uuid.uuid4().hex,
+            "entity_graph": None,
+            "graph_upto": 0,
+            "pivoted": [],
+            "frontier": [],
         }
-        final_state = app.invoke(state)
 
+    def result_from_state(self, problem: ProblemInput, final_state: Dict) -> AgentResult:
         evidence_store = EvidenceStore()
         for ev in final_state.get("evidence", []):
             evidence_store.add(
@@ -113,6 +110,9 @@ class OSINTAgent:
             notes="LangGraph pipeline executed (planner/tools/validator/flagger).",
         )
 
+    def _app(self):
+        return self._custom_app if self._custom_app is not None else get_compiled_app(self.config)
+
     def _extract_flags(self, *sources: Iterable[str]) -> List[str]:
         candidates: List[str] = []
         for source in sources:
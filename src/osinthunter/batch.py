@@ -0,0 +1,177 @@
+"""Batch runner: solve a JSONL corpus of problems on a process pool.
+
+Each input line is a JSON object with ``prompt`` (or ``text``), optional
+``urls``/``images`` and an optional ``id`` (the line number otherwise). Results
+are appended to the output JSONL as they complete, so a crashed run can be
+resumed: ids that already have a successful record in the output are skipped.
+
+Workers import LangGraph and compile the graph once in their initializer and
+then reuse it for every problem they receive. The same initializer backs the
+web app's process-pool backend (``web.concurrency.agent_process_pool``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .models import AgentResult, ProblemInput
+
+_agent = None
+
+
+def problem_from_record(record: Dict[str, Any]) -> ProblemInput:
+    text = record.get("prompt", record.get("text", "")) or ""
+    return ProblemInput(text=text, urls=list(record.get("urls") or []), image_paths=list(record.get("images") or []))
+
+
+def iter_records(path: Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield ``(id, record)`` for each non-blank line without loading the whole file."""
+
+    with path.open(encoding="utf-8") as fh:
+        for lineno, line in enumerate(fh, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield f"line-{lineno}", {"_invalid": f"invalid JSON: {exc}"}
+                continue
+            if not isinstance(record, dict):
+                yield f"line-{lineno}", {"_invalid": "expected a JSON object"}
+                continue
+            yield str(record.get("id", f"line-{lineno}")), record
+
+
+def completed_ids(path: Path) -> Set[str]:
+    """Ids with a successful record in an existing output file."""
+
+    done: Set[str] = set()
+    if not path.exists():
+        return done
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by a crash; that problem is simply re-run.
+                continue
+            if isinstance(record, dict) and "id" in record and not record.get("error"):
+                done.add(str(record["id"]))
+    return done
+
+
+def _ends_with_newline(path: Path) -> bool:
+    with path.open("rb") as fh:
+        if fh.seek(0, os.SEEK_END) == 0:
+            return True
+        fh.seek(-1, os.SEEK_END)
+        return fh.read(1) == b"\n"
+
+
+def init_worker() -> None:
+    """Process-pool initializer: pay the import and graph compile cost once."""
+
+    global _agent
+    from multiprocessing.util import Finalize
+
+    from .agent import OSINTAgent
+    from .config import load_config
+    from .langgraph_runner import shutdown, warmup
+
+    config = load_config()
+    warmup(config)
+    _agent = OSINTAgent(config=config)
+    # Pool workers leave through os._exit, which skips atexit; flush the run
+    # log and close the caches when the worker retires instead.
+    Finalize(None, shutdown, exitpriority=10)
+
+
+def solve(problem_id: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one problem in a worker and return its output record."""
+
+    if _agent is None:
+        init_worker()
+    started = time.perf_counter()
+    try:
+        if "_invalid" in record:
+            raise ValueError(record["_invalid"])
+        result = _agent.run(problem_from_record(record))
+    except Exception as exc:
+        return {"id": problem_id, "error": f"{type(exc).__name__}: {exc}", "elapsed": time.perf_counter() - started}
+    return {"id": problem_id, **asdict(result), "elapsed": time.perf_counter() - started}
+
+
+def run_problem(problem: ProblemInput) -> AgentResult:
+    """Run one problem on this worker's warm agent and return the result object."""
+
+    if _agent is None:
+        init_worker()
+    return _agent.run(problem)
+
+
+def run_batch(input_path: Path, output_path: Path, workers: int = 0, resume: bool = True) -> Dict[str, int]:
+    """Solve every pending problem in ``input_path`` and append results to ``output_path``."""
+
+    workers = workers or os.cpu_count() or 1
+    done = completed_ids(output_path) if resume else set()
+    counts = {"succeeded": 0, "failed": 0, "skipped": 0}
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # Keep a couple of problems per worker in flight; the rest stay on disk.
+    max_in_flight = workers * 2
+
+    with output_path.open("a" if resume else "w", encoding="utf-8") as out, ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker
+    ) as pool:
+        if resume and not _ends_with_newline(output_path):
+            out.write("\n")
+
+        def drain(pending: Set[Future], block_until: int) -> Set[Future]:
+            while len(pending) > block_until:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    record = future.result()
+                    out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                    out.flush()
+                    counts["failed" if record.get("error") else "succeeded"] += 1
+            return pending
+
+        pending: Set[Future] = set()
+        for problem_id, record in iter_records(input_path):
+            if problem_id in done:
+                counts["skipped"] += 1
+                continue
+            done.add(problem_id)
+            pending.add(pool.submit(solve, problem_id, record))
+            pending = drain(pending, max_in_flight - 1)
+        drain(pending, 0)
+    return counts
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="osinthunter batch", description="Run OSINT Hunter over a JSONL corpus of problems")
+    parser.add_argument("--input", type=Path, required=True, help="JSONL file, one problem per line")
+    parser.add_argument("--output", type=Path, required=True, help="JSONL file results are appended to")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-resume", action="store_true", help="Overwrite the output instead of skipping finished ids")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    started = time.perf_counter()
+    counts = run_batch(args.input, args.output, workers=args.workers, resume=not args.no_resume)
+    print(
+        f"Done in {time.perf_counter() - started:.1f}s: "
+        f"{counts['succeeded']} succeeded, {counts['failed']} failed, {counts['skipped']} skipped"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""Persistent SQLite cache for external provider responses.
+
+Entries are keyed on a hash of (provider, normalized request). Each provider has
+its own TTL; 404s and empty results are cached under a shorter negative TTL, and
+the file is kept under a byte budget by evicting least-recently-used rows.
+
+Inspect or purge the cache with ``python -m osinthunter.cache``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+DEFAULT_PATH = ".cache/provider_cache.sqlite3"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL = 24 * 3600
+NEGATIVE_TTL = 3600
+
+PROVIDER_TTLS: Dict[str, int] = {
+    "shodan": 7 * 24 * 3600,
+    "censys": 7 * 24 * 3600,
+    "builtwith": 30 * 24 * 3600,
+    "hunter": 7 * 24 * 3600,
+    "wayback": 24 * 3600,
+    "serpapi": 24 * 3600,
+    "bing": 24 * 3600,
+    "tavily": 24 * 3600,
+    "google-lens": 7 * 24 * 3600,
+    # Keyed by content hash, so entries never go stale; the TTL only bounds size.
+    "image-metadata": 30 * 24 * 3600,
+    # temperature=0 planner/validator answers; model upgrades reuse the name, so keep it short.
+    "llm": 7 * 24 * 3600,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    request TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    negative INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    expires REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses(last_access);
+CREATE INDEX IF NOT EXISTS responses_provider ON responses(provider);
+"""
+
+
+@dataclass
+class CacheEntry:
+    """A cached provider response."""
+
+    provider: str
+    request: str
+    payload: Any
+    status: int = 200
+    negative: bool = False
+    created: float = 0.0
+    expires: float = 0.0
+    hits: int = 0
+
+
+def make_key(provider: str, request: str) -> str:
+    return hashlib.sha256(f"{provider}\x00{request}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe SQLite-backed response cache shared by all network agents."""
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_PATH,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: Optional[Mapping[str, int]] = None,
+        negative_ttl: int = NEGATIVE_TTL,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttls = {**PROVIDER_TTLS, **(ttls or {})}
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def ttl_for(self, provider: str, negative: bool = False) -> int:
+        ttl = self.ttls.get(provider, DEFAULT_TTL)
+        return min(ttl, self.negative_ttl) if negative else ttl
+
+    def get(self, provider: str, request: str) -> Optional[CacheEntry]:
+        key = make_key(provider, request)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, status, negative, created, expires, hits FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            payload, status, negative, created, expires, hits = row
+            if expires <= now:
+                self._delete_keys([key])
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ?, hits = hits + 1 WHERE key = ?", (now, key))
+        return CacheEntry(
+            provider=provider,
+            request=request,
+            payload=json.loads(payload),
+            status=status,
+            negative=bool(negative),
+            created=created,
+            expires=expires,
+            hits=hits + 1,
+        )
+
+    def put(self, provider: str, request: str, payload: Any, *, status: int = 200, negative: bool = False) -> None:
+        key = make_key(provider, request)
+        blob = json.dumps(payload, ensure_ascii=False, default=str)
+        size = len(blob.encode("utf-8")) + len(request)
+        now = time.time()
+        expires = now + self.ttl_for(provider, negative)
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, provider, request, payload, status, negative, size, created, expires, last_access, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (key, provider, request, blob, status, int(negative), size, now, expires, now),
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        self._conn.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+        # Other processes may share the file, so work from the real total.
+        target = int(self.max_bytes * 0.9)
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        victims: List[str] = []
+        if total > target:
+            for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC").fetchall():
+                victims.append(key)
+                total -= size
+                if total <= target:
+                    break
+        self._delete_keys(victims)
+        self._total_bytes = total
+
+    def _delete_keys(self, keys: List[str]) -> None:
+        for i in range(0, len(keys), 500):
+            chunk = keys[i : i + 500]
+            size = self._conn.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM responses WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchone()[0]
+            self._conn.execute(f"DELETE FROM responses WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+            self._total_bytes -= size
+
+    def stats(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT provider, COUNT(*), SUM(size), SUM(negative), SUM(expires <= ?), SUM(hits) "
+                "FROM responses GROUP BY provider ORDER BY provider",
+                (now,),
+            ).fetchall()
+        return [
+            {"provider": p, "entries": n, "bytes": b or 0, "negative": neg or 0, "expired": exp or 0, "hits": h or 0}
+            for p, n, b, neg, exp, h in rows
+        ]
+
+    def entries(self, provider: Optional[str] = None, limit: int = 50) -> List[CacheEntry]:
+        query = "SELECT provider, request, status, negative, created, expires, hits FROM responses"
+        args: List[Any] = []
+        if provider:
+            query += " WHERE provider = ?"
+            args.append(provider)
+        query += " ORDER BY last_access DESC LIMIT ?"
+        args.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, args).fetchall()
+        return [
+            CacheEntry(provider=p, request=r, payload=None, status=s, negative=bool(n), created=c, expires=e, hits=h)
+            for p, r, s, n, c, e, h in rows
+        ]
+
+    def purge(self, provider: Optional[str] = None, expired_only: bool = False) -> int:
+        clauses: List[str] = []
+        args: List[Any] = []
+        if provider:
+            clauses.append("provider = ?")
+            args.append(provider)
+        if expired_only:
+            clauses.append("expires <= ?")
+            args.append(time.time())
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            removed = self._conn.execute(f"DELETE FROM responses{where}", args).rowcount
+            self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache_lock = threading.Lock()
+_cache: Optional[ResponseCache] = None
+
+
+def _env_ttls() -> Dict[str, int]:
+    # OSINTHUNTER_CACHE_TTLS="shodan=86400,wayback=3600"
+    ttls: Dict[str, int] = {}
+    for part in os.getenv("OSINTHUNTER_CACHE_TTLS", "").split(","):
+        name, _, seconds = part.partition("=")
+        if name.strip() and seconds.strip().isdigit():
+            ttls[name.strip()] = int(seconds)
+    return ttls
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide cache, or None when caching is disabled."""
+
+    global _cache
+    if os.getenv("OSINTHUNTER_CACHE", "true").lower() == "false":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(
+                path=os.getenv("OSINTHUNTER_CACHE_PATH", DEFAULT_PATH),
+                max_bytes=int(float(os.getenv("OSINTHUNTER_CACHE_MAX_MB", "256")) * 1024 * 1024),
+                ttls=_env_ttls(),
+            )
+        return _cache
+
+
+def close_response_cache() -> None:
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            _cache.close()
+            _cache = None
+
+
+def cached_call(provider: str, request: str, fn: Callable[[], Any], is_empty: Callable[[Any], bool] | None = None) -> Any:
+    """Return a cached payload or call ``fn`` and cache its JSON-serializable result."""
+
+    cache = get_response_cache()
+    if cache is not None:
+        entry = cache.get(provider, request)
+        if entry is not None:
+            return entry.payload
+    payload = fn()
+    if cache is not None:
+        cache.put(provider, request, payload, negative=bool(is_empty and is_empty(payload)))
+    return payload
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Inspect or purge the OSINT Hunter provider cache")
+    parser.add_argument("--path", default=os.getenv("OSINTHUNTER_CACHE_PATH", DEFAULT_PATH), help="Cache database path")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Show per-provider entry counts and sizes")
+    list_parser = sub.add_parser("list", help="List recently used entries")
+    list_parser.add_argument("--provider", help="Only show this provider")
+    list_parser.add_argument("--limit", type=int, default=50)
+    purge_parser = sub.add_parser("purge", help="Delete entries")
+    purge_parser.add_argument("--provider", help="Only purge this provider")
+    purge_parser.add_argument("--expired", action="store_true", help="Only purge expired entries")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    cache = ResponseCache(path=args.path)
+    try:
+        if args.command == "stats":
+            rows = cache.stats()
+            if not rows:
+                print("Cache is empty")
+            for row in rows:
+                print(
+                    f"- {row['provider']}: entries={row['entries']} bytes={row['bytes']} "
+                    f"negative={row['negative']} expired={row['expired']} hits={row['hits']}"
+                )
+        elif args.command == "list":
+            now = time.time()
+            for entry in cache.entries(provider=args.provider, limit=args.limit):
+                state = "expired" if entry.expires <= now else f"ttl={int(entry.expires - now)}s"
+                flag = " negative" if entry.negative else ""
+                print(f"- [{entry.provider}] {entry.request} status={entry.status}{flag} hits={entry.hits} {state}")
+        elif args.command == "purge":
+            removed = cache.purge(provider=args.provider, expired_only=args.expired)
+            print(f"Purged {removed} entries")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
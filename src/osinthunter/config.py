@@ -22,7 +22,24 @@ class OSINTConfig:
     builtwith_api_key: Optional[str]
     allow_network: bool = False
     max_iterations: int = 6
+    pivot_depth: int = 2
+    pivot_width: int = 8
     model_name: str = "gpt-4o-mini"
+    llm_cache: bool = True
+    tool_timeout: float = 30.0
+    tool_workers: int = 8
+    web_concurrency: int = 4
+    web_queue: int = 16
+    web_queue_timeout: float = 60.0
+    # "process" runs /run and /api/run in worker processes; streaming runs and
+    # background jobs always use threads, as they report progress in-process.
+    web_backend: str = "thread"
+    web_max_tasks_per_child: int = 50
+    job_workers: int = 2
+    job_queue: int = 100
+    job_retention: float = 3600.0
+    upload_dir: str = ".cache/uploads"
+    upload_retention: float = 86400.0
 
 
 def load_config() -> OSINTConfig:
@@ -42,5 +59,20 @@ def load_config() -> OSINTConfig:
         builtwith_api_key=os.getenv("BUILTWITH_API_KEY"),
         allow_network=os.getenv("OSINTHUNTER_ALLOW_NETWORK", "false").lower() == "true",
         max_iterations=int(os.getenv("OSINTHUNTER_MAX_ITERATIONS", "6")),
+        pivot_depth=int(os.getenv("OSINTHUNTER_PIVOT_DEPTH", "2")),
+        pivot_width=int(os.getenv("OSINTHUNTER_PIVOT_WIDTH", "8")),
         model_name=os.getenv("OSINTHUNTER_MODEL", "gpt-4o-mini"),
+        llm_cache=os.getenv("OSINTHUNTER_LLM_CACHE", "true").lower() != "false",
+        tool_timeout=float(os.getenv("OSINTHUNTER_TOOL_TIMEOUT", "30")),
+        tool_workers=int(os.getenv("OSINTHUNTER_TOOL_WORKERS", "8")),
+        web_concurrency=int(os.getenv("OSINTHUNTER_WEB_CONCURRENCY", "4")),
+        web_queue=int(os.getenv("OSINTHUNTER_WEB_QUEUE", "16")),
+        web_queue_timeout=float(os.getenv("OSINTHUNTER_WEB_QUEUE_TIMEOUT", "60")),
+        web_backend=os.getenv("OSINTHUNTER_WEB_BACKEND", "thread").lower(),
+        web_max_tasks_per_child=int(os.getenv("OSINTHUNTER_WEB_MAX_TASKS_PER_CHILD", "50")),
+        job_workers=int(os.getenv("OSINTHUNTER_JOB_WORKERS", "2")),
+        job_queue=int(os.getenv("OSINTHUNTER_JOB_QUEUE", "100")),
+        job_retention=float(os.getenv("OSINTHUNTER_JOB_RETENTION", "3600")),
+        upload_dir=os.getenv("OSINTHUNTER_UPLOAD_DIR", ".cache/uploads"),
+        upload_retention=float(os.getenv("OSINTHUNTER_UPLOAD_RETENTION", "86400")),
     )
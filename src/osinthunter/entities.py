@@ -0,0 +1,141 @@
+"""Single-pass entity extraction shared by all agents.
+
+One precompiled alternation scans the problem text once and yields URLs, emails,
+coordinates, IPs, handles, hashtags and bare domains. Matches are consumed left
+to right, so an email's domain is not also reported as a handle and a URL's
+trailing punctuation is not part of the URL.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+from urllib.parse import urlparse
+
+_ENTITY_RE = re.compile(
+    r"""
+    (?P<url>https?://[^\s]+)
+    | (?P<email>[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,})
+    | (?P<lat>-?\d{1,3}\.\d{3,}),\s*(?P<lon>-?\d{1,3}\.\d{3,})
+    | (?P<ip>\b(?:\d{1,3}\.){3}\d{1,3}\b)
+    | @(?P<handle>[A-Za-z0-9_]{3,32})
+    | \#(?P<hashtag>\w{2,64})
+    | (?P<domain>\b[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)
+    """,
+    re.VERBOSE,
+)
+_HANDLE_RE = re.compile(r"^[A-Za-z0-9_]{3,32}$")
+_IPV4_RE = re.compile(r"^(?:\d{1,3}\.){3}\d{1,3}$")
+
+# Punctuation that `https?://[^\s]+` swallows at the end of prose.
+_URL_TRAILING = ".,;:!?'\"、。，．！？」』"
+_URL_BRACKETS = {")": "(", "]": "[", "}": "{", ">": "<", "）": "（", "】": "【"}
+
+
+def canonical_url(raw: str) -> str:
+    """Strip trailing prose punctuation and unbalanced closing brackets."""
+
+    url = raw
+    while url:
+        last = url[-1]
+        if last in _URL_TRAILING:
+            url = url[:-1]
+        elif last in _URL_BRACKETS and url.count(last) > url.count(_URL_BRACKETS[last]):
+            url = url[:-1]
+        else:
+            break
+    return url
+
+
+def _host_of(url: str) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
+def is_ipv4(host: str) -> bool:
+    """True for a dotted-quad literal such as the host of ``http://203.0.113.7:8080/``."""
+
+    return bool(_IPV4_RE.match(host))
+
+
+def _path_handle(url: str) -> str | None:
+    parts = [p for p in urlparse(url).path.split("/") if p]
+    if parts and _HANDLE_RE.match(parts[0].lstrip("@")):
+        return parts[0].lstrip("@")
+    return None
+
+
+def _ordered(items: Iterable) -> List:
+    return list(dict.fromkeys(items))
+
+
+@dataclass
+class EntityIndex:
+    """Canonicalized entities found in a problem, in first-seen order."""
+
+    text_urls: List[str] = field(default_factory=list)
+    urls: List[str] = field(default_factory=list)
+    emails: List[str] = field(default_factory=list)
+    handles: List[str] = field(default_factory=list)
+    url_handles: List[str] = field(default_factory=list)
+    coordinates: List[Tuple[str, str]] = field(default_factory=list)
+    ips: List[str] = field(default_factory=list)
+    hosts: List[str] = field(default_factory=list)
+    hashtags: List[str] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, List]:
+        return {name: list(getattr(self, name)) for name in self.__dataclass_fields__}
+
+
+def build_entity_index(text: str = "", urls: Iterable[str] = ()) -> EntityIndex:
+    """Scan ``text`` once and merge in explicitly supplied ``urls``."""
+
+    explicit_urls = [u for u in urls if u]
+    text_urls: List[str] = []
+    emails: List[str] = []
+    handles: List[str] = []
+    coordinates: List[Tuple[str, str]] = []
+    ips: List[str] = []
+    domains: List[str] = []
+    hashtags: List[str] = []
+
+    for match in _ENTITY_RE.finditer(text or ""):
+        kind = match.lastgroup
+        if kind == "url":
+            url = canonical_url(match.group("url"))
+            if len(url) > len("https://"):
+                text_urls.append(url)
+        elif kind == "email":
+            emails.append(match.group("email"))
+        elif kind == "lon":
+            coordinates.append((match.group("lat"), match.group("lon")))
+        elif kind == "ip":
+            ips.append(match.group("ip"))
+        elif kind == "handle":
+            handles.append(match.group("handle"))
+        elif kind == "hashtag":
+            hashtags.append(match.group("hashtag").lower())
+        elif kind == "domain":
+            domains.append(match.group("domain").lower())
+
+    text_urls = _ordered(text_urls)
+    all_urls = _ordered(explicit_urls + text_urls)
+    url_handles = [h for h in (_path_handle(u) for u in explicit_urls) if h]
+    # Handles written as /@name inside pasted URLs are handles too.
+    url_handles += [h for u in text_urls if "/@" in u for h in [_path_handle(u)] if h]
+    url_hosts = [_host_of(u) for u in all_urls]
+    # The url branch consumes an IP written as a URL host; report it as an IP, not a domain.
+    ips += [h for h in url_hosts if is_ipv4(h)]
+    hosts = [h for h in url_hosts if not is_ipv4(h)] + [e.rsplit("@", 1)[1].lower() for e in emails] + domains
+
+    return EntityIndex(
+        text_urls=text_urls,
+        urls=all_urls,
+        emails=_ordered(emails),
+        handles=_ordered(handles),
+        url_handles=_ordered(url_handles),
+        coordinates=_ordered(coordinates),
+        ips=_ordered(ips),
+        hosts=_ordered(h for h in hosts if h),
+        hashtags=_ordered(hashtags),
+    )
@@ -0,0 +1,443 @@
+"""Durable, queryable evidence from every run.
+
+The run logger hands each batch of finished runs to ``EvidenceDB.record_runs``
+on its writer thread, so graph runs never wait on SQLite. Facts get an FTS5
+index; entities (from evidence metadata and from the problem text) go into a
+table indexed on ``(entity, run_id)``, so "every run where this IP appeared"
+is an index lookup rather than a scan of the JSONL logs. Runs older than the
+retention period, and the oldest runs beyond a byte budget, are pruned after
+each batch.
+
+Query from the shell with ``python -m osinthunter.evidence_db``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from . import metrics
+from .entities import build_entity_index
+from .memory import evidence_entities
+from .models import Evidence
+
+DEFAULT_PATH = ".cache/evidence.sqlite3"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_RETENTION = 0  # keep runs regardless of age unless configured
+# Share of the runs dropped per pass once over the byte budget.
+PRUNE_FRACTION = 0.1
+
+REJECTED = metrics.Counter("osinthunter_evidence_db_rejected_total", "Run records the evidence database could not store")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    ts REAL NOT NULL,
+    input TEXT NOT NULL,
+    flags TEXT NOT NULL,
+    loops INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_ts ON runs(ts);
+CREATE TABLE IF NOT EXISTS evidence (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    source TEXT NOT NULL,
+    fact TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS evidence_run ON evidence(run_id);
+CREATE INDEX IF NOT EXISTS evidence_source_ts ON evidence(source, ts);
+CREATE TABLE IF NOT EXISTS entities (
+    entity TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    evidence_id INTEGER NOT NULL,  -- 0 for entities named in the problem input
+    PRIMARY KEY (entity, run_id, evidence_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entities_run ON entities(run_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS evidence_fts USING fts5(fact, content='evidence', content_rowid='id');
+"""
+
+
+def fts_phrases(query: str) -> str:
+    """Quote each word of ``query`` as an FTS5 phrase, so IPs, domains and emails match literally."""
+
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+def normalize_entity(value: str) -> str:
+    return value.strip().lstrip("@").lower()
+
+
+def input_entities(text: str, urls: Sequence[str] = ()) -> Set[str]:
+    index = build_entity_index(text, urls)
+    values = index.urls + index.emails + index.handles + index.url_handles + index.ips + index.hosts
+    values += [f"{lat},{lon}" for lat, lon in index.coordinates]
+    return {normalize_entity(v) for v in values if v}
+
+
+def _timestamp(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            pass
+    return time.time()
+
+
+class EvidenceDB:
+    """Thread-safe SQLite evidence store with full-text and entity indexes.
+
+    ``retention_seconds`` and ``max_bytes`` of 0 disable that bound.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_PATH,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        retention_seconds: float = DEFAULT_RETENTION,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        # Only takes effect on a new database; lets prune() hand freed pages back to the OS.
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def record_runs(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Store run-log records (one per run) in a single transaction; returns runs added.
+
+        Runs already stored are skipped, so replaying a log is safe. Records
+        from before run ids were logged get one derived from their timestamp
+        and input. A record that cannot be stored is skipped on its own
+        (``osinthunter_evidence_db_rejected_total``) without losing the batch.
+        """
+
+        added = 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for record in records:
+                    self._conn.execute("SAVEPOINT record")
+                    try:
+                        added += self._insert_run(record)
+                    except Exception:
+                        self._conn.execute("ROLLBACK TO record")
+                        REJECTED.inc()
+                    self._conn.execute("RELEASE record")
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            if added:
+                self._prune()
+        return added
+
+    def _used_bytes(self) -> int:
+        page_size, pages, free = (
+            self._conn.execute(f"PRAGMA {name}").fetchone()[0] for name in ("page_size", "page_count", "freelist_count")
+        )
+        return page_size * (pages - free)
+
+    def _delete_runs(self, run_ids: Sequence[str]) -> None:
+        for run_id in run_ids:
+            # External-content FTS rows must be deleted with their indexed text.
+            self._conn.execute(
+                "INSERT INTO evidence_fts (evidence_fts, rowid, fact) SELECT 'delete', id, fact FROM evidence WHERE run_id = ?",
+                (run_id,),
+            )
+            self._conn.execute("DELETE FROM evidence WHERE run_id = ?", (run_id,))
+            self._conn.execute("DELETE FROM entities WHERE run_id = ?", (run_id,))
+            self._conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+
+    def _prune(self, now: Optional[float] = None) -> int:
+        """Drop expired runs, then the oldest runs while over the byte budget; returns runs dropped."""
+
+        dropped = 0
+        self._conn.execute("BEGIN")
+        try:
+            if self.retention_seconds:
+                cutoff = (now or time.time()) - self.retention_seconds
+                expired = [row[0] for row in self._conn.execute("SELECT run_id FROM runs WHERE ts < ?", (cutoff,))]
+                self._delete_runs(expired)
+                dropped += len(expired)
+            while self.max_bytes and self._used_bytes() > self.max_bytes:
+                total = self._conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+                if total <= 1:
+                    break
+                oldest = [
+                    row[0]
+                    for row in self._conn.execute(
+                        "SELECT run_id FROM runs ORDER BY ts LIMIT ?", (max(1, int(total * PRUNE_FRACTION)),)
+                    )
+                ]
+                self._delete_runs(oldest)
+                dropped += len(oldest)
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        if dropped:
+            self._conn.execute("PRAGMA incremental_vacuum")
+        return dropped
+
+    def prune(self, now: Optional[float] = None) -> int:
+        with self._lock:
+            return self._prune(now)
+
+    def _insert_run(self, record: Dict[str, Any]) -> int:
+        run_id = record.get("run_id") or hashlib.sha1(
+            json.dumps([record.get("ts"), record.get("input")], default=str).encode("utf-8")
+        ).hexdigest()
+        ts = _timestamp(record.get("ts"))
+        inserted = self._conn.execute(
+            "INSERT OR IGNORE INTO runs (run_id, ts, input, flags, loops) VALUES (?, ?, ?, ?, ?)",
+            (run_id, ts, record.get("input", ""), json.dumps(record.get("flags", []), ensure_ascii=False), record.get("loop", 0)),
+        ).rowcount
+        if not inserted:
+            return 0
+
+        entity_rows: List[Tuple[str, str, int]] = [
+            (entity, run_id, 0) for entity in input_entities(record.get("input", ""), record.get("urls", []))
+        ]
+        for ev in record.get("evidence", []):
+            fact = ev.get("fact", "")
+            metadata = ev.get("metadata") or {}
+            evidence_id = self._conn.execute(
+                "INSERT INTO evidence (run_id, ts, source, fact, confidence, metadata) VALUES (?, ?, ?, ?, ?, ?)",
+                (run_id, ts, ev.get("source", ""), fact, ev.get("confidence", 0.0), json.dumps(metadata, ensure_ascii=False, default=str)),
+            ).lastrowid
+            self._conn.execute("INSERT INTO evidence_fts (rowid, fact) VALUES (?, ?)", (evidence_id, fact))
+            item = Evidence(source=ev.get("source", ""), fact=fact, metadata=metadata)
+            entity_rows += [(normalize_entity(e), run_id, evidence_id) for e in set(evidence_entities(item))]
+        self._conn.executemany("INSERT OR IGNORE INTO entities (entity, run_id, evidence_id) VALUES (?, ?, ?)", entity_rows)
+        return 1
+
+    def runs_for_entity(self, entity: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Runs whose input or evidence mentions ``entity``, newest first."""
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT r.run_id, r.ts, r.input, r.flags, SUM(x.evidence_id > 0) FROM runs r "
+                "JOIN entities x ON x.run_id = r.run_id WHERE x.entity = ? "
+                "GROUP BY r.run_id ORDER BY r.ts DESC LIMIT ?",
+                (normalize_entity(entity), limit),
+            ).fetchall()
+        return [
+            {"run_id": run_id, "ts": ts, "input": text, "flags": json.loads(flags), "evidence": hits}
+            for run_id, ts, text, flags, hits in rows
+        ]
+
+    def search(
+        self,
+        query: str,
+        source: Optional[str] = None,
+        run_id: Optional[str] = None,
+        since: Optional[float] = None,
+        limit: int = 50,
+        raw: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Facts containing every word of ``query``, best match first, optionally filtered.
+
+        With ``raw`` the query is passed through as FTS5 syntax (``AND``,
+        ``NEAR``, prefix ``*``); a malformed one raises ``ValueError``.
+        """
+
+        clauses, args = ["evidence_fts MATCH ?"], [query if raw else fts_phrases(query)]
+        for column, value in (("e.source = ?", source), ("e.run_id = ?", run_id), ("e.ts >= ?", since)):
+            if value is not None:
+                clauses.append(column)
+                args.append(value)
+        args.append(limit)
+        if not args[0]:
+            return []
+        with self._lock:
+            try:
+                rows = self._conn.execute(
+                    "SELECT e.run_id, e.ts, e.source, e.fact, e.confidence FROM evidence_fts "
+                    f"JOIN evidence e ON e.id = evidence_fts.rowid WHERE {' AND '.join(clauses)} "
+                    "ORDER BY evidence_fts.rank LIMIT ?",
+                    args,
+                ).fetchall()
+            except sqlite3.OperationalError as exc:
+                raise ValueError(f"Invalid full-text query {query!r}: {exc}") from None
+        return [
+            {"run_id": r, "ts": ts, "source": s, "fact": f, "confidence": c}
+            for r, ts, s, f, c in rows
+        ]
+
+    def run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT ts, input, flags, loops FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+            if row is None:
+                return None
+            evidence = self._conn.execute(
+                "SELECT source, fact, confidence, metadata FROM evidence WHERE run_id = ? ORDER BY id", (run_id,)
+            ).fetchall()
+        ts, text, flags, loops = row
+        return {
+            "run_id": run_id,
+            "ts": ts,
+            "input": text,
+            "flags": json.loads(flags),
+            "loop": loops,
+            "evidence": [
+                {"source": s, "fact": f, "confidence": c, "metadata": json.loads(m)} for s, f, c, m in evidence
+            ],
+        }
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            runs, evidence, entities = (
+                self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("runs", "evidence", "entities")
+            )
+        return {"runs": runs, "evidence": evidence, "entities": entities}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_db_lock = threading.Lock()
+_db: Optional[EvidenceDB] = None
+
+
+def get_evidence_db() -> Optional[EvidenceDB]:
+    """Return the process-wide evidence database, or None when it is disabled."""
+
+    global _db
+    if os.getenv("OSINTHUNTER_EVIDENCE_DB", "true").lower() == "false":
+        return None
+    with _db_lock:
+        if _db is None:
+            _db = EvidenceDB(os.getenv("OSINTHUNTER_EVIDENCE_DB_PATH", DEFAULT_PATH), **_env_bounds())
+        return _db
+
+
+def _env_bounds() -> Dict[str, Any]:
+    return {
+        "max_bytes": int(float(os.getenv("OSINTHUNTER_EVIDENCE_DB_MAX_MB", "256")) * 1024 * 1024),
+        "retention_seconds": float(os.getenv("OSINTHUNTER_EVIDENCE_DB_RETENTION_DAYS", "0")) * 24 * 3600,
+    }
+
+
+def close_evidence_db() -> None:
+    global _db
+    with _db_lock:
+        if _db is not None:
+            _db.close()
+            _db = None
+
+
+def iter_log_records(paths: Sequence[str | Path]) -> Iterator[Dict[str, Any]]:
+    """Records from run-log files, including rotated ``.gz`` segments.
+
+    Lines that are not valid JSON (a torn write, a hand edit) are skipped and
+    counted in ``REJECTED`` instead of aborting the whole import.
+    """
+
+    for path in paths:
+        opener = gzip.open if str(path).endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8", errors="replace") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    REJECTED.inc()
+
+
+def _format_ts(ts: float) -> str:
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Query evidence from past OSINT Hunter runs")
+    parser.add_argument("--path", default=os.getenv("OSINTHUNTER_EVIDENCE_DB_PATH", DEFAULT_PATH), help="Evidence database path")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Show row counts")
+    runs_parser = sub.add_parser("runs", help="Runs where an IP, domain, handle, email or URL appeared")
+    runs_parser.add_argument("entity")
+    runs_parser.add_argument("--limit", type=int, default=100)
+    search_parser = sub.add_parser("search", help="Full-text search over facts containing every given word")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--fts", action="store_true", help="Treat the query as FTS5 syntax (AND, OR, NEAR, prefix*)")
+    search_parser.add_argument("--source", help="Only facts from this tool")
+    search_parser.add_argument("--run", dest="run_id", help="Only facts from this run")
+    search_parser.add_argument("--limit", type=int, default=50)
+    show_parser = sub.add_parser("show", help="Print one run as JSON")
+    show_parser.add_argument("run_id")
+    import_parser = sub.add_parser("import", help="Load run-log JSONL files (and .gz segments)")
+    import_parser.add_argument("logs", nargs="+")
+    prune_parser = sub.add_parser("prune", help="Drop runs past the retention period or over the size budget")
+    prune_parser.add_argument("--max-mb", type=float, help="Size budget (default: OSINTHUNTER_EVIDENCE_DB_MAX_MB or 256)")
+    prune_parser.add_argument("--days", type=float, help="Drop runs older than this (default: OSINTHUNTER_EVIDENCE_DB_RETENTION_DAYS, off)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    bounds = _env_bounds()
+    if getattr(args, "max_mb", None) is not None:
+        bounds["max_bytes"] = int(args.max_mb * 1024 * 1024)
+    if getattr(args, "days", None) is not None:
+        bounds["retention_seconds"] = args.days * 24 * 3600
+    db = EvidenceDB(args.path, **bounds)
+    started = time.perf_counter()
+    try:
+        if args.command == "stats":
+            stats = db.stats()
+            print(f"runs={stats['runs']} evidence={stats['evidence']} entities={stats['entities']}")
+        elif args.command == "runs":
+            rows = db.runs_for_entity(args.entity, limit=args.limit)
+            for row in rows:
+                print(f"- {row['run_id']} {_format_ts(row['ts'])} evidence={row['evidence']} flags={row['flags']} input={row['input'][:80]!r}")
+            print(f"{len(rows)} run(s) in {(time.perf_counter() - started) * 1000:.1f} ms")
+        elif args.command == "search":
+            try:
+                rows = db.search(args.query, source=args.source, run_id=args.run_id, limit=args.limit, raw=args.fts)
+            except ValueError as exc:
+                print(exc)
+                return 2
+            for row in rows:
+                print(f"- {row['run_id']} [{row['source']}] ({row['confidence']:.2f}) {row['fact']}")
+            print(f"{len(rows)} fact(s) in {(time.perf_counter() - started) * 1000:.1f} ms")
+        elif args.command == "show":
+            run = db.run(args.run_id)
+            if run is None:
+                print(f"No run {args.run_id}")
+                return 1
+            print(json.dumps(run, ensure_ascii=False, indent=2))
+        elif args.command == "import":
+            added = db.record_runs(iter_log_records(args.logs))
+            print(f"Imported {added} run(s)")
+        elif args.command == "prune":
+            print(f"Pruned {db.prune()} run(s)")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
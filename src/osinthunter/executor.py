@@ -0,0 +1,138 @@
+"""Concurrent execution engine for sub-agents.
+
+The LangGraph ``tools`` node fans every agent out on a bounded thread pool so a
+run costs roughly as much as its slowest tool instead of the sum of all of them.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .models import Evidence
+
+Job = Tuple[str, Callable[[], List[Evidence]]]
+
+
+@dataclass
+class ToolOutcome:
+    """Result of a single tool execution."""
+
+    name: str
+    evidence: List[Evidence] = field(default_factory=list)
+    status: str = "ok"  # ok | error | timeout
+    elapsed: float = 0.0
+
+
+class ToolExecutor:
+    """Run tool callables concurrently with a per-tool deadline.
+
+    Results are always returned in submission order, independent of completion
+    order, so downstream dedupe and logging stay deterministic.
+
+    One executor can be shared by ``concurrency`` runs at once: each ``run``
+    keeps at most ``max_workers`` of its jobs in flight, on a pool sized for
+    all of them. A tool's deadline starts when a thread picks it up; a job
+    that cannot get a thread within ``timeout`` either (the pool is held by
+    other runs or by hung tools) is cancelled without running.
+    """
+
+    def __init__(self, max_workers: int = 8, timeout: float = 30.0, concurrency: int = 1) -> None:
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.concurrency = max(1, concurrency)
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers * self.concurrency, thread_name_prefix="osinthunter-tool"
+            )
+        return self._pool
+
+    def run(self, jobs: Sequence[Job], on_result: Optional[Callable[[ToolOutcome], None]] = None) -> List[ToolOutcome]:
+        """Run ``jobs`` and return their outcomes in submission order.
+
+        ``on_result`` is called from the calling thread as each outcome lands,
+        in completion order, so progress can be streamed before the slowest tool.
+        """
+
+        if not jobs:
+            return []
+        pool = self._get_pool()
+        queued = deque(enumerate(jobs))
+        submitted: Dict[int, float] = {}
+        started: Dict[int, float] = {}
+
+        def _call(idx: int, fn: Callable[[], List[Evidence]]) -> List[Evidence]:
+            started[idx] = time.monotonic()
+            return list(fn() or [])
+
+        futures: Dict[Future, int] = {}
+        outcomes: List[Optional[ToolOutcome]] = [None] * len(jobs)
+        pending: set = set()
+
+        def finish(idx: int, outcome: ToolOutcome) -> None:
+            outcomes[idx] = outcome
+            if on_result is not None:
+                on_result(outcome)
+
+        while queued or pending:
+            while queued and len(pending) < self.max_workers:
+                idx, (_, fn) = queued.popleft()
+                submitted[idx] = time.monotonic()
+                fut = pool.submit(_call, idx, fn)
+                futures[fut] = idx
+                pending.add(fut)
+
+            next_deadline = min(self._deadline(futures[fut], submitted, started) for fut in pending)
+            done, _ = wait(pending, timeout=max(0.0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            for fut in done:
+                idx = futures[fut]
+                finish(idx, self._collect(jobs[idx][0], fut, time.monotonic() - started.get(idx, submitted[idx])))
+            pending -= done
+
+            now = time.monotonic()
+            for fut in [f for f in pending if self._deadline(futures[f], submitted, started) <= now and not f.done()]:
+                idx = futures[fut]
+                # A job still waiting for a thread is dropped; a running one is
+                # abandoned to finish in the background.
+                if fut.cancel():
+                    finish(idx, self._timed_out(jobs[idx][0], now - submitted[idx], queued=True))
+                elif self._deadline(idx, submitted, started) <= now:
+                    finish(idx, self._timed_out(jobs[idx][0], now - started.get(idx, submitted[idx])))
+                else:
+                    # Picked up by a thread just now; its own deadline applies.
+                    continue
+                pending.discard(fut)
+
+        return [outcome for outcome in outcomes if outcome is not None]
+
+    def _deadline(self, idx: int, submitted: Dict[int, float], started: Dict[int, float]) -> float:
+        # Running: ``timeout`` from when it started. Waiting for a thread: ``timeout`` from submission.
+        return started.get(idx, submitted[idx]) + self.timeout
+
+    def _collect(self, name: str, fut: Future, elapsed: float) -> ToolOutcome:
+        try:
+            return ToolOutcome(name=name, evidence=fut.result(), elapsed=elapsed)
+        except Exception as exc:
+            ev = Evidence(source=name, fact=f"{name} failed: {exc}", confidence=0.2, metadata={"status": "error"})
+            return ToolOutcome(name=name, evidence=[ev], status="error", elapsed=elapsed)
+
+    def _timed_out(self, name: str, elapsed: float, queued: bool = False) -> ToolOutcome:
+        fact = f"{name} got no worker thread within {self.timeout:.1f}s" if queued else f"{name} timed out after {self.timeout:.1f}s"
+        ev = Evidence(
+            source=name,
+            fact=fact,
+            confidence=0.1,
+            metadata={"status": "timeout"},
+        )
+        return ToolOutcome(name=name, evidence=[ev], status="timeout", elapsed=elapsed)
+
+    def shutdown(self, wait: bool = False) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
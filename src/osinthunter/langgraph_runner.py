@@ -6,18 +6,25 @@ the graph falls back to deterministic heuristics.
 
 from __future__ import annotations
 
+import hashlib
 import json
-import os
 import re
-from datetime import datetime, timezone
-from pathlib import Path
-from typing import Dict, List, Optional, TypedDict
-
+import threading
+import time
+import uuid
+from dataclasses import astuple
+from functools import partial
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TypedDict
+
+from langgraph.config import get_stream_writer
 from langgraph.graph import StateGraph
-from langchain_openai import ChatOpenAI
-
-from .config import OSINTConfig
+from . import metrics
+from .config import OSINTConfig, load_config
+from .executor import ToolExecutor
+from .llm_cache import CachedLLM
 from .models import Evidence, PlanStep, ProblemInput
+from .pivots import EntityGraph, as_query
+from .runlog import close_run_logger, get_run_logger
 from .tools import (
     GeolocationAgent,
     ImageOSINTAgent,
@@ -39,7 +46,10 @@ from .tools import (
     EarthViewAgent,
     YandexReverseImageAgent,
 )
+from .tools import http as provider_http
+from .tools.base import Agent as SubAgent
 from .tools.geolocation import GeolocationLookupTool
+from .tools.image_index import close_image_index
 from .tools.image_osint import ImageInspectTool
 
 
@@ -52,6 +62,24 @@ class AgentState(TypedDict):
     flags: List[str]
     loop: int
     stop: bool
+    tool_inputs: Dict[str, str]
+    timings: Dict[str, Dict[str, float]]
+    validated_upto: int
+    evidence_summary: List[Dict]
+    run_id: str
+    entity_graph: Optional[EntityGraph]
+    graph_upto: int
+    pivoted: List[str]
+    frontier: List[str]
+
+
+# Bounds on what the validator sends per loop, so prompt size stays flat as evidence grows.
+SUMMARY_ITEMS = 12
+SUMMARY_FACT_CHARS = 200
+NEW_EVIDENCE_CHARS = 12000
+
+# Pivot jobs are keyed "<tool>@pivot:<node>", e.g. "shodan@pivot:ip:203.0.113.7".
+PIVOT_SUFFIX = "@pivot:"
 
 
 def _evidence_to_dict(items: List[Evidence]) -> List[Dict]:
@@ -82,33 +110,101 @@ def _dedupe_evidence_dicts(items: List[Dict]) -> List[Dict]:
     return deduped
 
 
-def _make_llm(config: OSINTConfig) -> Optional[ChatOpenAI]:
+def _roll_summary(summary: List[Dict], new: List[Dict]) -> List[Dict]:
+    """Keep the ``SUMMARY_ITEMS`` most confident facts seen so far, trimmed for the prompt."""
+
+    merged = summary + [
+        {"source": ev.get("source", ""), "fact": ev.get("fact", "")[:SUMMARY_FACT_CHARS], "confidence": ev.get("confidence", 0.0)}
+        for ev in new
+    ]
+    # sorted() is stable, so ties keep the earlier finding.
+    return sorted(merged, key=lambda ev: -ev["confidence"])[:SUMMARY_ITEMS]
+
+
+def _input_fingerprints(state: AgentState, keys) -> Dict[str, str]:
+    return {
+        key: hashlib.sha1(json.dumps(state.get(key), sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        for key in keys
+    }
+
+
+def _run_lc_tool(lc_tool, query: str) -> List[Evidence]:
+    result = lc_tool.run(query)
+    if isinstance(result, str):
+        return [Evidence(source=lc_tool.name, fact=result, confidence=0.4)]
+    return []
+
+
+def _tool_label(key: str) -> str:
+    """Metric/timing name of a tool job; per-entity pivot jobs share ``<tool>@pivot``."""
+
+    name, suffix, _ = key.partition(PIVOT_SUFFIX)
+    return name + suffix.rstrip(":")
+
+
+def _add_timing(state: AgentState, kind: str, name: str, seconds: float) -> Dict[str, Dict[str, float]]:
+    """Return ``state["timings"]`` with ``seconds`` added to ``kind``/``name``.
+
+    Timings accumulate across loops: ``{"nodes": {...}, "tools": {...}, "llm": {...}}``.
+    """
+
+    timings = {k: dict(v) for k, v in (state.get("timings") or {}).items()}
+    bucket = timings.setdefault(kind, {})
+    bucket[name] = round(bucket.get(name, 0.0) + seconds, 6)
+    return timings
+
+
+def _timed_node(name: str, fn):
+    """Wrap a graph node to record its duration in metrics and in the run's timings."""
+
+    def node(state: AgentState) -> AgentState:
+        started = time.perf_counter()
+        try:
+            out = fn(state)
+        except Exception:
+            metrics.NODE_ERRORS.inc(node=name)
+            raise
+        elapsed = time.perf_counter() - started
+        metrics.NODE_SECONDS.observe(elapsed, node=name)
+        return {**out, "timings": _add_timing(out, "nodes", name, elapsed)}
+
+    return node
+
+
+def _invoke_llm(llm, prompt: str, node: str) -> Tuple[Any, float]:
+    started = time.perf_counter()
+    resp = llm.invoke(prompt)
+    elapsed = time.perf_counter() - started
+    metrics.LLM_SECONDS.observe(elapsed, node=node)
+    return resp, elapsed
+
+
+def _make_llm(config: OSINTConfig) -> Optional[CachedLLM]:
+    if not (config.openrouter_api_key or config.openai_api_key):
+        return None
+    # langchain_openai is by far the heaviest import; keyless runs never pay for it.
+    from langchain_openai import ChatOpenAI
+
     if config.openrouter_api_key:
-        return ChatOpenAI(
+        llm = ChatOpenAI(
             api_key=config.openrouter_api_key,
             base_url=config.openrouter_base_url,
             model=config.model_name,
             temperature=0,
         )
-    if config.openai_api_key:
-        return ChatOpenAI(
+        base_url = config.openrouter_base_url
+    else:
+        llm = ChatOpenAI(
             api_key=config.openai_api_key,
             model=config.model_name,
             temperature=0,
         )
-    return None
-
-
-def _log_jsonl(payload: Dict) -> None:
-    path = Path(os.getenv("OSINTHUNTER_LOG_PATH", ".cache/logs/agent_runs.jsonl"))
-    path.parent.mkdir(parents=True, exist_ok=True)
-    payload = {**payload, "ts": datetime.now(timezone.utc).isoformat()}
-    with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+        base_url = None
+    return CachedLLM(llm, model=config.model_name, base_url=base_url, bypass=not config.llm_cache)
 
 
-def build_langgraph_app(config: OSINTConfig) -> StateGraph:
-    tools = [
+def build_tools(config: OSINTConfig) -> List[SubAgent]:
+    return [
         TextAnalysisAgent(),
         URLInvestigationAgent(),
         SNSOSINTAgent(),
@@ -134,7 +230,15 @@ def build_langgraph_app(config: OSINTConfig) -> StateGraph:
         GoogleLensAgent(serpapi_api_key=config.serpapi_api_key, allow_network=config.allow_network),
     ]
 
+
+def build_langgraph_app(
+    config: OSINTConfig,
+    tools: Optional[Sequence[SubAgent]] = None,
+    executor: Optional[ToolExecutor] = None,
+) -> StateGraph:
+    tools = list(tools) if tools is not None else build_tools(config)
     lc_tools = [GeolocationLookupTool(), ImageInspectTool()]
+    executor = executor or ToolExecutor(max_workers=config.tool_workers, timeout=config.tool_timeout)
     llm = _make_llm(config)
     graph = StateGraph(AgentState)
 
@@ -157,15 +261,39 @@ def build_langgraph_app(config: OSINTConfig) -> StateGraph:
                 f"Problem: {state.get('input','')}\n"
                 f"Evidence so far: {len(state.get('evidence', []))} items"
             )
-            resp = llm.invoke(prompt)
+            resp, llm_elapsed = _invoke_llm(llm, prompt, "planner")
+            state = {**state, "timings": _add_timing(state, "llm", "planner", llm_elapsed)}
             text = resp.content if hasattr(resp, "content") else str(resp)
             plan_lines = [line.strip("- ") for line in text.splitlines() if line.strip()]
             plan_steps = plan_lines[:6] if plan_lines else base_plan
         else:
             plan_steps = state.get("plan") or base_plan
 
+        # Link entities from evidence added since the last loop and pick the next
+        # BFS layer; every entity is pivoted on at most once per run.
+        # The graph object is carried in state and grown in place: rebuilding it
+        # each loop would cost O(graph) per loop on large dumps.
+        graph = state.get("entity_graph")
+        if graph is None:
+            graph = EntityGraph()
+            graph.add_input(state.get("input", ""), state.get("urls", []))
+        evidence = state.get("evidence") or []
+        graph.ingest(evidence[state.get("graph_upto", 0):])
+        pivoted = list(state.get("pivoted") or [])
+        frontier = graph.next_frontier(set(pivoted), config.pivot_depth, config.pivot_width)
+        plan_steps = list(plan_steps) + [f"pivot {node}" for node in frontier]
+
         loop = state.get("loop", 0) + 1
-        return {**state, "plan": plan_steps, "loop": loop, "stop": False}
+        return {
+            **state,
+            "plan": plan_steps,
+            "loop": loop,
+            "stop": False,
+            "entity_graph": graph,
+            "graph_upto": len(evidence),
+            "pivoted": pivoted + frontier,
+            "frontier": frontier,
+        }
 
     def tools_node(state: AgentState) -> AgentState:
         problem = ProblemInput(
@@ -173,31 +301,89 @@ def build_langgraph_app(config: OSINTConfig) -> StateGraph:
             urls=state.get("urls", []),
             image_paths=state.get("images", []),
         )
-        evs: List[Evidence] = []
-        for tool in tools:
-            evs.extend(tool.run(problem))
-
+        # Build the shared entity index once, before agents fan out.
+        problem.entities()
+        # Each tool is memoized per run on a fingerprint of the state fields it
+        # depends on; unchanged tools are skipped since their evidence is
+        # already in state. No node rewrites input/urls/images, so these jobs
+        # run once (again only after a failure). Entities found in evidence
+        # reach tools through the per-entity pivot jobs below instead.
+        candidates = [(tool.name, tool.depends_on, partial(tool.run, problem)) for tool in tools]
         # Also run LC BaseTools via ToolNode-style call (deterministic usage)
-        for lc_tool in lc_tools:
-            result = lc_tool.run(state.get("input", ""))
-            if isinstance(result, str):
-                evs.append(Evidence(source=lc_tool.name, fact=result, confidence=0.4))
+        candidates += [
+            (f"lc:{lc_tool.name}", ("input",), partial(_run_lc_tool, lc_tool, problem.text)) for lc_tool in lc_tools
+        ]
+        # Newly linked entities go only to the tools that handle their type, one
+        # job per entity: most agents look up just the first host or a few IPs
+        # of their input, so a combined problem would skip entities.
+        for node in state.get("frontier") or []:
+            pivot_problem = ProblemInput(text=as_query(node))
+            pivot_problem.entities()
+            candidates += [
+                (f"{tool.name}{PIVOT_SUFFIX}{node}", ("frontier",), partial(tool.run, pivot_problem))
+                for tool in tools
+                if node.partition(":")[0] in tool.pivots
+            ]
+        digests = _input_fingerprints(state, {key for _, deps, _ in candidates for key in deps})
+        tool_inputs = dict(state.get("tool_inputs") or {})
+
+        jobs = []
+        pending_inputs: Dict[str, str] = {}
+        for key, deps, fn in candidates:
+            fingerprint = "|".join(digests[dep] for dep in deps)
+            if tool_inputs.get(key) == fingerprint:
+                continue
+            pending_inputs[key] = fingerprint
+            jobs.append((key, fn))
+
+        # Per-tool progress for stream_mode="custom" consumers; a no-op otherwise.
+        writer = get_stream_writer()
+
+        def report(outcome) -> None:
+            writer({
+                "tool": outcome.name,
+                "status": outcome.status,
+                "elapsed": round(outcome.elapsed, 3),
+                "evidence": _evidence_to_dict(outcome.evidence),
+            })
+
+        evs: List[Evidence] = []
+        for (key, _), outcome in zip(jobs, executor.run(jobs, on_result=report)):
+            evs.extend(outcome.evidence)
+            label = _tool_label(key)
+            metrics.TOOL_SECONDS.observe(outcome.elapsed, tool=label)
+            metrics.TOOL_OUTCOMES.inc(tool=label, status=outcome.status)
+            state = {**state, "timings": _add_timing(state, "tools", label, outcome.elapsed)}
+            # Failed or timed-out tools are retried on the next loop.
+            if outcome.status == "ok":
+                tool_inputs[key] = pending_inputs[key]
 
         ev_dicts = _evidence_to_dict(evs)
         all_ev = (state.get("evidence") or []) + ev_dicts
-        return {**state, "evidence": _dedupe_evidence_dicts(all_ev)}
+        return {**state, "evidence": _dedupe_evidence_dicts(all_ev), "tool_inputs": tool_inputs}
 
     def validator_node(state: AgentState) -> AgentState:
+        # Evidence only grows by appending (dedupe keeps the first copy), so
+        # everything before the high-water mark was validated on an earlier loop.
+        evidence = state.get("evidence") or []
+        upto = min(state.get("validated_upto", 0), len(evidence))
+        new = evidence[upto:]
+        summary = state.get("evidence_summary") or []
         flags = list(state.get("flags") or [])
-        text_blob = " ".join(ev.get("fact", "") for ev in state.get("evidence", []))
-        flags.extend(_extract_flags_from_text(text_blob))
+        new_blob = " ".join(ev.get("fact", "") for ev in new)
+        flags.extend(_extract_flags_from_text(new_blob))
 
-        if llm:
+        stop = False
+        if llm and new:
             prompt = (
                 "You are a validator. Given evidence text, list any flag{...} candidates and decide whether to stop.\n"
                 "Answer in JSON: {\"flags\": [], \"stop\": bool}"
             )
-            resp = llm.invoke(f"{prompt}\nEvidence:\n{text_blob}\n")
+            earlier = "\n".join(f"- [{ev['source']}] {ev['fact']}" for ev in summary)
+            if earlier:
+                prompt += f"\nEarlier findings ({upto} items, strongest shown):\n{earlier}"
+            resp, llm_elapsed = _invoke_llm(llm, f"{prompt}\nNew evidence:\n{new_blob[:NEW_EVIDENCE_CHARS]}\n", "validator")
+            state = {**state, "timings": _add_timing(state, "llm", "validator", llm_elapsed)}
             content = resp.content if hasattr(resp, "content") else str(resp)
             try:
                 parsed = json.loads(content)
@@ -205,27 +391,41 @@ def build_langgraph_app(config: OSINTConfig) -> StateGraph:
                 stop = bool(parsed.get("stop"))
             except Exception:
                 stop = False
-        else:
-            stop = False
 
         stop = stop or bool(flags) or state.get("loop", 0) >= config.max_iterations
-        return {**state, "flags": list(dict.fromkeys(flags)), "stop": stop}
+        return {
+            **state,
+            "flags": list(dict.fromkeys(flags)),
+            "stop": stop,
+            "validated_upto": len(evidence),
+            "evidence_summary": _roll_summary(summary, new),
+        }
 
     def flagger_node(state: AgentState) -> AgentState:
         # Final formatting; no-op beyond dedupe here.
+        started = time.perf_counter()
         flags = list(dict.fromkeys(state.get("flags") or []))
-        _log_jsonl({
+        # Timed by hand rather than via _timed_node so the logged record includes it.
+        elapsed = time.perf_counter() - started
+        metrics.NODE_SECONDS.observe(elapsed, node="flagger")
+        metrics.RUNS.inc()
+        timings = _add_timing(state, "nodes", "flagger", elapsed)
+        get_run_logger().log({
+            "run_id": state.get("run_id") or uuid.uuid4().hex,
             "input": state.get("input", ""),
+            "urls": state.get("urls", []),
+            "images": state.get("images", []),
             "evidence": state.get("evidence", []),
             "flags": flags,
             "plan": state.get("plan", []),
             "loop": state.get("loop", 0),
+            "timings": timings,
         })
-        return {**state, "flags": flags, "stop": True}
+        return {**state, "flags": flags, "stop": True, "timings": timings}
 
-    graph.add_node("planner", planner_node)
-    graph.add_node("tools", tools_node)
-    graph.add_node("validator", validator_node)
+    graph.add_node("planner", _timed_node("planner", planner_node))
+    graph.add_node("tools", _timed_node("tools", tools_node))
+    graph.add_node("validator", _timed_node("validator", validator_node))
     graph.add_node("flagger", flagger_node)
 
     graph.add_edge("planner", "tools")
@@ -241,4 +441,75 @@ def build_langgraph_app(config: OSINTConfig) -> StateGraph:
 
     graph.set_entry_point("planner")
     graph.set_finish_point("flagger")
-    return graph
\ No newline at end of file
+    return graph
+
+
+# Process-wide registry: one tool set and one compiled graph per distinct config,
+# so per-run setup is a dict lookup.
+_registry_lock = threading.Lock()
+_tool_registry: Dict[Tuple, List[SubAgent]] = {}
+_compiled_apps: Dict[Tuple, Any] = {}
+_executors: Dict[Tuple, ToolExecutor] = {}
+
+
+def get_tools(config: OSINTConfig) -> List[SubAgent]:
+    """Return the shared tool set for ``config``."""
+
+    key = astuple(config)
+    with _registry_lock:
+        tools = _tool_registry.get(key)
+        if tools is None:
+            tools = _tool_registry[key] = build_tools(config)
+        return tools
+
+
+def get_compiled_app(config: OSINTConfig):
+    """Return the shared compiled graph for ``config``, compiling it on first use."""
+
+    key = astuple(config)
+    with _registry_lock:
+        app = _compiled_apps.get(key)
+        if app is not None:
+            return app
+    tools = get_tools(config)
+    with _registry_lock:
+        app = _compiled_apps.get(key)
+        if app is None:
+            # Shared by every run on this graph: room for tool_workers per web run and background job.
+            executor = ToolExecutor(
+                max_workers=config.tool_workers,
+                timeout=config.tool_timeout,
+                concurrency=config.web_concurrency + config.job_workers,
+            )
+            app = build_langgraph_app(config, tools=tools, executor=executor).compile()
+            _compiled_apps[key] = app
+            _executors[key] = executor
+        return app
+
+
+def warmup(config: Optional[OSINTConfig] = None) -> None:
+    """Compile the graph and build the tools ahead of the first request."""
+
+    get_compiled_app(config or load_config())
+
+
+def shutdown() -> None:
+    """Release pooled resources: tool threads, the shared HTTP client, the caches and the run log."""
+
+    # Imported here so ``python -m osinthunter.cache`` does not pre-import itself.
+    from .cache import close_response_cache
+    from .evidence_db import close_evidence_db
+
+    with _registry_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+        _compiled_apps.clear()
+        _tool_registry.clear()
+    for executor in executors:
+        executor.shutdown()
+    provider_http.close()
+    close_response_cache()
+    # The run log's sinks write to these; flush it first.
+    close_run_logger()
+    close_evidence_db()
+    close_image_index()
@@ -0,0 +1,65 @@
+"""Response cache for the planner and validator LLM calls.
+
+Both nodes call the model with ``temperature=0`` and often send the same
+prompt on every loop and on every rerun of a problem. ``CachedLLM`` wraps the
+chat model and stores answers in the shared provider cache (provider ``llm``)
+keyed on (model, base URL, SHA-256 of the prompt), so TTL, size eviction and
+``python -m osinthunter.cache`` work for LLM entries too.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from . import metrics
+
+CACHE_PROVIDER = "llm"
+
+
+@dataclass
+class CachedMessage:
+    """Stand-in for the chat model's message on a cache hit; nodes only read ``content``."""
+
+    content: str
+
+
+def request_key(model: str, base_url: Optional[str], prompt: str) -> str:
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    return f"model={model} base_url={base_url or 'openai'} prompt={digest}"
+
+
+class CachedLLM:
+    """Chat model wrapper that answers repeated prompts from the response cache.
+
+    With ``bypass`` every call goes to the model and nothing is stored.
+    """
+
+    def __init__(self, llm: Any, model: str, base_url: Optional[str] = None, bypass: bool = False) -> None:
+        self.llm = llm
+        self.model = model
+        self.base_url = base_url
+        self.bypass = bypass
+
+    def invoke(self, prompt: str) -> Any:
+        from .cache import get_response_cache
+
+        cache = None if self.bypass else get_response_cache()
+        if cache is None:
+            metrics.LLM_CACHE.inc(result="bypass")
+            return self.llm.invoke(prompt)
+
+        request = request_key(self.model, self.base_url, prompt)
+        entry = cache.get(CACHE_PROVIDER, request)
+        if entry is not None:
+            metrics.LLM_CACHE.inc(result="hit")
+            return CachedMessage(content=entry.payload["content"])
+
+        metrics.LLM_CACHE.inc(result="miss")
+        resp = self.llm.invoke(prompt)
+        content = resp.content if hasattr(resp, "content") else str(resp)
+        # Empty answers are usually transient failures; ask again next time.
+        if isinstance(content, str) and content.strip():
+            cache.put(CACHE_PROVIDER, request, {"content": content})
+        return resp
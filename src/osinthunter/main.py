@@ -3,19 +3,24 @@
 from __future__ import annotations
 
 import argparse
+import sys
 from pathlib import Path
+from typing import List, Optional
 
 from .agent import OSINTAgent
 from .models import ProblemInput
 
 
-def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Run the OSINT Hunter agent on a prompt")
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run the OSINT Hunter agent on a prompt",
+        epilog="Use `python -m osinthunter batch --help` to run a JSONL corpus of problems.",
+    )
     parser.add_argument("prompt", nargs="?", help="Problem text. If omitted, use --file")
     parser.add_argument("--file", type=Path, help="Path to a text file with the problem statement")
     parser.add_argument("--url", action="append", default=[], help="URL to include in the problem context")
     parser.add_argument("--image", action="append", default=[], help="Image path to include for image OSINT")
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def load_text(args: argparse.Namespace) -> str:
@@ -26,8 +31,15 @@ def load_text(args: argparse.Namespace) -> str:
     raise SystemExit("Provide a prompt or --file")
 
 
-def main() -> None:
-    args = parse_args()
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["batch"]:
+        from .batch import main as batch_main
+
+        batch_main(argv[1:])
+        return
+
+    args = parse_args(argv)
     text = load_text(args)
 
     agent = OSINTAgent()
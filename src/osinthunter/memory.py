@@ -1,29 +1,90 @@
-"""Simple in-memory evidence store."""
+"""In-memory evidence store with hashed dedupe and secondary indexes."""
 
 from __future__ import annotations
 
-from typing import List, Sequence
+from collections import defaultdict
+from typing import Dict, Iterator, List, Sequence, Set, Tuple
 
 from .models import Evidence
 
+# Metadata keys whose values name a pivotable entity.
+ENTITY_KEYS = ("ip", "domain", "username", "email", "emails", "target", "url", "path")
+CONFIDENCE_BUCKETS = 10
+
+
+def evidence_entities(evidence: Evidence) -> Iterator[str]:
+    """Yield the entities an evidence item's metadata refers to."""
+
+    meta = evidence.metadata or {}
+    for key in ENTITY_KEYS:
+        value = meta.get(key)
+        if isinstance(value, str) and value:
+            yield value.lower()
+        elif isinstance(value, (list, tuple)):
+            yield from (v.lower() for v in value if isinstance(v, str) and v)
+    if meta.get("lat") is not None and meta.get("lon") is not None:
+        yield f"{meta['lat']},{meta['lon']}"
+
+
+def _bucket(confidence: float) -> int:
+    return min(CONFIDENCE_BUCKETS - 1, max(0, int(confidence * CONFIDENCE_BUCKETS)))
+
 
 class EvidenceStore:
+    """Append-only evidence store.
+
+    Items are deduplicated on ``(source, fact)`` through a hash set, and indexed
+    by source, metadata entity and confidence bucket so lookups do not scan.
+    """
+
     def __init__(self) -> None:
         self._items: List[Evidence] = []
+        self._keys: Set[Tuple[str, str]] = set()
+        self._by_source: Dict[str, List[Evidence]] = defaultdict(list)
+        self._by_entity: Dict[str, List[Evidence]] = defaultdict(list)
+        self._by_bucket: List[List[Evidence]] = [[] for _ in range(CONFIDENCE_BUCKETS)]
 
-    def add(self, evidence: Evidence) -> None:
-        if evidence.fact and evidence not in self._items:
-            self._items.append(evidence)
+    def add(self, evidence: Evidence) -> bool:
+        key = evidence.key
+        if not evidence.fact or key in self._keys:
+            return False
+        self._keys.add(key)
+        self._items.append(evidence)
+        self._by_source[evidence.source].append(evidence)
+        for entity in set(evidence_entities(evidence)):
+            self._by_entity[entity].append(evidence)
+        self._by_bucket[_bucket(evidence.confidence)].append(evidence)
+        return True
 
     def extend(self, evidence_list: Sequence[Evidence]) -> None:
         for ev in evidence_list:
             self.add(ev)
 
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, evidence: Evidence) -> bool:
+        return evidence.key in self._keys
+
     def all(self) -> List[Evidence]:
         return list(self._items)
 
     def by_source(self, source: str) -> List[Evidence]:
-        return [ev for ev in self._items if ev.source == source]
+        return list(self._by_source.get(source, ()))
+
+    def by_entity(self, entity: str) -> List[Evidence]:
+        return list(self._by_entity.get(entity.lower(), ()))
+
+    def entities(self) -> List[str]:
+        return list(self._by_entity)
+
+    def by_confidence(self, minimum: float) -> List[Evidence]:
+        """Evidence with ``confidence >= minimum``, highest buckets first."""
+
+        out: List[Evidence] = []
+        for bucket in range(CONFIDENCE_BUCKETS - 1, _bucket(minimum) - 1, -1):
+            out.extend(ev for ev in self._by_bucket[bucket] if ev.confidence >= minimum)
+        return out
 
     def summary(self) -> str:
         parts = [f"- ({ev.confidence:.2f}) {ev.source}: {ev.fact}" for ev in self._items]
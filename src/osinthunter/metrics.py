@@ -0,0 +1,157 @@
+"""Process-wide counters, gauges and histograms in Prometheus text format.
+
+A small in-house registry so instrumentation does not need an extra
+dependency. Metrics are thread-safe and labelled with keyword arguments::
+
+    TOOL_SECONDS.observe(0.42, tool="shodan")
+    render()  # -> text for a /metrics endpoint
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry: List["_Metric"] = []
+_registry_lock = threading.Lock()
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        return "\n".join(lines + self.samples())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str) -> None:
+        super().__init__(name, help)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: object) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = float(value)
+
+    def dec(self, amount: float = 1.0, **labels: object) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, help)
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts..., count, sum]
+        self._values: Dict[LabelKey, List[float]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+            row[-2] += 1
+            row[-1] += value
+
+    def count(self, **labels: object) -> float:
+        with self._lock:
+            row = self._values.get(_label_key(labels))
+            return row[-2] if row else 0.0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(row)) for key, row in self._values.items())
+        lines: List[str] = []
+        for key, row in items:
+            for bound, count in zip(self.buckets, row):
+                lines.append(f"{self.name}_bucket{_format_labels(key, (('le', _format_value(bound)),))} {_format_value(count)}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {_format_value(row[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {_format_value(row[-2])}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(row[-1])}")
+        return lines
+
+
+def render() -> str:
+    """All registered metrics in Prometheus text exposition format."""
+
+    with _registry_lock:
+        metrics = list(_registry)
+    return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+NODE_SECONDS = Histogram("osinthunter_node_seconds", "Time spent in each graph node")
+NODE_ERRORS = Counter("osinthunter_node_errors_total", "Graph node invocations that raised")
+TOOL_SECONDS = Histogram("osinthunter_tool_seconds", "Sub-agent run time")
+TOOL_OUTCOMES = Counter("osinthunter_tool_outcomes_total", "Sub-agent runs by status (ok, error, timeout)")
+LLM_SECONDS = Histogram("osinthunter_llm_seconds", "LLM call latency by calling node")
+LLM_CACHE = Counter("osinthunter_llm_cache_total", "LLM calls by cache result (hit, miss, bypass)")
+PROVIDER_SECONDS = Histogram("osinthunter_provider_seconds", "Provider HTTP request latency")
+PROVIDER_REQUESTS = Counter("osinthunter_provider_requests_total", "Provider lookups by source (cache, network, coalesced onto an in-flight request)")
+PROVIDER_QUEUE_SECONDS = Histogram("osinthunter_provider_queue_seconds", "Time provider requests waited for the rate limiter")
+PROVIDER_THROTTLED = Counter("osinthunter_provider_throttled_total", "Provider responses rejected for rate limiting (429/503)")
+PROVIDER_ERRORS = Counter("osinthunter_provider_errors_total", "Provider requests that failed, by HTTP status or error kind")
+RUNS = Counter("osinthunter_runs_total", "Completed graph runs")
+RUNS_IN_FLIGHT = Gauge("osinthunter_runs_in_flight", "Web agent runs currently executing")
+RUNS_QUEUED = Gauge("osinthunter_runs_queued", "Web agent runs waiting for a slot")
+JOBS = Gauge("osinthunter_jobs", "Background jobs held by the scheduler, by status")
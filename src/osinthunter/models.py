@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from .entities import EntityIndex, build_entity_index
 
 
 @dataclass
@@ -14,17 +17,38 @@ class ProblemInput:
     urls: List[str] = field(default_factory=list)
     image_paths: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _entities: Optional[EntityIndex] = field(default=None, init=False, repr=False, compare=False)
 
+    def entities(self) -> EntityIndex:
+        """Entities in ``text`` and ``urls``, extracted once and shared by every agent."""
 
-@dataclass
+        if self._entities is None:
+            self._entities = build_entity_index(self.text, self.urls)
+        return self._entities
+
+
+@dataclass(slots=True)
 class Evidence:
-    """Structured finding captured by the agent."""
+    """Structured finding captured by the agent.
+
+    Slotted to keep large recon runs compact; source names are interned since
+    there are only a handful of them across thousands of records.
+    """
 
     source: str
     fact: str
     confidence: float = 0.5
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    def __post_init__(self) -> None:
+        self.source = sys.intern(self.source)
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        """Identity used for dedupe: the same fact from the same source."""
+
+        return (self.source, self.fact)
+
 
 @dataclass
 class PlanStep:
@@ -0,0 +1,188 @@
+"""Entity pivot graph and bounded breadth-first expansion.
+
+Tools report what they found in evidence ``metadata`` (Shodan an IP and its
+ports, Hunter a domain and its emails, text analysis a handle, ...).
+``EntityGraph`` turns that into typed nodes and edges with an adjacency index,
+so handle -> email -> domain -> IP -> open ports chains are linked no matter
+which tool surfaced each hop.
+
+The planner calls ``next_frontier`` once per loop: entities of the problem
+input are depth 0 and are covered by the normal tool pass; every newly linked
+entity within ``max_depth`` hops is handed to the pivot-capable tools exactly
+once per run, at most ``max_width`` per loop, nearest first.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from urllib.parse import urlsplit
+
+from .entities import build_entity_index, is_ipv4
+
+# Node types tools can investigate; the rest (ports, technologies) are leaves.
+# Emails are investigated through their domain and local-part handle.
+PIVOT_TYPES = ("ip", "domain", "handle", "url", "coordinates")
+
+# Mailbox names that say nothing about a person.
+_ROLE_MAILBOXES = {"info", "admin", "contact", "support", "sales", "hello", "noreply", "no-reply", "webmaster", "office", "mail"}
+
+
+def node_id(kind: str, value: str) -> str:
+    return f"{kind}:{value.strip().lstrip('@').lower() if kind != 'url' else value.strip()}"
+
+
+def as_query(node: str) -> str:
+    """Render a pivot node as text that ``build_entity_index`` extracts back to the same entity."""
+
+    kind, _, value = node.partition(":")
+    return f"@{value}" if kind == "handle" else value
+
+
+class EntityGraph:
+    """Typed entity nodes and relation edges with an adjacency index.
+
+    ``depth`` is the shortest hop count from an entity in the problem input,
+    kept current as nodes and edges are added (only the part of the graph whose
+    depth improves is revisited), so picking the next frontier never re-walks
+    the whole graph.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.edges: Set[Tuple[str, str, str, str]] = set()
+        self.adjacency: Dict[str, Set[str]] = {}
+
+    def add_node(self, kind: str, value: str, depth: Optional[int] = None) -> str:
+        node = node_id(kind, value)
+        entry = self.nodes.get(node)
+        if entry is None:
+            entry = self.nodes[node] = {"type": kind, "value": node.partition(":")[2], "depth": depth}
+            self.adjacency[node] = set()
+        if depth is not None and (entry["depth"] is None or depth < entry["depth"]):
+            entry["depth"] = depth
+            self._relax(node)
+        return node
+
+    def add_edge(self, src: str, relation: str, dst: str, source: str = "") -> None:
+        if src == dst:
+            return
+        self.edges.add((src, relation, dst, source))
+        self.adjacency[src].add(dst)
+        self.adjacency[dst].add(src)
+        for near, far in ((src, dst), (dst, src)):
+            depth, other = self.nodes[near]["depth"], self.nodes[far]["depth"]
+            if depth is not None and (other is None or other > depth + 1):
+                self.nodes[far]["depth"] = depth + 1
+                self._relax(far)
+
+    def _relax(self, start: str) -> None:
+        """Propagate an improved depth at ``start`` breadth-first to its neighbours."""
+
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            depth = self.nodes[node]["depth"] + 1
+            for other in self.adjacency[node]:
+                entry = self.nodes[other]
+                if entry["depth"] is None or entry["depth"] > depth:
+                    entry["depth"] = depth
+                    queue.append(other)
+
+    def neighbors(self, node: str) -> Set[str]:
+        return self.adjacency.get(node, set())
+
+    def add_input(self, text: str, urls: Sequence[str] = ()) -> None:
+        """Add the problem's own entities as depth-0 roots."""
+
+        index = build_entity_index(text, urls)
+        for url in index.urls:
+            self.add_node("url", url, 0)
+        for ip in index.ips:
+            self.add_node("ip", ip, 0)
+        for host in index.hosts:
+            self.add_node("domain", host, 0)
+        for handle in index.handles + index.url_handles:
+            self.add_node("handle", handle, 0)
+        for email in index.emails:
+            self._add_email(email, "input", 0)
+        for lat, lon in index.coordinates:
+            self.add_node("coordinates", f"{lat}, {lon}", 0)
+        for url in index.urls:
+            host = urlsplit(url).hostname
+            if host:
+                kind = "ip" if is_ipv4(host) else "domain"
+                self.add_edge(node_id("url", url), "hosted_on", self.add_node(kind, host, 0), "input")
+
+    def _add_email(self, email: str, source: str, depth: Optional[int] = None) -> str:
+        node = self.add_node("email", email, depth)
+        local, _, domain = email.lower().partition("@")
+        if domain:
+            self.add_edge(node, "at_domain", self.add_node("domain", domain), source)
+        if local and local not in _ROLE_MAILBOXES:
+            self.add_edge(node, "local_part", self.add_node("handle", local), source)
+        return node
+
+    def ingest(self, evidence: Iterable[Dict[str, Any]]) -> None:
+        """Link the entities named in each evidence item's metadata.
+
+        Entities a tool reports without any link to an already placed entity
+        (an IP found by a search, EXIF GPS) count as one hop from the input.
+        """
+
+        for ev in evidence:
+            meta = ev.get("metadata") or {}
+            source = ev.get("source", "")
+            subject: Optional[str] = None
+            reported: List[str] = []
+            if isinstance(meta.get("ip"), str):
+                subject = self.add_node("ip", meta["ip"])
+                reported.append(subject)
+                for port in meta.get("ports") or []:
+                    self.add_edge(subject, "open_port", self.add_node("port", f"{meta['ip']}:{port}"), source)
+                for service in meta.get("services") or []:
+                    name = service.get("service_name") if isinstance(service, dict) else service
+                    if name:
+                        self.add_edge(subject, "runs", self.add_node("service", f"{meta['ip']}/{name}"), source)
+            if isinstance(meta.get("domain"), str):
+                domain = self.add_node("domain", meta["domain"])
+                reported.append(domain)
+                if subject:
+                    self.add_edge(domain, "resolves_to", subject, source)
+                subject = domain
+                for email in meta.get("emails") or []:
+                    if isinstance(email, str) and "@" in email:
+                        self.add_edge(domain, "has_email", self._add_email(email, source), source)
+                for tech in meta.get("tech") or []:
+                    if tech:
+                        self.add_edge(domain, "uses", self.add_node("tech", tech), source)
+            if isinstance(meta.get("username"), str):
+                reported.append(self.add_node("handle", meta["username"]))
+            if isinstance(meta.get("email"), str) and "@" in meta["email"]:
+                email = self._add_email(meta["email"], source)
+                reported.append(email)
+                if subject:
+                    self.add_edge(subject, "has_email", email, source)
+            if isinstance(meta.get("target"), str):
+                target = meta["target"]
+                kind = "url" if "://" in target else "domain"
+                reported.append(self.add_node(kind, target))
+            if meta.get("lat") is not None and meta.get("lon") is not None:
+                lat, lon = (f"{v:.6f}" if isinstance(v, float) else str(v) for v in (meta["lat"], meta["lon"]))
+                reported.append(self.add_node("coordinates", f"{lat}, {lon}"))
+            for node in reported:
+                if self.nodes[node]["depth"] is None:
+                    self.nodes[node]["depth"] = 1
+                    self._relax(node)
+
+    def next_frontier(self, visited: Set[str], max_depth: int, max_width: int) -> List[str]:
+        """Unvisited pivotable entities within ``max_depth`` hops, nearest first, at most ``max_width``."""
+
+        candidates = []
+        for order, (node, entry) in enumerate(self.nodes.items()):
+            if node in visited or entry["type"] not in PIVOT_TYPES:
+                continue
+            depth = entry["depth"]
+            if depth is not None and 0 < depth <= max_depth:
+                candidates.append((depth, order, node))
+        return [node for _, _, node in sorted(candidates)[:max_width]]
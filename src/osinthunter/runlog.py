@@ -0,0 +1,210 @@
+"""Non-blocking JSONL run log with batching and rotation.
+
+Graph runs hand their record to ``RunLogger.log``, which only enqueues it. A
+background thread serializes records, appends them in batches, rotates the file
+by size or age and gzips rotated segments, keeping the newest ``backups``.
+"""
+
+from __future__ import annotations
+
+import atexit
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from . import metrics
+
+DEFAULT_PATH = ".cache/logs/agent_runs.jsonl"
+
+SINK_ERRORS = metrics.Counter("osinthunter_runlog_sink_errors_total", "Run-record batches a sink failed to store")
+DROPPED = metrics.Counter("osinthunter_runlog_dropped_total", "Run records dropped because the log queue was full")
+WRITTEN = metrics.Counter("osinthunter_runlog_written_total", "Run records written to the JSONL log")
+
+_STOP = object()
+
+
+class RunLogger:
+    """Background JSONL writer fed by a bounded queue.
+
+    ``log`` never blocks: when ``max_queue`` records are pending the record is
+    dropped and counted. Records are flushed every ``batch_size`` records or
+    ``flush_interval`` seconds. The file rotates once it exceeds ``max_bytes`` or
+    has been written to for ``max_age`` seconds (0 disables either check).
+
+    Each written batch is also passed to every callable in ``sinks`` on the
+    writer thread (e.g. the evidence database); a failing sink is counted and
+    does not affect the file.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike = DEFAULT_PATH,
+        max_queue: int = 1000,
+        batch_size: int = 50,
+        flush_interval: float = 1.0,
+        max_bytes: int = 50 * 1024 * 1024,
+        max_age: float = 86400.0,
+        backups: int = 5,
+        sinks: Sequence[Callable[[List[Dict[str, Any]]], Any]] = (),
+    ) -> None:
+        self.path = Path(path)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.backups = backups
+        self.sinks = list(sinks)
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, max_queue))
+        self._flushed = threading.Condition()
+        self._pending = 0
+        self._file = None
+        self._opened_at = 0.0
+        self._thread = threading.Thread(target=self._run, name="osinthunter-runlog", daemon=True)
+        self._thread.start()
+
+    def log(self, record: Dict[str, Any]) -> bool:
+        """Queue ``record`` for writing; returns False if it had to be dropped."""
+
+        record = {**record, "ts": datetime.now(timezone.utc).isoformat()}
+        with self._flushed:
+            self._pending += 1
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._flushed:
+                self._pending -= 1
+            DROPPED.inc()
+            return False
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every queued record is on disk (or ``timeout`` passes)."""
+
+        with self._flushed:
+            return self._flushed.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush outstanding records and stop the writer thread."""
+
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[Dict[str, Any]] = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            if batch:
+                self._write(batch)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            fh = self._open()
+            fh.write("".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in batch))
+            fh.flush()
+            WRITTEN.inc(len(batch))
+            too_big = self.max_bytes and fh.tell() >= self.max_bytes
+            too_old = self.max_age and time.time() - self._opened_at >= self.max_age
+            if too_big or too_old:
+                self.rotate()
+        except OSError:
+            DROPPED.inc(len(batch))
+        try:
+            for sink in self.sinks:
+                try:
+                    sink(batch)
+                except Exception:
+                    SINK_ERRORS.inc()
+        finally:
+            with self._flushed:
+                self._pending -= len(batch)
+                self._flushed.notify_all()
+
+    def _open(self):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+            self._opened_at = time.time()
+        return self._file
+
+    def rotate(self) -> Optional[Path]:
+        """Close the current file, gzip it next to the log and prune old segments.
+
+        Only called from the writer thread.
+        """
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return None
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        segment = self.path.with_name(f"{self.path.name}.{stamp}.gz")
+        with self.path.open("rb") as src, gzip.open(segment, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        self.path.unlink()
+        segments = sorted(self.path.parent.glob(f"{self.path.name}.*.gz"))
+        for old in segments[: max(0, len(segments) - self.backups)]:
+            old.unlink(missing_ok=True)
+        return segment
+
+
+_logger: Optional[RunLogger] = None
+_logger_lock = threading.Lock()
+
+
+def get_run_logger() -> RunLogger:
+    """Return the process-wide run logger configured from the environment."""
+
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            from .evidence_db import get_evidence_db
+            from .tools.image_index import record_runs as record_image_runs
+
+            db = get_evidence_db()
+            # Later runs on these images (or near-duplicates) start from what this one found.
+            sinks = ([db.record_runs] if db is not None else []) + [record_image_runs]
+            _logger = RunLogger(
+                path=os.getenv("OSINTHUNTER_LOG_PATH", DEFAULT_PATH),
+                max_queue=int(os.getenv("OSINTHUNTER_LOG_QUEUE", "1000")),
+                max_bytes=int(float(os.getenv("OSINTHUNTER_LOG_MAX_MB", "50")) * 1024 * 1024),
+                max_age=float(os.getenv("OSINTHUNTER_LOG_ROTATE_SECONDS", "86400")),
+                backups=int(os.getenv("OSINTHUNTER_LOG_BACKUPS", "5")),
+                sinks=sinks,
+            )
+        return _logger
+
+
+def close_run_logger() -> None:
+    """Flush and stop the process-wide run logger (a new one starts on next use)."""
+
+    global _logger
+    with _logger_lock:
+        logger, _logger = _logger, None
+    if logger is not None:
+        logger.close()
+
+
+atexit.register(close_run_logger)
@@ -1,51 +1,55 @@
-"""Tool registry for OSINT Hunter."""
-
-from .text_analysis import TextAnalysisTool
-from .web_search import WebSearchTool
-from .url_investigation import URLInvestigationTool
-from .sns_osint import SNSOSINTTool
-from .image_osint import ImageOSINTTool
-from .geolocation import GeolocationTool
-from .tavily_agent import TavilySearchAgent
-from .google_lens import GoogleLensAgent
-from .recon_agents import ShodanAgent, CensysAgent, WhoisAgent, BuiltWithAgent, HunterAgent, PhonebookAgent, WaybackAgent
-from .social_agents import SocialSearchAgent, SherlockAgent
-from .geoint_agents import EarthViewAgent, YandexReverseImageAgent
-from .text_analysis import TextAnalysisAgent
-from .url_investigation import URLInvestigationAgent
-from .sns_osint import SNSOSINTAgent
-from .web_search import WebSearchAgent
-from .geolocation import GeolocationAgent
-from .image_osint import ImageOSINTAgent
-from .geolocation import GeolocationLookupTool
-from .image_osint import ImageInspectTool
-
-__all__ = [
-    "TextAnalysisTool",
-    "WebSearchTool",
-    "URLInvestigationTool",
-    "SNSOSINTTool",
-    "ImageOSINTTool",
-    "GeolocationTool",
-    "GeolocationLookupTool",
-    "ImageInspectTool",
-    "TavilySearchAgent",
-    "GoogleLensAgent",
-    "TextAnalysisAgent",
-    "URLInvestigationAgent",
-    "SNSOSINTAgent",
-    "WebSearchAgent",
-    "GeolocationAgent",
-    "ImageOSINTAgent",
-    "ShodanAgent",
-    "CensysAgent",
-    "WhoisAgent",
-    "BuiltWithAgent",
-    "HunterAgent",
-    "PhonebookAgent",
-    "WaybackAgent",
-    "SocialSearchAgent",
-    "SherlockAgent",
-    "EarthViewAgent",
-    "YandexReverseImageAgent",
-]
+"""Tool registry for OSINT Hunter.
+
+Agents are resolved lazily (PEP 562) so importing one agent module does not
+import every other agent and its dependencies.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any, Dict
+
+_EXPORTS: Dict[str, str] = {
+    "TextAnalysisTool": "text_analysis",
+    "WebSearchTool": "web_search",
+    "URLInvestigationTool": "url_investigation",
+    "SNSOSINTTool": "sns_osint",
+    "ImageOSINTTool": "image_osint",
+    "GeolocationTool": "geolocation",
+    "GeolocationLookupTool": "geolocation",
+    "ImageInspectTool": "image_osint",
+    "TavilySearchAgent": "tavily_agent",
+    "GoogleLensAgent": "google_lens",
+    "TextAnalysisAgent": "text_analysis",
+    "URLInvestigationAgent": "url_investigation",
+    "SNSOSINTAgent": "sns_osint",
+    "WebSearchAgent": "web_search",
+    "GeolocationAgent": "geolocation",
+    "ImageOSINTAgent": "image_osint",
+    "ShodanAgent": "recon_agents",
+    "CensysAgent": "recon_agents",
+    "WhoisAgent": "recon_agents",
+    "BuiltWithAgent": "recon_agents",
+    "HunterAgent": "recon_agents",
+    "PhonebookAgent": "recon_agents",
+    "WaybackAgent": "recon_agents",
+    "SocialSearchAgent": "social_agents",
+    "SherlockAgent": "social_agents",
+    "EarthViewAgent": "geoint_agents",
+    "YandexReverseImageAgent": "geoint_agents",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
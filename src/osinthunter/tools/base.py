@@ -2,22 +2,49 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
-from typing import List
+from typing import ClassVar, List, Tuple
 
 from ..models import Evidence, ProblemInput
 
 
 @dataclass
 class Agent:
-    """Lightweight agent interface."""
+    """Lightweight agent interface.
+
+    Subclasses implement either ``run`` (blocking) or ``arun`` (async); the other
+    one is derived. Network agents implement ``arun`` so their requests share the
+    pooled client in ``tools.http``.
+
+    ``depends_on`` names the graph state fields (``input``, ``urls``, ``images``)
+    an agent reads; the graph only re-runs it when one of them changes or its
+    last run failed. Those fields are the problem as submitted, so in practice
+    an agent runs once per problem; entities found later arrive via ``pivots``.
+
+    ``pivots`` names the entity types (see ``osinthunter.pivots``) an agent can
+    investigate. When later loops link new entities of those types, the agent
+    runs again once for each of them.
+    """
+
+    depends_on: ClassVar[Tuple[str, ...]] = ("input", "urls", "images")
+    pivots: ClassVar[Tuple[str, ...]] = ()
 
     name: str
     description: str
     requires_network: bool = False
 
     def run(self, problem: ProblemInput) -> List[Evidence]:
-        raise NotImplementedError("Agent.run must be implemented by subclasses")
+        if type(self).arun is Agent.arun:
+            raise NotImplementedError("Agent.run or Agent.arun must be implemented by subclasses")
+        from .http import run_sync
+
+        return run_sync(self.arun(problem))
+
+    async def arun(self, problem: ProblemInput) -> List[Evidence]:
+        if type(self).run is Agent.run:
+            raise NotImplementedError("Agent.run or Agent.arun must be implemented by subclasses")
+        return await asyncio.to_thread(self.run, problem)
 
 
 # Backward compatibility alias
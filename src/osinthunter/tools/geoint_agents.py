@@ -9,6 +9,8 @@ from ..models import Evidence, ProblemInput
 
 
 class EarthViewAgent(Agent):
+    depends_on = ()
+
     def __init__(self) -> None:
         super().__init__(name="earth-view", description="Google Earth/Street View guidance", requires_network=False)
 
@@ -17,6 +19,8 @@ class EarthViewAgent(Agent):
 
 
 class YandexReverseImageAgent(Agent):
+    depends_on = ("images",)
+
     def __init__(self) -> None:
         super().__init__(name="yandex-images", description="Reverse image search guidance via Yandex", requires_network=False)
 
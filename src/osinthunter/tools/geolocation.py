@@ -2,16 +2,19 @@
 
 from __future__ import annotations
 
-import re
 from typing import List
 
 from langchain_core.tools import BaseTool
 
 from .base import Agent
+from ..entities import build_entity_index
 from ..models import Evidence, ProblemInput
 
 
 class GeolocationAgent(Agent):
+    depends_on = ("input",)
+    pivots = ("coordinates",)
+
     def __init__(self) -> None:
         super().__init__(
             name="geolocation",
@@ -20,8 +23,7 @@ class GeolocationAgent(Agent):
         )
 
     def run(self, problem: ProblemInput) -> List[Evidence]:
-        text = problem.text or ""
-        coords = set(re.findall(r"(-?\d{1,3}\.\d{3,}),\s*(-?\d{1,3}\.\d{3,})", text))
+        coords = problem.entities().coordinates
 
         evidence: List[Evidence] = []
         for lat, lon in coords:
@@ -46,7 +48,7 @@ class GeolocationLookupTool(BaseTool):
 
     def _run(self, query: str) -> str:
         # Simple deterministic guidance; this is safe for offline use.
-        coords = re.findall(r"(-?\d{1,3}\.\d{3,}),\s*(-?\d{1,3}\.\d{3,})", query)
+        coords = build_entity_index(query).coordinates
         if coords:
             parts = [f"Map lookup for coordinates {lat}, {lon}" for lat, lon in coords]
             return " | ".join(parts)
@@ -0,0 +1,325 @@
+"""Shared HTTP plumbing for network agents.
+
+Every provider call goes through one process-wide ``httpx.AsyncClient`` owned by
+a background event loop, so TCP/TLS connections are kept alive and reused across
+agents, threads and runs instead of being re-established per request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Mapping, Optional, TypeVar
+from urllib.parse import urlencode, urlsplit
+
+from .. import metrics
+from . import ratelimit
+
+if TYPE_CHECKING:
+    import httpx
+
+T = TypeVar("T")
+
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 32
+MAX_CONNECTIONS_PER_HOST = 8
+KEEPALIVE_EXPIRY = 30.0
+DEFAULT_TIMEOUT = 10.0
+
+# Query parameters that carry credentials never become part of a cache key.
+SECRET_PARAMS = {"key", "api_key", "apikey", "token", "access_token"}
+
+# Points every provider request at a stand-in server (``benchmarks.stub_server``):
+# https://api.shodan.io/x becomes <base>/api.shodan.io/x. Cache keys keep the real URL.
+PROVIDER_BASE_URL_ENV = "OSINTHUNTER_PROVIDER_BASE_URL"
+
+# HTTP/2 needs the optional ``h2`` package (``httpx[http2]``).
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_client: Optional[httpx.AsyncClient] = None
+_host_slots: Dict[str, asyncio.Semaphore] = {}
+_limiters: Dict[str, ratelimit.RateLimiter] = {}
+_inflight: Dict[str, "asyncio.Future[Any]"] = {}
+
+
+def _ensure_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _thread
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="osinthunter-http", daemon=True)
+            thread.start()
+            _loop, _thread = loop, thread
+        return _loop
+
+
+def _get_client() -> "httpx.AsyncClient":
+    # Only ever called on the shared loop, so no locking is needed here.
+    global _client
+    if _client is None:
+        # Imported on first request so offline runs never load httpx.
+        import httpx
+
+        _client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            timeout=DEFAULT_TIMEOUT,
+        )
+    return _client
+
+
+def _host_slot(host: str) -> asyncio.Semaphore:
+    slot = _host_slots.get(host)
+    if slot is None:
+        slot = _host_slots[host] = asyncio.Semaphore(MAX_CONNECTIONS_PER_HOST)
+    return slot
+
+
+def _limiter(provider: str, params: Optional[Mapping[str, Any]], headers: Optional[Mapping[str, str]]) -> Optional[ratelimit.RateLimiter]:
+    # Only called on the shared loop, like _host_slot.
+    limit = ratelimit.limit_for(provider)
+    if limit is None:
+        return None
+    key = ratelimit.limiter_key(provider, params, headers)
+    limiter = _limiters.get(key)
+    if limiter is None or limiter.limit != limit:
+        limiter = _limiters[key] = ratelimit.RateLimiter(limit)
+    return limiter
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """Run a coroutine on the shared HTTP loop and block until it finishes."""
+
+    loop = _ensure_loop()
+    if threading.current_thread() is _thread:
+        raise RuntimeError("run_sync() cannot be called from the shared HTTP loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+async def run_on_http_loop(coro: Awaitable[T]) -> T:
+    """Await a coroutine on the shared HTTP loop from any event loop."""
+
+    loop = _ensure_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+def _route(url: str) -> str:
+    base = os.getenv(PROVIDER_BASE_URL_ENV)
+    if not base:
+        return url
+    parsed = urlsplit(url)
+    path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+    return f"{base.rstrip('/')}/{parsed.hostname}{path}"
+
+
+async def aget(
+    url: str,
+    *,
+    params: Optional[Mapping[str, Any]] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> httpx.Response:
+    """GET through the pooled client, capped per host."""
+
+    url = _route(url)
+
+    async def _get() -> httpx.Response:
+        async with _host_slot(urlsplit(url).hostname or ""):
+            return await _get_client().get(url, params=params, headers=headers, timeout=timeout)
+
+    return await run_on_http_loop(_get())
+
+
+class ProviderError(Exception):
+    """Raised for provider responses that are not usable (e.g. cached 404s)."""
+
+    def __init__(self, provider: str, status: int, detail: str = "") -> None:
+        super().__init__(f"{provider} returned HTTP {status}{f' ({detail})' if detail else ''}")
+        self.provider = provider
+        self.status = status
+
+
+def normalize_request(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """Canonical, credential-free description of a GET request."""
+
+    import httpx
+
+    parsed = httpx.URL(url)
+    query = sorted(
+        (str(k), str(v))
+        for k, v in list(parsed.params.multi_items()) + list((params or {}).items())
+        if str(k).lower() not in SECRET_PARAMS
+    )
+    target = f"{parsed.scheme}://{parsed.host.lower()}{parsed.path}"
+    return f"GET {target}?{urlencode(query)}" if query else f"GET {target}"
+
+
+async def _limited_get(
+    provider: str,
+    url: str,
+    *,
+    params: Optional[Mapping[str, Any]],
+    headers: Optional[Mapping[str, str]],
+    timeout: float,
+) -> httpx.Response:
+    """GET under ``provider``'s rate limit, retrying throttled (429/503) responses.
+
+    A throttled response pauses the provider's bucket for every caller, so the
+    retry and any queued requests wait instead of burning more quota.
+    """
+
+    import httpx
+
+    limiter = _limiter(provider, params, headers)
+    for attempt in range(ratelimit.MAX_RETRIES + 1):
+        queued = time.perf_counter()
+        if limiter is not None:
+            await limiter.acquire()
+        metrics.PROVIDER_QUEUE_SECONDS.observe(time.perf_counter() - queued, provider=provider)
+        started = time.perf_counter()
+        try:
+            resp = await aget(url, params=params, headers=headers, timeout=timeout)
+        except httpx.TimeoutException:
+            metrics.PROVIDER_ERRORS.inc(provider=provider, status="timeout")
+            raise
+        except httpx.HTTPError:
+            metrics.PROVIDER_ERRORS.inc(provider=provider, status="transport")
+            raise
+        finally:
+            metrics.PROVIDER_SECONDS.observe(time.perf_counter() - started, provider=provider)
+            if limiter is not None:
+                limiter.release()
+        if resp.status_code not in ratelimit.THROTTLED_STATUSES:
+            if limiter is not None:
+                limiter.succeeded()
+            return resp
+        metrics.PROVIDER_THROTTLED.inc(provider=provider)
+        delay = ratelimit.retry_delay(resp.headers, attempt)
+        if limiter is not None:
+            limiter.throttled(delay)
+        if attempt == ratelimit.MAX_RETRIES or delay > ratelimit.MAX_RETRY_WAIT:
+            break
+        if limiter is None:
+            await asyncio.sleep(delay)
+    metrics.PROVIDER_ERRORS.inc(provider=provider, status=resp.status_code)
+    return resp
+
+
+async def fetch_json(
+    provider: str,
+    url: str,
+    *,
+    params: Optional[Mapping[str, Any]] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    is_empty: Optional[Callable[[Any], bool]] = None,
+) -> Any:
+    """GET a JSON document, served from the shared response cache when possible.
+
+    Concurrent identical requests share one upstream call. 404s and payloads
+    for which ``is_empty`` returns True are cached negatively.
+    """
+
+    from ..cache import get_response_cache
+
+    cache = get_response_cache()
+    request = normalize_request(url, params)
+    if cache is not None:
+        entry = await asyncio.to_thread(cache.get, provider, request)
+        if entry is not None:
+            metrics.PROVIDER_REQUESTS.inc(provider=provider, source="cache")
+            if entry.status >= 400:
+                raise ProviderError(provider, entry.status, "cached")
+            return entry.payload
+
+    return await run_on_http_loop(
+        _single_flight(
+            provider,
+            request,
+            lambda: _fetch_and_store(provider, url, request, params=params, headers=headers, timeout=timeout, is_empty=is_empty),
+        )
+    )
+
+
+async def _single_flight(provider: str, request: str, fetch: Callable[[], Awaitable[T]]) -> T:
+    """Run ``fetch`` once for concurrent callers with the same normalized request.
+
+    Later callers await the first caller's task instead of hitting the provider
+    again and get the same payload (or exception); agents only read payloads.
+    The task is shielded, so one caller giving up does not cancel the others.
+    Runs on the shared loop.
+    """
+
+    key = f"{provider}\x00{request}"
+    task = _inflight.get(key)
+    if task is not None:
+        metrics.PROVIDER_REQUESTS.inc(provider=provider, source="coalesced")
+        return await asyncio.shield(task)
+    metrics.PROVIDER_REQUESTS.inc(provider=provider, source="network")
+    task = _inflight[key] = asyncio.ensure_future(fetch())
+    task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+async def _fetch_and_store(
+    provider: str,
+    url: str,
+    request: str,
+    *,
+    params: Optional[Mapping[str, Any]],
+    headers: Optional[Mapping[str, str]],
+    timeout: float,
+    is_empty: Optional[Callable[[Any], bool]],
+) -> Any:
+    from ..cache import get_response_cache
+
+    cache = get_response_cache()
+    resp = await _limited_get(provider, url, params=params, headers=headers, timeout=timeout)
+    if resp.status_code >= 400 and resp.status_code not in ratelimit.THROTTLED_STATUSES:
+        metrics.PROVIDER_ERRORS.inc(provider=provider, status=resp.status_code)
+    if resp.status_code == 404:
+        if cache is not None:
+            await asyncio.to_thread(cache.put, provider, request, None, status=404, negative=True)
+        raise ProviderError(provider, 404)
+    resp.raise_for_status()
+    data = resp.json()
+    if cache is not None:
+        negative = bool(is_empty and is_empty(data))
+        await asyncio.to_thread(cache.put, provider, request, data, negative=negative)
+    return data
+
+
+def close() -> None:
+    """Close the shared client and stop the background loop."""
+
+    global _client, _loop, _thread
+    with _lock:
+        loop, thread, client = _loop, _thread, _client
+        _loop, _thread, _client = None, None, None
+        _host_slots.clear()
+        _limiters.clear()
+        _inflight.clear()
+    if loop is None or loop.is_closed():
+        return
+    if client is not None:
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=5.0)
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None:
+        thread.join(timeout=5.0)
+    loop.close()
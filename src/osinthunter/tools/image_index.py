@@ -0,0 +1,407 @@
+"""Perceptual-hash index of previously investigated images.
+
+Each image gets a 64-bit pHash (DCT of a 32x32 grayscale thumbnail) and dHash
+(gradient of a 9x8 thumbnail). Both survive recompression, resizing and light
+crops, so a re-posted challenge image still lands within a few bits of the
+original. Hashes are stored in SQLite together with the evidence the last run
+found about that image, the flags attributable to it and that run's id; on start-up the pHashes are loaded into an
+in-memory multi-index, so a lookup touches a handful of buckets instead of
+every row.
+
+Inspect the index with ``python -m osinthunter.tools.image_index``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sqlite3
+import threading
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_PATH = ".cache/image_index.sqlite3"
+# A light crop plus recompression moves the pHash by ~6 bits; unrelated images sit at 25+.
+DEFAULT_MAX_DISTANCE = 6
+MAX_STORED_EVIDENCE = 20
+MIN_STORED_CONFIDENCE = 0.5
+MEMORY_CACHE_SIZE = 1024
+
+FLAG_RE = re.compile(r"flag\{[^}]+\}", re.IGNORECASE)
+# Evidence metadata that EntityGraph.ingest turns into pivots; kept with stored evidence.
+PIVOT_METADATA = ("ip", "domain", "username", "email", "target", "lat", "lon")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    sha256 TEXT PRIMARY KEY,
+    phash INTEGER NOT NULL,
+    dhash INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    evidence TEXT NOT NULL,
+    flags TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    runs INTEGER NOT NULL DEFAULT 1,
+    run_id TEXT NOT NULL DEFAULT ''
+);
+"""
+
+# cos((2n + 1) * k * pi / 64) for the 8 lowest frequencies of a 32-point DCT-II.
+_DCT = [[math.cos((2 * n + 1) * k * math.pi / 64) for n in range(32)] for k in range(8)]
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def _bits(values: Iterable[bool]) -> int:
+    out = 0
+    for value in values:
+        out = (out << 1) | bool(value)
+    return out
+
+
+def perceptual_hashes(path: str | Path) -> Tuple[int, int]:
+    """Return ``(phash, dhash)`` for the image at ``path``."""
+
+    from PIL import Image
+
+    with Image.open(path) as img:
+        # JPEGs are decoded at 1/2..1/8 scale straight from the DCT; far cheaper than full size.
+        img.draft("L", (64, 64))
+        gray = img.convert("L")
+    small = gray.resize((9, 8), Image.Resampling.BILINEAR).tobytes()
+    dhash = _bits(small[row * 9 + col] > small[row * 9 + col + 1] for row in range(8) for col in range(8))
+
+    pixels = gray.resize((32, 32), Image.Resampling.BILINEAR).tobytes()
+    rows = [[sum(c * p for c, p in zip(_DCT[k], pixels[r * 32 : r * 32 + 32])) for k in range(8)] for r in range(32)]
+    coeffs = [sum(_DCT[k][r] * rows[r][u] for r in range(32)) for k in range(8) for u in range(8)]
+    # The DC term is the average brightness; leave it out of the median.
+    median = sorted(coeffs[1:])[len(coeffs[1:]) // 2]
+    phash = _bits(c > median for c in coeffs)
+    return phash, dhash
+
+
+def _to_sql(value: int) -> int:
+    # SQLite integers are signed 64-bit.
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _from_sql(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+class MultiIndex:
+    """Hamming-radius search over 64-bit hashes via multi-index hashing.
+
+    Each hash is split into four 16-bit blocks with one hash table per block.
+    Two hashes within distance ``r`` must agree to within ``r // 4`` bits on at
+    least one block (pigeonhole), so a search probes every block value that
+    close to the query's and checks only the hashes found there.
+    """
+
+    BLOCKS = 4
+    BLOCK_BITS = 16
+
+    def __init__(self) -> None:
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in range(self.BLOCKS)]
+        self._keys: Dict[int, List[str]] = {}
+        self._masks: Dict[int, List[int]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys in self._keys.values())
+
+    def _blocks(self, value: int) -> List[int]:
+        mask = (1 << self.BLOCK_BITS) - 1
+        return [(value >> (i * self.BLOCK_BITS)) & mask for i in range(self.BLOCKS)]
+
+    def _flip_masks(self, radius: int) -> List[int]:
+        # Every 16-bit mask with at most ``radius`` bits set.
+        masks = self._masks.get(radius)
+        if masks is None:
+            masks = [0]
+            for bits in range(1, radius + 1):
+                masks += [sum(1 << b for b in combo) for combo in combinations(range(self.BLOCK_BITS), bits)]
+            self._masks[radius] = masks
+        return masks
+
+    def add(self, value: int, key: str) -> None:
+        keys = self._keys.get(value)
+        if keys is None:
+            keys = self._keys[value] = []
+            for table, block in zip(self._tables, self._blocks(value)):
+                table.setdefault(block, []).append(value)
+        keys.append(key)
+
+    def search(self, value: int, max_distance: int) -> List[Tuple[int, str]]:
+        """``(distance, key)`` pairs within ``max_distance`` of ``value``, nearest first."""
+
+        masks = self._flip_masks(min(max_distance // self.BLOCKS, self.BLOCK_BITS))
+        seen: set = set()
+        found: List[Tuple[int, str]] = []
+        for table, block in zip(self._tables, self._blocks(value)):
+            for mask in masks:
+                for candidate in table.get(block ^ mask, ()):
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+                    distance = hamming(value, candidate)
+                    if distance <= max_distance:
+                        found.extend((distance, key) for key in self._keys[candidate])
+        return sorted(found)
+
+
+@dataclass
+class ImageMatch:
+    """A previously seen image close to the query."""
+
+    sha256: str
+    name: str
+    distance: int
+    dhash_distance: int
+    evidence: List[Dict[str, Any]] = field(default_factory=list)
+    flags: List[str] = field(default_factory=list)
+    runs: int = 1
+    run_id: str = ""
+
+
+class ImageIndex:
+    """Thread-safe SQLite store of image hashes with an in-memory Hamming index."""
+
+    def __init__(self, path: str | Path = DEFAULT_PATH, max_distance: int = DEFAULT_MAX_DISTANCE) -> None:
+        self.path = Path(path)
+        self.max_distance = max_distance
+        self._lock = threading.Lock()
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        # Indexes created before run ids were stored.
+        if "run_id" not in {row[1] for row in self._conn.execute("PRAGMA table_info(images)")}:
+            self._conn.execute("ALTER TABLE images ADD COLUMN run_id TEXT NOT NULL DEFAULT ''")
+        self._by_phash = MultiIndex()
+        self._indexed: Dict[str, Tuple[int, int]] = {}
+        for sha256, phash, dhash in self._conn.execute("SELECT sha256, phash, dhash FROM images"):
+            self._index(sha256, _from_sql(phash), _from_sql(dhash))
+        # Hashes of images looked up but not (yet) recorded.
+        self._computed: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._indexed)
+
+    def _index(self, sha256: str, phash: int, dhash: int) -> None:
+        if sha256 not in self._indexed:
+            self._indexed[sha256] = (phash, dhash)
+            self._by_phash.add(phash, sha256)
+
+    def hashes(self, path: str | Path, sha256: str) -> Tuple[int, int]:
+        """``(phash, dhash)`` for ``path``, computed once per content hash."""
+
+        with self._lock:
+            known = self._indexed.get(sha256) or self._computed.get(sha256)
+        if known is not None:
+            return known
+        hashes = perceptual_hashes(path)
+        with self._lock:
+            self._computed[sha256] = hashes
+            if len(self._computed) > MEMORY_CACHE_SIZE:
+                self._computed.popitem(last=False)
+        return hashes
+
+    def lookup(self, path: str | Path, sha256: str, max_distance: Optional[int] = None) -> List[ImageMatch]:
+        """Previously recorded images within ``max_distance`` bits of ``path``, nearest first.
+
+        Candidates come from the pHash index; the dHash must also be within
+        the radius, which weeds out the occasional pHash collision.
+        """
+
+        radius = self.max_distance if max_distance is None else max_distance
+        phash, dhash = self.hashes(path, sha256)
+        with self._lock:
+            candidates = [
+                (distance, key, hamming(dhash, self._indexed[key][1]))
+                for distance, key in self._by_phash.search(phash, radius)
+            ]
+            candidates = [c for c in candidates if c[2] <= radius]
+            if not candidates:
+                return []
+            rows = {
+                row[0]: row[1:]
+                for row in self._conn.execute(
+                    f"SELECT sha256, name, evidence, flags, runs, run_id FROM images WHERE sha256 IN ({','.join('?' * len(candidates))})",
+                    [key for _, key, _ in candidates],
+                )
+            }
+        return [
+            ImageMatch(
+                sha256=key,
+                name=rows[key][0],
+                distance=distance,
+                dhash_distance=dhash_distance,
+                evidence=json.loads(rows[key][1]),
+                flags=json.loads(rows[key][2]),
+                runs=rows[key][3],
+                run_id=rows[key][4],
+            )
+            for distance, key, dhash_distance in candidates
+            if key in rows
+        ]
+
+    def record(
+        self,
+        path: str | Path,
+        sha256: str,
+        evidence: Sequence[Dict[str, Any]] = (),
+        flags: Sequence[str] = (),
+        run_id: str = "",
+    ) -> None:
+        """Store ``path`` with the strongest evidence about it, its flags and the run that found them.
+
+        A re-recorded image keeps its hashes; evidence, flags and run id are
+        replaced by the newer run's. Evidence that itself came from an index
+        match is not stored again. Of each item's metadata only the entities
+        the pivot graph follows are kept.
+        """
+
+        phash, dhash = self.hashes(path, sha256)
+        kept = sorted(
+            (
+                {
+                    "source": ev.get("source", ""),
+                    "fact": ev.get("fact", ""),
+                    "confidence": ev.get("confidence", 0.0),
+                    "metadata": {k: v for k, v in (ev.get("metadata") or {}).items() if k in PIVOT_METADATA},
+                }
+                for ev in evidence
+                if ev.get("confidence", 0.0) >= MIN_STORED_CONFIDENCE and not (ev.get("metadata") or {}).get("prior_match")
+            ),
+            key=lambda ev: -ev["confidence"],
+        )[:MAX_STORED_EVIDENCE]
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO images (sha256, phash, dhash, name, evidence, flags, first_seen, last_seen, run_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(sha256) DO UPDATE SET name = excluded.name, evidence = excluded.evidence, "
+                "flags = excluded.flags, last_seen = excluded.last_seen, runs = runs + 1, run_id = excluded.run_id",
+                (sha256, _to_sql(phash), _to_sql(dhash), Path(path).name, json.dumps(kept, ensure_ascii=False), json.dumps(list(dict.fromkeys(flags)), ensure_ascii=False), now, now, run_id),
+            )
+            self._index(sha256, phash, dhash)
+            self._computed.pop(sha256, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            images, runs, flagged = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(runs), 0), COALESCE(SUM(flags != '[]'), 0) FROM images"
+            ).fetchone()
+        return {"images": images, "runs": runs, "with_flags": flagged}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_index_lock = threading.Lock()
+_index: Optional[ImageIndex] = None
+
+
+def get_image_index() -> Optional[ImageIndex]:
+    """Return the process-wide image index, or None when it is disabled."""
+
+    global _index
+    if os.getenv("OSINTHUNTER_IMAGE_INDEX", "true").lower() == "false":
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = ImageIndex(
+                path=os.getenv("OSINTHUNTER_IMAGE_INDEX_PATH", DEFAULT_PATH),
+                max_distance=int(os.getenv("OSINTHUNTER_IMAGE_MATCH_DISTANCE", str(DEFAULT_MAX_DISTANCE))),
+            )
+        return _index
+
+
+def close_image_index() -> None:
+    global _index
+    with _index_lock:
+        if _index is not None:
+            _index.close()
+            _index = None
+
+
+def record_run(image_paths: Sequence[str], evidence: Sequence[Dict[str, Any]], flags: Sequence[str], run_id: str = "") -> None:
+    """Add a finished run's images to the index, each with the evidence about it.
+
+    Evidence is about an image when its metadata names the image's path.
+    Flags are attributed to an image when they appear in that evidence, or
+    when it was the run's only image.
+    """
+
+    index = get_image_index()
+    if index is None:
+        return
+    from .image_metadata import file_sha256
+
+    for raw in image_paths:
+        path = Path(raw)
+        own = [ev for ev in evidence if str(Path((ev.get("metadata") or {}).get("path", ""))) == str(path)]
+        own_flags = [flag for ev in own for flag in FLAG_RE.findall(ev.get("fact", ""))]
+        if len(image_paths) == 1:
+            own_flags += list(flags)
+        try:
+            index.record(path, file_sha256(path), own, own_flags, run_id)
+        except (OSError, ValueError):
+            # Missing or undecodable images were already reported by ImageOSINTAgent.
+            continue
+
+
+def record_runs(records: Iterable[Dict[str, Any]]) -> None:
+    """Run-log sink: index the images of finished runs off the request path."""
+
+    for record in records:
+        if record.get("images"):
+            record_run(record["images"], record.get("evidence") or [], record.get("flags") or [], record.get("run_id", ""))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Inspect the OSINT Hunter perceptual image index")
+    parser.add_argument("--path", default=os.getenv("OSINTHUNTER_IMAGE_INDEX_PATH", DEFAULT_PATH), help="Index database path")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Show how many images are indexed")
+    match_parser = sub.add_parser("match", help="Find indexed images close to the given files")
+    match_parser.add_argument("images", nargs="+")
+    match_parser.add_argument("--distance", type=int, default=DEFAULT_MAX_DISTANCE, help="Max pHash Hamming distance")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from .image_metadata import file_sha256
+
+    args = parse_args(argv)
+    index = ImageIndex(path=args.path)
+    try:
+        if args.command == "stats":
+            stats = index.stats()
+            print(f"images={stats['images']} runs={stats['runs']} with_flags={stats['with_flags']}")
+        elif args.command == "match":
+            for image in args.images:
+                started = time.perf_counter()
+                matches = index.lookup(image, file_sha256(image), max_distance=args.distance)
+                elapsed = (time.perf_counter() - started) * 1000
+                print(f"{image}: {len(matches)} match(es) in {elapsed:.1f} ms")
+                for match in matches:
+                    print(f"  - {match.name} sha256={match.sha256[:12]} distance={match.distance} run={match.run_id or '-'} flags={match.flags}")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
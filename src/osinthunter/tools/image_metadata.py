@@ -0,0 +1,495 @@
+"""Image metadata engine: EXIF, XMP and IPTC without decoding pixels.
+
+JPEG and PNG files are walked segment by segment and parsing stops before the
+image data (JPEG SOS, PNG IDAT), so a 20 MB photo costs a few kilobytes of
+reads. Other formats fall back to Pillow's lazy header parsing.
+
+Results are cached by SHA-256 of the file content, in memory and in the shared
+response cache (provider ``image-metadata``), so the same photo submitted under
+another name or in a later run is not parsed again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence, Tuple
+
+CACHE_PROVIDER = "image-metadata"
+MEMORY_CACHE_SIZE = 1024
+PARALLEL_THRESHOLD = 4
+MAX_WORKERS = 8
+
+_IFD0_TAGS = {
+    0x010E: "ImageDescription",
+    0x010F: "Make",
+    0x0110: "Model",
+    0x0131: "Software",
+    0x0132: "DateTime",
+    0x013B: "Artist",
+    0x8298: "Copyright",
+}
+_EXIF_TAGS = {
+    0x9003: "DateTimeOriginal",
+    0x9004: "DateTimeDigitized",
+    0x9010: "OffsetTimeOriginal",
+    0xA002: "PixelXDimension",
+    0xA003: "PixelYDimension",
+    0xA430: "CameraOwnerName",
+    0xA431: "BodySerialNumber",
+    0xA433: "LensMake",
+    0xA434: "LensModel",
+}
+_GPS_TAGS = {
+    0x01: "GPSLatitudeRef",
+    0x02: "GPSLatitude",
+    0x03: "GPSLongitudeRef",
+    0x04: "GPSLongitude",
+    0x05: "GPSAltitudeRef",
+    0x06: "GPSAltitude",
+    0x07: "GPSTimeStamp",
+    0x1D: "GPSDateStamp",
+}
+_EXIF_IFD = 0x8769
+_GPS_IFD = 0x8825
+
+# IIM record 2 datasets.
+_IPTC_TAGS = {
+    5: "ObjectName",
+    25: "Keywords",
+    55: "DateCreated",
+    80: "Byline",
+    90: "City",
+    92: "Sublocation",
+    95: "Province",
+    101: "Country",
+    105: "Headline",
+    116: "Copyright",
+    120: "Caption",
+}
+_IPTC_REPEATABLE = {"Keywords", "Byline"}
+
+_XMP_FIELDS = (
+    "xmp:CreatorTool",
+    "xmp:CreateDate",
+    "tiff:Make",
+    "tiff:Model",
+    "exif:DateTimeOriginal",
+    "exif:GPSLatitude",
+    "exif:GPSLongitude",
+    "photoshop:City",
+    "photoshop:State",
+    "photoshop:Country",
+    "Iptc4xmpCore:Location",
+    "dc:creator",
+    "dc:title",
+    "dc:description",
+    "dc:subject",
+)
+
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_EXIF_HEADER = b"Exif\x00\x00"
+_XMP_HEADER = b"http://ns.adobe.com/xap/1.0/\x00"
+_PS_HEADER = b"Photoshop 3.0\x00"
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+_TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 7: 1, 9: 4, 10: 8}
+_INT_FORMATS = {3: "H", 4: "I", 9: "i"}
+
+
+# --- TIFF / EXIF ---------------------------------------------------------
+
+
+def _tiff_value(endian: str, typ: int, count: int, raw: bytes) -> Any:
+    if typ == 2:
+        return raw.split(b"\x00", 1)[0].decode("utf-8", "replace").strip()
+    if typ == 7:
+        return raw
+    if typ == 1:
+        values: List[Any] = list(raw)
+    elif typ in _INT_FORMATS:
+        values = list(struct.unpack(f"{endian}{count}{_INT_FORMATS[typ]}", raw))
+    else:  # rationals
+        pairs = struct.unpack(f"{endian}{2 * count}{'I' if typ == 5 else 'i'}", raw)
+        values = [num / den if den else 0.0 for num, den in zip(pairs[::2], pairs[1::2])]
+    return values[0] if count == 1 else values
+
+
+def _read_ifd(data: bytes, endian: str, offset: int, names: Dict[int, str]) -> Tuple[Dict[str, Any], Dict[int, int]]:
+    """Named tags of one IFD plus raw pointers to sub-IFDs."""
+
+    tags: Dict[str, Any] = {}
+    pointers: Dict[int, int] = {}
+    if offset <= 0 or offset + 2 > len(data):
+        return tags, pointers
+    (count,) = struct.unpack_from(f"{endian}H", data, offset)
+    for i in range(min(count, 512)):
+        entry = offset + 2 + 12 * i
+        if entry + 12 > len(data):
+            break
+        tag, typ, n = struct.unpack_from(f"{endian}HHI", data, entry)
+        size = _TYPE_SIZES.get(typ)
+        if size is None or n == 0 or n > 1 << 16:
+            continue
+        length = size * n
+        if length <= 4:
+            raw = data[entry + 8 : entry + 8 + length]
+        else:
+            (pos,) = struct.unpack_from(f"{endian}I", data, entry + 8)
+            if pos + length > len(data):
+                continue
+            raw = data[pos : pos + length]
+        if tag in (_EXIF_IFD, _GPS_IFD) and typ == 4:
+            pointers[tag] = struct.unpack(f"{endian}I", raw)[0]
+        elif tag in names:
+            tags[names[tag]] = _tiff_value(endian, typ, n, raw)
+    return tags, pointers
+
+
+def _dms_to_degrees(value: Any, ref: Any) -> Optional[float]:
+    if not isinstance(value, list) or len(value) != 3:
+        return None
+    degrees = value[0] + value[1] / 60.0 + value[2] / 3600.0
+    return -degrees if str(ref).upper() in ("S", "W") else degrees
+
+
+def parse_exif(data: bytes) -> Dict[str, Any]:
+    """Parse a TIFF-structured EXIF block into ``{"exif": {...}, "gps": {...}}``."""
+
+    if data[:2] == b"II":
+        endian = "<"
+    elif data[:2] == b"MM":
+        endian = ">"
+    else:
+        return {}
+    if len(data) < 8 or struct.unpack_from(f"{endian}H", data, 2)[0] != 42:
+        return {}
+    ifd0 = struct.unpack_from(f"{endian}I", data, 4)[0]
+    exif, pointers = _read_ifd(data, endian, ifd0, _IFD0_TAGS)
+    if _EXIF_IFD in pointers:
+        exif.update(_read_ifd(data, endian, pointers[_EXIF_IFD], _EXIF_TAGS)[0])
+    out: Dict[str, Any] = {"exif": {k: v for k, v in exif.items() if not isinstance(v, bytes)}}
+    if _GPS_IFD in pointers:
+        gps_raw = _read_ifd(data, endian, pointers[_GPS_IFD], _GPS_TAGS)[0]
+        lat = _dms_to_degrees(gps_raw.get("GPSLatitude"), gps_raw.get("GPSLatitudeRef"))
+        lon = _dms_to_degrees(gps_raw.get("GPSLongitude"), gps_raw.get("GPSLongitudeRef"))
+        gps: Dict[str, Any] = {}
+        if lat is not None and lon is not None:
+            gps.update(lat=lat, lon=lon)
+        if isinstance(gps_raw.get("GPSAltitude"), float):
+            below = gps_raw.get("GPSAltitudeRef") == 1
+            gps["alt"] = -gps_raw["GPSAltitude"] if below else gps_raw["GPSAltitude"]
+        if gps_raw.get("GPSDateStamp"):
+            gps["date"] = gps_raw["GPSDateStamp"]
+        if gps:
+            out["gps"] = gps
+    return out
+
+
+# --- XMP / IPTC ----------------------------------------------------------
+
+
+def _xmp_coordinate(value: str) -> Optional[float]:
+    # XMP writes GPS as "DDD,MM.mmmmK" or "DDD,MM,SSK".
+    match = re.fullmatch(r"\s*(\d+),(\d+(?:\.\d+)?)(?:,(\d+(?:\.\d+)?))?([NSEW])\s*", value)
+    if not match:
+        return None
+    deg, minutes, seconds, ref = match.groups()
+    degrees = int(deg) + float(minutes) / 60 + float(seconds or 0) / 3600
+    return -degrees if ref in "SW" else degrees
+
+
+def parse_xmp(packet: bytes) -> Dict[str, Any]:
+    text = packet.decode("utf-8", "replace")
+    found: Dict[str, Any] = {}
+    for name in _XMP_FIELDS:
+        attr = re.search(rf'{re.escape(name)}="([^"]*)"', text)
+        if attr:
+            found[name] = attr.group(1)
+            continue
+        element = re.search(rf"<{re.escape(name)}\b[^>]*>(.*?)</{re.escape(name)}>", text, re.S)
+        if element:
+            items = re.findall(r"<rdf:li\b[^>]*>(.*?)</rdf:li>", element.group(1), re.S)
+            value = [i.strip() for i in items if i.strip()] if items else element.group(1).strip()
+            if value:
+                found[name] = value[0] if isinstance(value, list) and len(value) == 1 else value
+    out: Dict[str, Any] = {"xmp": found} if found else {}
+    lat = _xmp_coordinate(found.get("exif:GPSLatitude", "") or "")
+    lon = _xmp_coordinate(found.get("exif:GPSLongitude", "") or "")
+    if lat is not None and lon is not None:
+        out["gps"] = {"lat": lat, "lon": lon}
+    return out
+
+
+def parse_iptc(iim: bytes) -> Dict[str, Any]:
+    iptc: Dict[str, Any] = {}
+    pos = 0
+    while pos + 5 <= len(iim) and iim[pos] == 0x1C:
+        record, dataset, length = iim[pos + 1], iim[pos + 2], struct.unpack_from(">H", iim, pos + 3)[0]
+        if length & 0x8000:  # extended datasets are not used for text fields
+            break
+        value = iim[pos + 5 : pos + 5 + length].decode("utf-8", "replace").strip()
+        pos += 5 + length
+        name = _IPTC_TAGS.get(dataset) if record == 2 else None
+        if not name or not value:
+            continue
+        if name in _IPTC_REPEATABLE:
+            iptc.setdefault(name, []).append(value)
+        else:
+            iptc[name] = value
+    return {"iptc": iptc} if iptc else {}
+
+
+def _photoshop_iim(block: bytes) -> bytes:
+    """Return the IPTC-NAA resource (0x0404) from a Photoshop IRB block."""
+
+    pos = 0
+    while pos + 12 <= len(block) and block[pos : pos + 4] == b"8BIM":
+        resource = struct.unpack_from(">H", block, pos + 4)[0]
+        name_len = block[pos + 6]
+        pos += 6 + name_len + 1 + ((name_len + 1) % 2)
+        if pos + 4 > len(block):
+            break
+        (size,) = struct.unpack_from(">I", block, pos)
+        pos += 4
+        if resource == 0x0404:
+            return block[pos : pos + size]
+        pos += size + (size % 2)
+    return b""
+
+
+# --- containers ----------------------------------------------------------
+
+
+def _merge(into: Dict[str, Any], part: Dict[str, Any]) -> None:
+    for key, value in part.items():
+        if isinstance(value, dict):
+            # Earlier segments (EXIF) win over later ones (XMP) for the same field.
+            into.setdefault(key, {})
+            for k, v in value.items():
+                into[key].setdefault(k, v)
+        else:
+            into.setdefault(key, value)
+
+
+def _read_jpeg(fh: BinaryIO) -> Dict[str, Any]:
+    meta: Dict[str, Any] = {"format": "jpeg"}
+    fh.seek(2)
+    while True:
+        byte = fh.read(1)
+        if not byte:
+            break
+        if byte != b"\xff":
+            continue
+        marker = fh.read(1)
+        while marker == b"\xff":
+            marker = fh.read(1)
+        if not marker:
+            break
+        code = marker[0]
+        if code in (0x01, 0xD8) or 0xD0 <= code <= 0xD7:
+            continue
+        if code in (0xD9, 0xDA):  # end of image / start of pixel data
+            break
+        header = fh.read(2)
+        if len(header) < 2:
+            break
+        length = struct.unpack(">H", header)[0] - 2
+        if length < 0:
+            # The length field counts itself, so anything under 2 is corrupt.
+            break
+        if code in (0xE1, 0xED):
+            payload = fh.read(length)
+            if payload.startswith(_EXIF_HEADER):
+                _merge(meta, parse_exif(payload[len(_EXIF_HEADER) :]))
+            elif payload.startswith(_XMP_HEADER):
+                _merge(meta, parse_xmp(payload[len(_XMP_HEADER) :]))
+            elif payload.startswith(_PS_HEADER):
+                _merge(meta, parse_iptc(_photoshop_iim(payload[len(_PS_HEADER) :])))
+        elif code in _JPEG_SOF:
+            payload = fh.read(length)
+            if len(payload) >= 5:
+                meta["height"], meta["width"] = struct.unpack_from(">HH", payload, 1)
+        else:
+            fh.seek(length, 1)
+    return meta
+
+
+def _read_png(fh: BinaryIO) -> Dict[str, Any]:
+    meta: Dict[str, Any] = {"format": "png"}
+    fh.seek(len(_PNG_SIGNATURE))
+    text: Dict[str, str] = {}
+    while True:
+        header = fh.read(8)
+        if len(header) < 8:
+            break
+        length, kind = struct.unpack(">I4s", header)
+        if kind in (b"IDAT", b"IEND"):
+            break
+        if kind not in (b"IHDR", b"eXIf", b"tEXt", b"zTXt", b"iTXt"):
+            fh.seek(length + 4, 1)
+            continue
+        data = fh.read(length)
+        fh.seek(4, 1)  # CRC
+        try:
+            if kind == b"IHDR":
+                meta["width"], meta["height"] = struct.unpack_from(">II", data)
+            elif kind == b"eXIf":
+                _merge(meta, parse_exif(data))
+            else:
+                key, _, rest = data.partition(b"\x00")
+                if kind == b"zTXt":
+                    value = zlib.decompress(rest[1:])
+                elif kind == b"iTXt":
+                    compressed, rest = rest[0], rest[2:]
+                    rest = rest.split(b"\x00", 2)[-1]
+                    value = zlib.decompress(rest) if compressed else rest
+                else:
+                    value = rest
+                if key == b"XML:com.adobe.xmp":
+                    _merge(meta, parse_xmp(value))
+                else:
+                    text[key.decode("latin-1")] = value.decode("utf-8", "replace")[:500]
+        except (struct.error, zlib.error, IndexError):
+            continue
+    if text:
+        meta["text"] = text
+    return meta
+
+
+def _read_with_pillow(path: Path) -> Dict[str, Any]:
+    from PIL import Image
+
+    with Image.open(path) as img:  # lazy: reads headers, not pixels
+        meta: Dict[str, Any] = {"format": (img.format or "").lower(), "width": img.width, "height": img.height}
+        exif = img.getexif()
+        tags = {name: exif.get(tag) for tag, name in _IFD0_TAGS.items() if exif.get(tag) is not None}
+        tags.update({name: v for tag, name in _EXIF_TAGS.items() if (v := exif.get_ifd(_EXIF_IFD).get(tag)) is not None})
+        gps_raw = {name: v for tag, name in _GPS_TAGS.items() if (v := exif.get_ifd(_GPS_IFD).get(tag)) is not None}
+    if tags:
+        meta["exif"] = {k: v if isinstance(v, (str, int)) else str(v) for k, v in tags.items() if not isinstance(v, bytes)}
+    lat = _dms_to_degrees([float(x) for x in gps_raw.get("GPSLatitude", ())] or None, gps_raw.get("GPSLatitudeRef"))
+    lon = _dms_to_degrees([float(x) for x in gps_raw.get("GPSLongitude", ())] or None, gps_raw.get("GPSLongitudeRef"))
+    if lat is not None and lon is not None:
+        meta["gps"] = {"lat": lat, "lon": lon}
+    return meta
+
+
+def read_metadata(path: str | Path) -> Dict[str, Any]:
+    """Parse metadata from ``path`` without caching."""
+
+    path = Path(path)
+    with path.open("rb") as fh:
+        head = fh.read(8)
+        if head[:2] == b"\xff\xd8":
+            return _read_jpeg(fh)
+        if head == _PNG_SIGNATURE:
+            return _read_png(fh)
+    return _read_with_pillow(path)
+
+
+# --- cache ---------------------------------------------------------------
+
+_lock = threading.Lock()
+_by_digest: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+# (path, size, mtime_ns) -> sha256, so unchanged files are not re-hashed.
+_digests: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+
+
+def file_sha256(path: str | Path) -> str:
+    path = Path(path)
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _lock:
+        digest = _digests.get(key)
+    if digest is None:
+        with path.open("rb") as fh:
+            digest = hashlib.file_digest(fh, "sha256").hexdigest()
+        with _lock:
+            _digests[key] = digest
+            if len(_digests) > MEMORY_CACHE_SIZE:
+                _digests.popitem(last=False)
+    return digest
+
+
+def image_metadata(path: str | Path) -> Dict[str, Any]:
+    """Metadata for ``path`` with ``sha256`` and ``size``, cached by content hash."""
+
+    digest = file_sha256(path)
+    with _lock:
+        cached = _by_digest.get(digest)
+        if cached is not None:
+            _by_digest.move_to_end(digest)
+            return cached
+
+    from ..cache import get_response_cache
+
+    cache = get_response_cache()
+    request = f"sha256={digest}"
+    entry = cache.get(CACHE_PROVIDER, request) if cache is not None else None
+    if entry is not None:
+        meta = entry.payload
+    else:
+        try:
+            meta = read_metadata(path)
+        except Exception as exc:
+            meta = {"error": f"{type(exc).__name__}: {exc}"}
+        meta = {**meta, "sha256": digest, "size": Path(path).stat().st_size}
+        if cache is not None and "error" not in meta:
+            cache.put(CACHE_PROVIDER, request, meta)
+    with _lock:
+        _by_digest[digest] = meta
+        if len(_by_digest) > MEMORY_CACHE_SIZE:
+            _by_digest.popitem(last=False)
+    return meta
+
+
+def image_metadata_many(paths: Sequence[str | Path], max_workers: int = MAX_WORKERS) -> List[Dict[str, Any]]:
+    """``image_metadata`` for each path, in order, in parallel for larger sets.
+
+    Duplicate images are parsed once. Threads rather than processes: hashing and file reads release the GIL, and
+    header parsing is a few kilobytes per file. A path that cannot be read (a directory, a permission error, a file
+    removed meanwhile) gets ``{"error": ...}`` without ``sha256`` instead of failing the whole set.
+    """
+
+    if len(paths) < PARALLEL_THRESHOLD:
+        return [_metadata_or_error(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths)), thread_name_prefix="osinthunter-meta") as pool:
+        digests = list(pool.map(_digest_or_error, paths))
+        # Parse each distinct image once, however many copies were submitted.
+        unique: Dict[str, str | Path] = {}
+        for path, digest in zip(paths, digests):
+            if isinstance(digest, str):
+                unique.setdefault(digest, path)
+        parsed = dict(zip(unique, pool.map(_metadata_or_error, unique.values())))
+    return [parsed[digest] if isinstance(digest, str) else digest for digest in digests]
+
+
+def _read_error(exc: OSError) -> Dict[str, Any]:
+    return {"error": f"{type(exc).__name__}: {exc.strerror or exc}"}
+
+
+def _digest_or_error(path: str | Path) -> str | Dict[str, Any]:
+    try:
+        return file_sha256(path)
+    except OSError as exc:
+        return _read_error(exc)
+
+
+def _metadata_or_error(path: str | Path) -> Dict[str, Any]:
+    try:
+        return image_metadata(path)
+    except OSError as exc:
+        return _read_error(exc)
+
+
+def clear_memory_cache() -> None:
+    with _lock:
+        _by_digest.clear()
+        _digests.clear()
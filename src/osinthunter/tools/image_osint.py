@@ -3,16 +3,19 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List
 
 from langchain_core.tools import BaseTool
-from PIL import Image, ExifTags
 
 from .base import Agent
+from .image_index import FLAG_RE, MIN_STORED_CONFIDENCE, ImageMatch, get_image_index
+from .image_metadata import image_metadata_many
 from ..models import Evidence, ProblemInput
 
 
 class ImageOSINTAgent(Agent):
+    depends_on = ("images",)
+
     def __init__(self) -> None:
         super().__init__(
             name="image-osint",
@@ -21,85 +24,125 @@ class ImageOSINTAgent(Agent):
         )
 
     def run(self, problem: ProblemInput) -> List[Evidence]:
+        paths = [Path(p) for p in problem.image_paths]
+        existing = [p for p in paths if p.exists()]
+        metadata = dict(zip(existing, image_metadata_many(existing)))
+
         evidence: List[Evidence] = []
-        for path_str in problem.image_paths:
-            path = Path(path_str)
-            if not path.exists():
+        for path in paths:
+            meta = metadata.get(path)
+            if meta is None:
                 evidence.append(Evidence(source=self.name, fact=f"File not found: {path}", confidence=0.2))
                 continue
-
-            try:
-                size = path.stat().st_size
-                evidence.append(
-                    Evidence(
-                        source=self.name,
-                        fact=f"Inspect {path.name} (size={size} bytes) with EXIF/OCR/reverse image search",
-                        confidence=0.62,
-                        metadata={"path": str(path)},
-                    )
+            if "sha256" not in meta:
+                evidence.append(Evidence(source=self.name, fact=f"Cannot read {path}: {meta['error']}", confidence=0.2, metadata={"path": str(path)}))
+                continue
+            evidence.append(
+                Evidence(
+                    source=self.name,
+                    fact=f"Inspect {path.name} (size={meta['size']} bytes) with EXIF/OCR/reverse image search",
+                    confidence=0.62,
+                    metadata={"path": str(path), "sha256": meta["sha256"]},
                 )
-            except OSError:
-                evidence.append(Evidence(source=self.name, fact=f"Inspect {path.name}", confidence=0.55))
-
-            evidence.extend(self._extract_exif(path))
+            )
+            evidence.extend(self._metadata_evidence(path, meta))
+            evidence.extend(self._prior_match_evidence(path, meta["sha256"]))
 
         if not evidence:
             evidence.append(Evidence(source=self.name, fact="No images provided", confidence=0.2))
 
         return evidence
 
-    def _extract_exif(self, path: Path) -> List[Evidence]:
+    def _metadata_evidence(self, path: Path, meta: Dict[str, Any]) -> List[Evidence]:
+        if "error" in meta:
+            return [Evidence(source=self.name, fact=f"Metadata parsing failed for {path.name}", confidence=0.2)]
+
+        exif, xmp, iptc = meta.get("exif", {}), meta.get("xmp", {}), meta.get("iptc", {})
         facts: List[Evidence] = []
-        try:
-            with Image.open(path) as img:
-                info = img._getexif() or {}
-                if not info:
-                    return facts
-                tag_map = {ExifTags.TAGS.get(k, k): v for k, v in info.items()}
-                if dt := tag_map.get("DateTimeOriginal"):
-                    facts.append(Evidence(source=self.name, fact=f"EXIF DateTimeOriginal: {dt}", confidence=0.55))
-                if cam := tag_map.get("Model"):
-                    facts.append(Evidence(source=self.name, fact=f"Camera model: {cam}", confidence=0.45))
-                if gps := tag_map.get("GPSInfo"):
-                    gps_data = self._gps_to_degrees(gps)
-                    if gps_data:
-                        lat, lon = gps_data
-                        facts.append(
-                            Evidence(
-                                source=self.name,
-                                fact=f"GPS from EXIF: {lat:.6f}, {lon:.6f}",
-                                confidence=0.7,
-                                metadata={"lat": lat, "lon": lon},
-                            )
-                        )
-        except Exception:
-            facts.append(Evidence(source=self.name, fact=f"EXIF parsing failed for {path.name}", confidence=0.2))
+
+        def add(fact: str, confidence: float, **extra: Any) -> None:
+            facts.append(Evidence(source=self.name, fact=fact, confidence=confidence, metadata={"path": str(path), **extra}))
+
+        def first(*values: Any) -> Any:
+            return next((v for v in values if v), None)
+
+        if dt := first(exif.get("DateTimeOriginal"), xmp.get("exif:DateTimeOriginal"), xmp.get("xmp:CreateDate")):
+            add(f"EXIF DateTimeOriginal: {dt}", 0.55)
+        if cam := first(exif.get("Model"), xmp.get("tiff:Model")):
+            add(f"Camera model: {cam}", 0.45, make=first(exif.get("Make"), xmp.get("tiff:Make")))
+        if gps := meta.get("gps"):
+            lat, lon = gps.get("lat"), gps.get("lon")
+            if lat is not None and lon is not None:
+                add(f"GPS from EXIF: {lat:.6f}, {lon:.6f}", 0.7, lat=lat, lon=lon)
+        people = [v for v in (exif.get("Artist"), exif.get("CameraOwnerName"), xmp.get("dc:creator")) if v]
+        people += iptc.get("Byline", [])
+        if people:
+            add(f"Image author/owner: {', '.join(map(str, dict.fromkeys(people)))}", 0.5)
+        if serial := exif.get("BodySerialNumber"):
+            add(f"Camera serial number: {serial}", 0.5)
+        if tool := first(exif.get("Software"), xmp.get("xmp:CreatorTool")):
+            add(f"Edited with: {tool}", 0.4)
+        places = [
+            first(iptc.get("Sublocation"), xmp.get("Iptc4xmpCore:Location")),
+            first(iptc.get("City"), xmp.get("photoshop:City")),
+            first(iptc.get("Province"), xmp.get("photoshop:State")),
+            first(iptc.get("Country"), xmp.get("photoshop:Country")),
+        ]
+        if any(places):
+            add(f"Location tags: {', '.join(p for p in places if p)}", 0.55)
+        if caption := first(iptc.get("Caption"), iptc.get("Headline"), exif.get("ImageDescription"), xmp.get("dc:description"), xmp.get("dc:title")):
+            add(f"Caption: {caption}", 0.45)
+        keywords = iptc.get("Keywords") or xmp.get("dc:subject")
+        if keywords:
+            add(f"Keywords: {', '.join(keywords) if isinstance(keywords, list) else keywords}", 0.35)
         return facts
 
-    def _gps_to_degrees(self, gps_info) -> tuple | None:
+    def _prior_match_evidence(self, path: Path, sha256: str) -> List[Evidence]:
+        """Pivot hints from earlier runs on this image or a near-duplicate of it."""
+
+        index = get_image_index()
+        if index is None:
+            return []
         try:
-            gps_tags = {}
-            for key, val in gps_info.items():
-                name = ExifTags.GPSTAGS.get(key, key)
-                gps_tags[name] = val
-
-            def _to_deg(value):
-                d = value[0][0] / value[0][1]
-                m = value[1][0] / value[1][1]
-                s = value[2][0] / value[2][1]
-                return d + (m / 60.0) + (s / 3600.0)
-
-            lat_ref = gps_tags.get("GPSLatitudeRef")
-            lon_ref = gps_tags.get("GPSLongitudeRef")
-            lat = gps_tags.get("GPSLatitude")
-            lon = gps_tags.get("GPSLongitude")
-            if lat and lon and lat_ref and lon_ref:
-                lat_val = _to_deg(lat) * (1 if lat_ref in ["N", "n"] else -1)
-                lon_val = _to_deg(lon) * (1 if lon_ref in ["E", "e"] else -1)
-                return (lat_val, lon_val)
-        except Exception:
-            return None
-        return None
+            matches = index.lookup(path, sha256)
+        except (OSError, ValueError):
+            return []
+
+        facts: List[Evidence] = []
+        for match in matches:
+            facts.extend(self._match_facts(path, match))
+        return facts
+
+    def _match_facts(self, path: Path, match: ImageMatch) -> List[Evidence]:
+        # Earlier findings come back as pivots: the entities they named stay in
+        # metadata for the pivot graph. The earlier run's flags go in metadata
+        # only, so the validator does not report them as this run's flag.
+        identical = match.distance == 0 and match.dhash_distance == 0
+        meta = {"path": str(path), "prior_match": match.sha256, "distance": match.distance, "prior_run_id": match.run_id}
+        same = "identical to" if identical else "near-duplicate of"
+        fact = f"{path.name} is {same} previously seen {match.name} (pHash distance {match.distance}, seen in {match.runs} run(s))"
+        if match.flags:
+            fact += f"; that run found {len(match.flags)} flag candidate(s)"
+        facts = [
+            Evidence(
+                source=self.name,
+                fact=fact,
+                confidence=0.8 if identical else 0.7,
+                metadata={**meta, "prior_flags": list(match.flags)},
+            )
+        ]
+        # A near-duplicate may be a different challenge's crop; discount a little.
+        discount = 0.0 if identical else 0.1
+        facts += [
+            Evidence(
+                source=self.name,
+                fact=f"Earlier finding on {match.name} ({prior.get('source', '')}): {FLAG_RE.sub('[flag]', prior.get('fact', ''))}",
+                confidence=max(MIN_STORED_CONFIDENCE, prior.get("confidence", 0.0) - discount),
+                metadata={**(prior.get("metadata") or {}), **meta},
+            )
+            for prior in match.evidence
+        ]
+        return facts
 
 
 # Backward compatibility
@@ -0,0 +1,163 @@
+"""Per-provider, per-key token buckets for provider API calls.
+
+Shodan, Censys, SerpAPI, Hunter and BuiltWith all reject calls over a per-key
+rate, and a rejected call still counts against some quotas. ``fetch_json`` waits
+on a ``RateLimiter`` before each network request. When a provider answers 429
+or 503 anyway, the whole bucket pauses for ``Retry-After`` (or an exponential
+backoff) and its rate is halved, then recovers gradually on success.
+
+Limiters live on the shared HTTP loop (see ``tools.http``), so they are shared
+by every agent, thread and web request in the process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+
+@dataclass(frozen=True)
+class ProviderLimit:
+    """``rate`` requests per second, bursts of up to ``burst``, ``concurrency`` in flight."""
+
+    rate: float
+    burst: int = 1
+    concurrency: int = 4
+
+
+# Published per-key limits of the free/entry plans, rounded down.
+PROVIDER_LIMITS: Dict[str, ProviderLimit] = {
+    "shodan": ProviderLimit(rate=1.0, burst=1, concurrency=1),
+    "censys": ProviderLimit(rate=0.4, burst=2, concurrency=2),
+    "serpapi": ProviderLimit(rate=2.0, burst=4, concurrency=4),
+    "bing": ProviderLimit(rate=3.0, burst=3, concurrency=3),
+    "hunter": ProviderLimit(rate=10.0, burst=10, concurrency=4),
+    "builtwith": ProviderLimit(rate=1.0, burst=2, concurrency=2),
+    "wayback": ProviderLimit(rate=1.0, burst=5, concurrency=4),
+}
+# Providers billed against another provider's key and quota.
+SHARED_QUOTAS = {"google-lens": "serpapi"}
+
+MAX_RETRIES = 2
+BACKOFF_BASE = 1.0
+# Retry-After values beyond this are not waited out; the call fails instead.
+MAX_RETRY_WAIT = 30.0
+# Adaptive rate: halve on 429, regain this share of the configured rate per success.
+RECOVERY_STEP = 0.1
+MIN_RATE_FACTOR = 0.1
+
+THROTTLED_STATUSES = (429, 503)
+
+_CREDENTIAL_HEADERS = ("authorization", "x-api-key", "x-subscription-token", "ocp-apim-subscription-key")
+
+
+class RateLimiter:
+    """Async token bucket with a concurrency cap and a shared pause.
+
+    Use on one event loop only.
+    """
+
+    def __init__(self, limit: ProviderLimit) -> None:
+        self.limit = limit
+        self.rate = limit.rate
+        self._tokens = float(limit.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._slots = asyncio.Semaphore(max(1, limit.concurrency))
+        self._turn = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait for a concurrency slot and a token; pair with ``release``."""
+
+        await self._slots.acquire()
+        try:
+            # One waiter at a time takes tokens, so callers are served in arrival order.
+            async with self._turn:
+                while (delay := self._reserve()) > 0:
+                    await asyncio.sleep(delay)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self) -> None:
+        self._slots.release()
+
+    def _reserve(self) -> float:
+        """Take a token and return 0, or return how long to wait for one."""
+
+        now = time.monotonic()
+        self._tokens = min(float(self.limit.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+        return (1.0 - self._tokens) / self.rate
+
+    def throttled(self, delay: float) -> None:
+        """The provider rejected a call: pause the bucket for ``delay`` and halve the rate."""
+
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        self._tokens = 0.0
+        self.rate = max(self.limit.rate * MIN_RATE_FACTOR, self.rate / 2)
+
+    def succeeded(self) -> None:
+        if self.rate < self.limit.rate:
+            self.rate = min(self.limit.rate, self.rate + self.limit.rate * RECOVERY_STEP)
+
+
+def _env_limits() -> Dict[str, ProviderLimit]:
+    # OSINTHUNTER_RATE_LIMITS="shodan=1:1:1,serpapi=5" (rate[:burst[:concurrency]])
+    limits: Dict[str, ProviderLimit] = {}
+    for part in os.getenv("OSINTHUNTER_RATE_LIMITS", "").split(","):
+        name, _, spec = part.partition("=")
+        fields = spec.strip().split(":") if spec.strip() else []
+        try:
+            values = [float(fields[0])] + [int(f) for f in fields[1:3]]
+        except (ValueError, IndexError):
+            continue
+        if name.strip() and values[0] > 0:
+            limits[name.strip()] = ProviderLimit(*values)
+    return limits
+
+
+def limit_for(provider: str) -> Optional[ProviderLimit]:
+    """The configured limit for ``provider``, or None if it is not rate limited."""
+
+    if os.getenv("OSINTHUNTER_RATE_LIMIT", "true").lower() == "false":
+        return None
+    group = SHARED_QUOTAS.get(provider, provider)
+    return _env_limits().get(group) or PROVIDER_LIMITS.get(group)
+
+
+def limiter_key(provider: str, params: Optional[Mapping[str, Any]], headers: Optional[Mapping[str, str]]) -> str:
+    """``provider`` plus a digest of the credentials, so each API key gets its own bucket."""
+
+    from .http import SECRET_PARAMS
+
+    secrets = sorted(str(v) for k, v in (params or {}).items() if str(k).lower() in SECRET_PARAMS)
+    secrets += sorted(str(v) for k, v in (headers or {}).items() if k.lower() in _CREDENTIAL_HEADERS)
+    digest = hashlib.sha256("\x00".join(secrets).encode("utf-8")).hexdigest()[:12] if secrets else "anonymous"
+    return f"{SHARED_QUOTAS.get(provider, provider)}:{digest}"
+
+
+def retry_delay(headers: Mapping[str, str], attempt: int) -> float:
+    """Seconds to back off after a throttled response: ``Retry-After`` or exponential with jitter."""
+
+    value = (headers.get("retry-after") or "").strip()
+    if value:
+        if value.isdigit():
+            return float(value)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+    return BACKOFF_BASE * 2**attempt * (1 + random.random() / 2)
+
@@ -2,15 +2,16 @@
 
 from __future__ import annotations
 
-import re
 from typing import List
-from urllib.parse import urlparse
 
 from .base import Agent
 from ..models import Evidence, ProblemInput
 
 
 class SNSOSINTAgent(Agent):
+    depends_on = ("input", "urls")
+    pivots = ("handle", "url")
+
     def __init__(self) -> None:
         super().__init__(
             name="sns-osint",
@@ -19,16 +20,8 @@ class SNSOSINTAgent(Agent):
         )
 
     def run(self, problem: ProblemInput) -> List[Evidence]:
-        text = problem.text or ""
-        handles = set(re.findall(r"@([A-Za-z0-9_]{3,32})", text))
-
-        for url in problem.urls:
-            parsed = urlparse(url)
-            path_parts = [p for p in parsed.path.split("/") if p]
-            if path_parts:
-                candidate = path_parts[0]
-                if re.match(r"^[A-Za-z0-9_]{3,32}$", candidate):
-                    handles.add(candidate)
+        index = problem.entities()
+        handles = list(dict.fromkeys(index.handles + index.url_handles))
 
         evidence: List[Evidence] = []
         for handle in handles:
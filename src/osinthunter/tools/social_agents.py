@@ -9,6 +9,8 @@ from ..models import Evidence, ProblemInput
 
 
 class SocialSearchAgent(Agent):
+    depends_on = ("input",)
+
     def __init__(self) -> None:
         super().__init__(name="social-searcher", description="Cross-SNS keyword/hashtag guidance", requires_network=False)
 
@@ -21,6 +23,8 @@ class SocialSearchAgent(Agent):
 
 
 class SherlockAgent(Agent):
+    depends_on = ()
+
     def __init__(self) -> None:
         super().__init__(name="sherlock", description="Username presence across sites", requires_network=False)
 
@@ -4,13 +4,13 @@ from __future__ import annotations
 
 from typing import List
 
-from tavily import TavilyClient
-
 from .base import Agent
 from ..models import Evidence, ProblemInput
 
 
 class TavilySearchAgent(Agent):
+    depends_on = ("input",)
+
     def __init__(self, api_key: str | None = None, allow_network: bool = False) -> None:
         super().__init__(
             name="tavily-search",
@@ -19,7 +19,16 @@ class TavilySearchAgent(Agent):
         )
         self.api_key = api_key
         self.allow_network = allow_network
-        self.client = TavilyClient(api_key=api_key) if api_key and allow_network else None
+        self._client = None
+
+    @property
+    def client(self):
+        # tavily is only imported once a keyed, network-enabled search runs.
+        if self._client is None and self.api_key and self.allow_network:
+            from tavily import TavilyClient
+
+            self._client = TavilyClient(api_key=self.api_key)
+        return self._client
 
     def run(self, problem: ProblemInput) -> List[Evidence]:
         query = (problem.text or "").strip()
@@ -29,8 +38,15 @@ class TavilySearchAgent(Agent):
         if not self.allow_network or not self.client:
             return [Evidence(source=self.name, fact=f"Tavily not executed (network disabled). Suggested query: '{query[:80]}'", confidence=0.25)]
 
+        from ..cache import cached_call
+
         try:
-            resp = self.client.search(query=query, max_results=3)
+            resp = cached_call(
+                "tavily",
+                f"search max_results=3 query={query}",
+                lambda: self.client.search(query=query, max_results=3),
+                is_empty=lambda d: not d.get("results"),
+            )
             results = resp.get("results", []) or []
             evidence: List[Evidence] = []
             for item in results[:3]:
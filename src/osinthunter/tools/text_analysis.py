@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import re
 from urllib.parse import urlparse
 from typing import List
 
@@ -11,6 +10,8 @@ from ..models import Evidence, ProblemInput
 
 
 class TextAnalysisAgent(Agent):
+    depends_on = ("input",)
+
     def __init__(self) -> None:
         super().__init__(
             name="text-analysis",
@@ -24,20 +25,17 @@ class TextAnalysisAgent(Agent):
             return []
 
         evidence: List[Evidence] = []
-        text_lower = text.lower()
+        index = problem.entities()
 
-        url_matches = set(re.findall(r"https?://[^\s]+", text))
-        for raw_url in url_matches:
-            parsed = urlparse(raw_url)
-            fact = f"URL found: {raw_url} (domain={parsed.netloc})"
+        for url in index.text_urls:
+            parsed = urlparse(url)
+            fact = f"URL found: {url} (domain={parsed.netloc})"
             evidence.append(Evidence(source=self.name, fact=fact, confidence=0.7))
 
-        email_matches = set(re.findall(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", text))
-        for email in email_matches:
+        for email in index.emails:
             evidence.append(Evidence(source=self.name, fact=f"Email found: {email}", confidence=0.6))
 
-        username_matches = set(re.findall(r"@([A-Za-z0-9_]{3,32})", text))
-        for username in username_matches:
+        for username in index.handles:
             evidence.append(
                 Evidence(
                     source=self.name,
@@ -47,8 +45,7 @@ class TextAnalysisAgent(Agent):
                 )
             )
 
-        coord_matches = set(re.findall(r"(-?\d{1,3}\.\d{3,}),\s*(-?\d{1,3}\.\d{3,})", text))
-        for lat, lon in coord_matches:
+        for lat, lon in index.coordinates:
             evidence.append(
                 Evidence(
                     source=self.name,
@@ -58,12 +55,10 @@ class TextAnalysisAgent(Agent):
                 )
             )
 
-        ip_matches = set(re.findall(r"\b(?:\d{1,3}\.){3}\d{1,3}\b", text))
-        for ip in ip_matches:
+        for ip in index.ips:
             evidence.append(Evidence(source=self.name, fact=f"Possible IP address: {ip}", confidence=0.5))
 
-        hashtags = set(re.findall(r"#(\w{2,64})", text_lower))
-        for tag in hashtags:
+        for tag in index.hashtags:
             evidence.append(Evidence(source=self.name, fact=f"Hashtag detected: #{tag}", confidence=0.45))
 
         return evidence
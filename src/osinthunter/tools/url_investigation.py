@@ -9,8 +9,12 @@ from typing import List
 from .base import Agent
 from ..models import Evidence, ProblemInput
 
+_IPV4_RE = re.compile(r"^(?:\d{1,3}\.){3}\d{1,3}$")
+
 
 class URLInvestigationAgent(Agent):
+    depends_on = ("input", "urls")
+
     def __init__(self) -> None:
         super().__init__(
             name="url-investigation",
@@ -19,8 +23,7 @@ class URLInvestigationAgent(Agent):
         )
 
     def run(self, problem: ProblemInput) -> List[Evidence]:
-        urls = set(problem.urls)
-        urls.update(re.findall(r"https?://[^\s]+", problem.text or ""))
+        urls = problem.entities().urls
 
         evidence: List[Evidence] = []
         for url in urls:
@@ -29,7 +32,7 @@ class URLInvestigationAgent(Agent):
             hostname = parsed.netloc or ""
             if hostname:
                 parts.append(f"domain={hostname}")
-                if re.match(r"^(?:\d{1,3}\.){3}\d{1,3}$", hostname):
+                if _IPV4_RE.match(hostname):
                     parts.append("host_is_ipv4")
             if parsed.path and parsed.path != "/":
                 parts.append(f"path={parsed.path}")
@@ -4,13 +4,14 @@ from __future__ import annotations
 
 from typing import List
 
-import httpx
-
 from .base import Agent
+from .http import fetch_json
 from ..models import Evidence, ProblemInput
 
 
 class WebSearchAgent(Agent):
+    depends_on = ("input",)
+
     def __init__(self, serpapi_api_key: str | None = None, bing_api_key: str | None = None, allow_network: bool = False) -> None:
         super().__init__(
             name="web-search",
@@ -21,7 +22,7 @@ class WebSearchAgent(Agent):
         self.bing_api_key = bing_api_key
         self.allow_network = allow_network
 
-    def run(self, problem: ProblemInput) -> List[Evidence]:
+    async def arun(self, problem: ProblemInput) -> List[Evidence]:
         keywords = problem.text.split()[:8]
         base_query = " ".join(keywords) if keywords else "osint ctf"
 
@@ -33,13 +34,13 @@ class WebSearchAgent(Agent):
 
         if self.serpapi_api_key:
             try:
-                resp = httpx.get(
+                data = await fetch_json(
+                    "serpapi",
                     "https://serpapi.com/search",
                     params={"engine": "google", "q": base_query, "api_key": self.serpapi_api_key, "num": 3},
                     timeout=8.0,
+                    is_empty=lambda d: not d.get("organic_results"),
                 )
-                resp.raise_for_status()
-                data = resp.json()
                 for item in (data.get("organic_results") or [])[:3]:
                     title = item.get("title", "")
                     link = item.get("link", "")
@@ -51,14 +52,14 @@ class WebSearchAgent(Agent):
 
         elif self.bing_api_key:
             try:
-                resp = httpx.get(
+                data = await fetch_json(
+                    "bing",
                     "https://api.bing.microsoft.com/v7.0/search",
                     params={"q": base_query, "count": 3},
                     headers={"Ocp-Apim-Subscription-Key": self.bing_api_key},
                     timeout=8.0,
+                    is_empty=lambda d: not (d.get("webPages") or {}).get("value"),
                 )
-                resp.raise_for_status()
-                data = resp.json()
                 for item in (data.get("webPages", {}).get("value", []) or [])[:3]:
                     title = item.get("name", "")
                     link = item.get("url", "")
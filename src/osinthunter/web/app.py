@@ -2,21 +2,102 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import threading
+from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
-from typing import List
-from tempfile import NamedTemporaryFile
+from typing import Any, Dict, List, Optional
 
-from fastapi import FastAPI, Form, Request, UploadFile, File, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import Body, FastAPI, Form, Request, UploadFile, File, HTTPException
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
+from .. import metrics
 from ..agent import OSINTAgent
+from ..batch import run_problem
 from ..config import load_config
+from ..langgraph_runner import shutdown, warmup
 from ..models import ProblemInput
+from .concurrency import RunGate, agent_process_pool
+from .jobs import CANCELLED, FAILED, QUEUED, RUNNING, SUCCEEDED, Job, JobScheduler, QueueFullError
+from .progress import progress_events, result_payload
+from .uploads import UploadSpool
 
-app = FastAPI(title="OSINT Hunter", version="0.1.0")
+_gate: Optional[RunGate] = None
+_scheduler: Optional[JobScheduler] = None
+_spool: Optional[UploadSpool] = None
+
+
+def get_gate() -> RunGate:
+    global _gate
+    if _gate is None:
+        config = load_config()
+        process_pool = None
+        if config.web_backend == "process":
+            process_pool = partial(agent_process_pool, config.web_concurrency, config.web_max_tasks_per_child)
+        _gate = RunGate(
+            max_concurrency=config.web_concurrency,
+            max_queue=config.web_queue,
+            queue_timeout=config.web_queue_timeout,
+            process_pool=process_pool,
+        )
+    return _gate
+
+
+async def _run_agent(problem: ProblemInput):
+    """Run one problem to completion, in a worker process with the process backend."""
+
+    gate = get_gate()
+    if gate.isolated:
+        return await gate.run_isolated(run_problem, problem)
+    return await gate.run(OSINTAgent(config=load_config()).run, problem)
+
+
+def get_scheduler() -> JobScheduler:
+    global _scheduler
+    if _scheduler is None:
+        config = load_config()
+        _scheduler = JobScheduler(
+            agent_factory=lambda: OSINTAgent(config=config),
+            max_workers=config.job_workers,
+            max_queue=config.job_queue,
+            retention_seconds=config.job_retention,
+        )
+    return _scheduler
+
+
+def get_spool() -> UploadSpool:
+    global _spool
+    if _spool is None:
+        config = load_config()
+        _spool = UploadSpool(config.upload_dir, max_bytes=MAX_UPLOAD_BYTES, retention_seconds=config.upload_retention)
+    return _spool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _gate, _scheduler
+    # Compile the graph and build the tool registry once per process.
+    warmup(load_config())
+    # With the process backend, start the workers and compile their graphs too,
+    # off the event loop.
+    await asyncio.to_thread(get_gate().prefork)
+    try:
+        yield
+    finally:
+        if _gate is not None:
+            _gate.shutdown()
+            _gate = None
+        if _scheduler is not None:
+            _scheduler.shutdown()
+            _scheduler = None
+        shutdown()
+
+
+app = FastAPI(title="OSINT Hunter", version="0.1.0", lifespan=lifespan)
 
 TEMPLATES_DIR = Path(__file__).parent / "templates"
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
@@ -29,39 +110,48 @@ MAX_UPLOAD_BYTES = 5 * 1024 * 1024  # 5MB safety limit
 
 
 async def _save_uploads(files: List[UploadFile]) -> List[str]:
+    spool = get_spool()
     saved: List[str] = []
     for f in files:
         if not f.filename:
             continue
         if not (f.content_type or "").startswith("image/"):
             raise HTTPException(status_code=400, detail="Only image uploads are allowed")
-        data = await f.read()
-        if len(data) > MAX_UPLOAD_BYTES:
-            raise HTTPException(status_code=413, detail="Uploaded file too large (max 5MB)")
-        suffix = Path(f.filename).suffix[:10]
-        with NamedTemporaryFile(delete=False, suffix=suffix, prefix="upload_", dir="/tmp") as tmp:
-            tmp.write(data)
-            saved.append(tmp.name)
+        # Identical images map to the same spooled path, so repeat submissions
+        # hit the same per-image caches.
+        saved.append(str((await spool.save(f)).path))
     return saved
 
-def _cleanup(paths: List[str]) -> None:
-    for p in paths:
-        try:
-            Path(p).unlink(missing_ok=True)
-        except Exception:
-            pass
+
+def _error_text(detail) -> str:
+    if isinstance(detail, dict):
+        extra = ", ".join(f"{k}={v}" for k, v in detail.items() if k != "error")
+        return f"{detail.get('error', '')} ({extra})" if extra else str(detail.get("error", ""))
+    return str(detail)
 
 
 @app.get("/healthz")
 async def health() -> dict:
-    return {"status": "ok"}
+    return {"status": "ok", "runs": get_gate().depth()}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint() -> PlainTextResponse:
+    """Prometheus scrape endpoint."""
+
+    depth = get_gate().depth()
+    metrics.RUNS_IN_FLIGHT.set(depth["in_flight"])
+    metrics.RUNS_QUEUED.set(depth["queued"])
+    if _scheduler is not None:
+        stats = _scheduler.stats()
+        for status in (QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED):
+            metrics.JOBS.set(stats.get(status, 0), status=status)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+    return templates.TemplateResponse(request, "index.html", {"request": request})
 
 
 @app.post("/run", response_class=HTMLResponse)
@@ -71,37 +161,52 @@ async def run_job(
     urls: str = Form(""),
     images: str = Form(""),
     upload: List[UploadFile] = File(default_factory=list),
+    stream: str = Form(""),
 ):
-    config = load_config()
-    agent = OSINTAgent(config=config)
-
     url_list: List[str] = [u.strip() for u in urls.splitlines() if u.strip()]
     image_list: List[str] = [i.strip() for i in images.splitlines() if i.strip()]
     uploaded_names: List[str] = [f.filename for f in upload if f.filename]
 
-    uploaded_paths: List[str] = []
+    if stream == "1" and not any(f.filename for f in upload):
+        # The form's script asked for live progress and there is nothing to
+        # spool: let the page stream from /api/run/stream. Other clients get
+        # the rendered result below.
+        return templates.TemplateResponse(
+            request,
+            "result.html",
+            {
+                "request": request,
+                "prompt": prompt,
+                "urls": url_list,
+                "images": image_list,
+                "result": None,
+                "stream": {"prompt": prompt, "urls": url_list, "images": image_list},
+            },
+        )
+
     try:
         uploaded_paths = await _save_uploads(upload)
         combined_images = image_list + uploaded_paths
         problem = ProblemInput(text=prompt, urls=url_list, image_paths=combined_images)
-        result = agent.run(problem)
+        result = await _run_agent(problem)
     except HTTPException as exc:
         return templates.TemplateResponse(
+            request,
             "result.html",
             {
                 "request": request,
                 "prompt": prompt,
                 "urls": url_list,
                 "images": image_list + uploaded_names,
-                "error": exc.detail,
+                "error": _error_text(exc.detail),
                 "result": None,
             },
             status_code=exc.status_code,
+            headers=exc.headers,
         )
-    finally:
-        _cleanup(uploaded_paths)
 
     return templates.TemplateResponse(
+        request,
         "result.html",
         {
             "request": request,
@@ -113,23 +218,109 @@ async def run_job(
     )
 
 
-@app.post("/api/run")
-async def api_run(payload: dict):
-    config = load_config()
-    agent = OSINTAgent(config=config)
+def _problem_from_payload(payload: Dict[str, Any]) -> ProblemInput:
     prompt = payload.get("prompt", "")
     urls = payload.get("urls", []) or []
     images = payload.get("images", []) or []
-    problem = ProblemInput(text=prompt, urls=urls, image_paths=images)
-    result = agent.run(problem)
-    return JSONResponse(
-        {
-            "plan": [step.title for step in result.plan],
-            "evidence": [ev.__dict__ for ev in result.evidence],
-            "flags": result.flag_candidates,
-            "notes": result.notes,
-        }
-    )
+    return ProblemInput(text=prompt, urls=urls, image_paths=images)
+
+
+def _job_payload(job: Job) -> Dict[str, Any]:
+    return {
+        "id": job.id,
+        "status": job.status,
+        "created": job.created,
+        "started": job.started,
+        "finished": job.finished,
+        "node": job.node,
+        "cancel_requested": job.cancel_requested.is_set(),
+        "evidence": job.evidence,
+        "flags": job.flags,
+        "result": result_payload(job.result) if job.result else None,
+        "error": job.error,
+    }
+
+
+@app.post("/api/run")
+async def api_run(payload: dict):
+    problem = _problem_from_payload(payload)
+    result = await _run_agent(problem)
+    return JSONResponse(result_payload(result))
+
+
+@app.post("/api/run/stream")
+async def api_run_stream(payload: dict):
+    """Run the agent and stream NDJSON progress events as they happen."""
+
+    gate = get_gate()
+    agent = OSINTAgent(config=load_config())
+    problem = _problem_from_payload(payload)
+    # Take the slot before the 200 goes out, so 429/503 are real status codes
+    # rather than an error event inside an already started stream.
+    await gate.acquire()
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    cancelled = threading.Event()
+
+    def produce() -> None:
+        # Runs on a gate worker thread; hands events back to the loop.
+        for event in progress_events(agent, problem, cancelled):
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    def finished(future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            queue.put_nowait({"event": "error", "error": str(future.exception())})
+        queue.put_nowait(None)
+
+    # The slot is released when `produce` returns, which it does once the
+    # run ends or `body` stops reading and sets `cancelled`.
+    gate.start(produce).add_done_callback(finished)
+
+    async def body():
+        try:
+            while (event := await queue.get()) is not None:
+                yield json.dumps(event, ensure_ascii=False, default=str) + "\n"
+        finally:
+            cancelled.set()
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+@app.post("/api/jobs", status_code=202)
+async def api_submit_jobs(payload: Any = Body(...)):
+    """Enqueue one problem (object) or many (list); returns job ids."""
+
+    scheduler = get_scheduler()
+    problems = payload if isinstance(payload, list) else [payload]
+    if not all(isinstance(p, dict) for p in problems):
+        raise HTTPException(status_code=400, detail="Expected a problem object or a list of them")
+    jobs: List[Dict[str, Any]] = []
+    try:
+        for p in problems:
+            job = scheduler.submit(_problem_from_payload(p))
+            jobs.append({"id": job.id, "status": job.status})
+    except QueueFullError as exc:
+        # Jobs accepted before the queue filled up stay queued.
+        raise HTTPException(status_code=429, detail={"error": str(exc), "accepted": jobs, **scheduler.stats()}) from None
+    body: Any = jobs if isinstance(payload, list) else jobs[0]
+    return JSONResponse(body, status_code=202)
+
+
+@app.get("/api/jobs/{job_id}")
+async def api_get_job(job_id: str):
+    job = get_scheduler().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    return JSONResponse(_job_payload(job))
+
+
+@app.delete("/api/jobs/{job_id}")
+async def api_cancel_job(job_id: str):
+    job = get_scheduler().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    return JSONResponse({"id": job.id, "status": job.status, "cancel_requested": job.cancel_requested.is_set()})
 
 
 @app.exception_handler(Exception)
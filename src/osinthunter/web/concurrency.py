@@ -0,0 +1,182 @@
+"""Bounded off-loop execution of agent runs for the web app."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from fastapi import HTTPException
+
+T = TypeVar("T")
+
+
+def agent_process_pool(workers: int, max_tasks_per_child: int = 0) -> ProcessPoolExecutor:
+    """Worker processes that each compile the graph once and keep a warm agent.
+
+    Workers are started from a forkserver (spawn where unavailable) rather than
+    forked from the server, which already runs the HTTP and run-log threads.
+    A worker retires after ``max_tasks_per_child`` tasks (0: never), which
+    bounds memory growth from caches and fragmentation in long-lived workers.
+    """
+
+    from ..batch import init_worker
+
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        # Children fork from a server that has already imported the agent.
+        context.set_forkserver_preload(["osinthunter.batch", "osinthunter.agent"])
+    else:
+        context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(
+        max_workers=max(1, workers),
+        mp_context=context,
+        initializer=init_worker,
+        max_tasks_per_child=max_tasks_per_child or None,
+    )
+
+
+class RunGate:
+    """Run blocking agent calls on a worker pool with a concurrency limit.
+
+    At most ``max_concurrency`` runs execute at once and at most ``max_queue``
+    wait for a slot. Beyond that callers get 429; a caller that waits longer
+    than ``queue_timeout`` gets 503. Both carry the current queue depth.
+
+    With ``process_pool`` (a factory such as ``agent_process_pool``),
+    ``run_isolated`` executes picklable calls in worker processes instead of
+    threads, so CPU-bound runs are not serialized on the GIL. Both kinds of
+    run share the same slots.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        max_queue: int = 16,
+        queue_timeout: float = 60.0,
+        process_pool: Optional[Callable[[], ProcessPoolExecutor]] = None,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.queued = 0
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="osinthunter-run")
+        self._process_factory = process_pool
+        self._processes = process_pool() if process_pool is not None else None
+
+    @property
+    def isolated(self) -> bool:
+        return self._processes is not None
+
+    def depth(self) -> Dict[str, int]:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+        }
+
+    def _reject(self, status_code: int, message: str) -> HTTPException:
+        return HTTPException(
+            status_code=status_code,
+            detail={"error": message, **self.depth()},
+            headers={"Retry-After": str(max(1, int(self.queue_timeout // 4)))},
+        )
+
+    def check(self) -> None:
+        """Raise 429 right away if a new run could not even be queued."""
+
+        if self._slots.locked() and self.queued >= self.max_queue:
+            raise self._reject(429, "Too many concurrent runs")
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        return await self._submit(self._pool, fn, args)
+
+    async def run_isolated(self, fn: Callable[..., T], *args: Any) -> T:
+        """Like ``run`` but in a worker process; falls back to a thread without a process pool.
+
+        ``fn`` and its arguments must be picklable (module-level functions, dataclasses).
+        """
+
+        if self._processes is None:
+            return await self.run(fn, *args)
+        pool = self._processes
+        try:
+            return await self._submit(pool, fn, args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); this run is lost, later ones get a fresh pool.
+            if self._processes is pool and self._process_factory is not None:
+                self._processes = self._process_factory()
+                pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def prefork(self) -> List[int]:
+        """Start every worker process now and wait until each has compiled its graph.
+
+        Returns the worker pids. A no-op without a process pool. The warm-up
+        calls are ordinary pool tasks, so they count against
+        ``max_tasks_per_child``: each worker retires one run earlier (more if
+        it happened to take several warm-up calls) the first time around.
+        """
+
+        if self._processes is None:
+            return []
+        futures = [self._processes.submit(os.getpid) for _ in range(self.max_concurrency)]
+        return sorted({future.result() for future in futures})
+
+    async def acquire(self) -> None:
+        """Wait for a run slot, with the same 429/503 rejections as ``run``.
+
+        The slot is held until work handed to ``start`` ends. Callers that must
+        reject before committing to a response (the streaming endpoint) take
+        the slot first and start the work afterwards.
+        """
+
+        self.check()
+
+        self.queued += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self._reject(503, "Timed out waiting for a run slot") from None
+        finally:
+            self.queued -= 1
+        self.in_flight += 1
+
+    def start(self, fn: Callable[..., T], *args: Any) -> "asyncio.Future[T]":
+        """Run ``fn`` on a worker thread in a slot taken by ``acquire``."""
+
+        return self._dispatch(self._pool, fn, args)
+
+    async def _submit(self, pool: Any, fn: Callable[..., T], args: tuple) -> T:
+        await self.acquire()
+        return await asyncio.shield(self._dispatch(pool, fn, args))
+
+    def _dispatch(self, pool: Any, fn: Callable[..., T], args: tuple) -> "asyncio.Future[T]":
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(pool, partial(fn, *args))
+        except BaseException:
+            self._release(None)
+            raise
+        # Release the slot when the work really ends, even if the client
+        # disconnects and the awaiting coroutine is cancelled first.
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future: asyncio.Future) -> None:
+        self.in_flight -= 1
+        self._slots.release()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            # Workers finish their current run and exit through their finalizers.
+            self._processes.shutdown(wait=False, cancel_futures=True)
+            self._processes = None
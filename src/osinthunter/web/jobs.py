@@ -0,0 +1,154 @@
+"""In-process background job scheduler for long agent runs."""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from ..agent import OSINTAgent
+from ..models import AgentResult, ProblemInput
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = {SUCCEEDED, FAILED, CANCELLED}
+
+
+class QueueFullError(Exception):
+    """Raised when the scheduler already holds ``max_queue`` pending jobs."""
+
+
+@dataclass
+class Job:
+    """A submitted problem and its progress."""
+
+    id: str
+    problem: ProblemInput
+    status: str = QUEUED
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    node: Optional[str] = None
+    evidence: List[Dict[str, Any]] = field(default_factory=list)
+    flags: List[str] = field(default_factory=list)
+    result: Optional[AgentResult] = None
+    error: Optional[str] = None
+    cancel_requested: threading.Event = field(default_factory=threading.Event, repr=False)
+    future: Optional[Future] = field(default=None, repr=False)
+
+
+class JobScheduler:
+    """Run agent jobs on a bounded worker pool and keep results for a while.
+
+    Finished jobs are dropped after ``retention_seconds`` or once more than
+    ``max_finished`` of them are held, oldest first. Cancellation of a running
+    job is cooperative and takes effect after the current graph node.
+    """
+
+    def __init__(
+        self,
+        agent_factory: Callable[[], OSINTAgent],
+        max_workers: int = 2,
+        max_queue: int = 100,
+        retention_seconds: float = 3600.0,
+        max_finished: int = 500,
+    ) -> None:
+        self.agent_factory = agent_factory
+        self.max_queue = max_queue
+        self.retention_seconds = retention_seconds
+        self.max_finished = max_finished
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="osinthunter-job")
+
+    def submit(self, problem: ProblemInput) -> Job:
+        with self._lock:
+            self._prune()
+            pending = sum(1 for job in self._jobs.values() if job.status == QUEUED)
+            if pending >= self.max_queue:
+                raise QueueFullError(f"{pending} jobs already queued")
+            job = Job(id=uuid.uuid4().hex, problem=problem)
+            self._jobs[job.id] = job
+        job.future = self._pool.submit(self._execute, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a pending/running job, or forget a finished one."""
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status in FINISHED:
+                del self._jobs[job_id]
+                return job
+            job.cancel_requested.set()
+            if job.future is not None and job.future.cancel():
+                self._finish(job, CANCELLED)
+        return job
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
+
+    def _execute(self, job: Job) -> None:
+        with self._lock:
+            if job.cancel_requested.is_set():
+                self._finish(job, CANCELLED)
+                return
+            job.status = RUNNING
+            job.started = time.time()
+
+        state: Optional[Dict[str, Any]] = None
+        try:
+            agent = self.agent_factory()
+            for node, state in agent.stream(job.problem):
+                job.node = node
+                job.evidence = list(state.get("evidence") or [])
+                job.flags = list(state.get("flags") or [])
+                if job.cancel_requested.is_set():
+                    with self._lock:
+                        self._finish(job, CANCELLED)
+                    return
+            job.result = agent.result_from_state(job.problem, state or {})
+            with self._lock:
+                self._finish(job, SUCCEEDED)
+        except Exception as exc:
+            job.error = str(exc)
+            with self._lock:
+                self._finish(job, FAILED)
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status = status
+        job.finished = time.time()
+
+    def _prune(self) -> None:
+        now = time.time()
+        finished = sorted(
+            (job for job in self._jobs.values() if job.status in FINISHED),
+            key=lambda job: job.finished or 0.0,
+        )
+        expired = [job for job in finished if now - (job.finished or now) > self.retention_seconds]
+        overflow = finished[: max(0, len(finished) - self.max_finished)]
+        for job in expired + overflow:
+            self._jobs.pop(job.id, None)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for job in self._jobs.values():
+                job.cancel_requested.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,59 @@
+"""Incremental progress events for streamed agent runs."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import asdict
+from typing import Any, Dict, Iterator, Optional
+
+from ..agent import OSINTAgent
+from ..models import AgentResult, ProblemInput
+
+
+def result_payload(result: AgentResult) -> Dict[str, Any]:
+    return {
+        "plan": [step.title for step in result.plan],
+        "evidence": [asdict(ev) for ev in result.evidence],
+        "flags": result.flag_candidates,
+        "notes": result.notes,
+    }
+
+
+def progress_events(
+    agent: OSINTAgent,
+    problem: ProblemInput,
+    cancelled: Optional[threading.Event] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Translate graph updates into client-facing events.
+
+    Emits ``plan`` per planner step, ``tool`` as each sub-agent finishes,
+    ``validator`` per validation, ``flag`` the first time a candidate appears and
+    a final ``result``. Stops early once ``cancelled`` is set.
+    """
+
+    seen_flags: set = set()
+    last_state: Dict[str, Any] = {}
+    for node, payload in agent.stream(problem, tool_events=True):
+        if cancelled is not None and cancelled.is_set():
+            return
+        if node == "tool":
+            yield {"event": "tool", **payload}
+            continue
+        last_state = payload
+        loop = payload.get("loop", 0)
+        if node == "planner":
+            yield {"event": "plan", "loop": loop, "plan": payload.get("plan", [])}
+        elif node == "validator":
+            flags = payload.get("flags") or []
+            yield {"event": "validator", "loop": loop, "stop": bool(payload.get("stop")), "flags": flags}
+            for flag in flags:
+                if flag not in seen_flags:
+                    seen_flags.add(flag)
+                    yield {"event": "flag", "loop": loop, "flag": flag}
+
+    result = agent.result_from_state(problem, last_state)
+    for flag in result.flag_candidates:
+        if flag not in seen_flags:
+            seen_flags.add(flag)
+            yield {"event": "flag", "flag": flag}
+    yield {"event": "result", **result_payload(result)}
@@ -0,0 +1,101 @@
+"""Content-addressed spool for uploaded images.
+
+Uploads are streamed to disk in chunks while a SHA-256 is computed, so memory
+use per upload is one chunk and oversized files are rejected as soon as they
+cross the limit. Files are stored as ``<sha256><suffix>``: resubmitting the same
+image reuses the existing file and its path, so anything keyed on it (metadata
+and perceptual-hash caches, tool fingerprints) is reused too.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+from fastapi import HTTPException, UploadFile
+
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class SpooledUpload:
+    path: Path
+    sha256: str
+    size: int
+    reused: bool
+
+
+class UploadSpool:
+    """Stream uploads into ``directory`` with a size cap and hash-based dedupe.
+
+    Stored files untouched for ``retention_seconds`` are pruned (at most once a
+    minute, on save).
+    """
+
+    def __init__(self, directory: str | os.PathLike, max_bytes: int, retention_seconds: float = 86400.0) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.retention_seconds = retention_seconds
+        self._last_prune = 0.0
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    async def save(self, upload: UploadFile) -> SpooledUpload:
+        if upload.size is not None and upload.size > self.max_bytes:
+            raise self._too_large()
+        suffix = Path(upload.filename or "").suffix.lower()[:10]
+        partial = self.directory / f".partial-{uuid.uuid4().hex}"
+        digest = hashlib.sha256()
+        size = 0
+        fh = await asyncio.to_thread(partial.open, "wb")
+        try:
+            while chunk := await upload.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise self._too_large()
+                digest.update(chunk)
+                await asyncio.to_thread(fh.write, chunk)
+        except BaseException:
+            fh.close()
+            partial.unlink(missing_ok=True)
+            raise
+        fh.close()
+
+        sha256 = digest.hexdigest()
+        final = self.directory / f"{sha256}{suffix}"
+        reused = final.exists()
+        if reused:
+            partial.unlink(missing_ok=True)
+            os.utime(final)  # keep recently resubmitted images out of the prune window
+        else:
+            os.replace(partial, final)
+        await self._maybe_prune()
+        return SpooledUpload(path=final, sha256=sha256, size=size, reused=reused)
+
+    def prune(self) -> int:
+        """Delete stored uploads (and stale partial files) past the retention window."""
+
+        cutoff = time.time() - self.retention_seconds
+        removed = 0
+        for path in self.directory.iterdir():
+            try:
+                if path.is_file() and path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+    async def _maybe_prune(self) -> None:
+        now = time.monotonic()
+        if now - self._last_prune >= 60.0:
+            self._last_prune = now
+            # The sweep stats every stored file; keep it off the event loop.
+            await asyncio.to_thread(self.prune)
+
+    def _too_large(self) -> HTTPException:
+        return HTTPException(status_code=413, detail=f"Uploaded file too large (max {self.max_bytes // (1024 * 1024)}MB)")
@@ -0,0 +1,29 @@
+import pytest
+
+from osinthunter.cache import close_response_cache
+from osinthunter.evidence_db import close_evidence_db
+from osinthunter.runlog import close_run_logger
+from osinthunter.tools.image_index import close_image_index
+
+
+def _close_stores() -> None:
+    # The run logger's sinks write to the evidence DB and the image index; flush it first.
+    close_run_logger()
+    close_evidence_db()
+    close_image_index()
+    close_response_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolated_stores(tmp_path, monkeypatch):
+    """Point every on-disk store at ``tmp_path`` so tests neither read nor write the repo's .cache/."""
+
+    store = tmp_path / "store"
+    monkeypatch.setenv("OSINTHUNTER_CACHE_PATH", str(store / "provider_cache.sqlite3"))
+    monkeypatch.setenv("OSINTHUNTER_LOG_PATH", str(store / "logs" / "agent_runs.jsonl"))
+    monkeypatch.setenv("OSINTHUNTER_EVIDENCE_DB_PATH", str(store / "evidence.sqlite3"))
+    monkeypatch.setenv("OSINTHUNTER_IMAGE_INDEX_PATH", str(store / "image_index.sqlite3"))
+    monkeypatch.setenv("OSINTHUNTER_UPLOAD_DIR", str(store / "uploads"))
+    _close_stores()
+    yield
+    _close_stores()
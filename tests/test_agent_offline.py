@@ -21,3 +21,124 @@ def test_run_offline_no_input():
     assert result.plan
     # Evidence may be sparse but should still be a list
     assert isinstance(result.evidence, list)
+
+
+def test_unchanged_tools_run_once_across_loops(monkeypatch):
+    from osinthunter.tools.text_analysis import TextAnalysisAgent
+
+    calls = []
+    original = TextAnalysisAgent.run
+
+    def counting_run(self, problem):
+        calls.append(problem.text)
+        return original(self, problem)
+
+    monkeypatch.setattr(TextAnalysisAgent, "run", counting_run)
+    agent = OSINTAgent()
+    result = agent.run(ProblemInput(text="Investigate http://example.com and ip 8.8.8.8 @user"))
+    assert agent.config.max_iterations > 1
+    assert len(calls) == 1
+    assert any(ev.source == "text-analysis" for ev in result.evidence)
+
+
+def test_failed_and_loop_dependent_tools_run_again():
+    from osinthunter.models import Evidence
+    from osinthunter.tools.base import Agent
+
+    class FlakyAgent(Agent):
+        depends_on = ("input",)
+
+        def __init__(self):
+            super().__init__(name="flaky", description="fails on its first call")
+            self.calls = 0
+
+        def run(self, problem):
+            self.calls += 1
+            if self.calls == 1:
+                raise RuntimeError("provider hiccup")
+            return [Evidence(source=self.name, fact="recovered", confidence=0.5)]
+
+    class PerLoopAgent(Agent):
+        depends_on = ("loop",)
+
+        def __init__(self):
+            super().__init__(name="per-loop", description="reads the loop counter")
+            self.calls = 0
+
+        def run(self, problem):
+            self.calls += 1
+            return []
+
+    flaky, per_loop = FlakyAgent(), PerLoopAgent()
+    agent = OSINTAgent(tools=[flaky, per_loop])
+    result = agent.run(ProblemInput(text="no flag here"))
+
+    assert agent.config.max_iterations > 2
+    # Retried after the failure, then memoized on its unchanged input.
+    assert flaky.calls == 2
+    assert any(ev.fact == "recovered" for ev in result.evidence)
+    # A changed fingerprint re-runs the tool every loop.
+    assert per_loop.calls == agent.config.max_iterations
+    agent.close()
+
+
+def test_compiled_graph_is_shared_across_agents(monkeypatch):
+    from osinthunter import langgraph_runner
+
+    builds = []
+    original = langgraph_runner.build_langgraph_app
+
+    def counting_build(*args, **kwargs):
+        builds.append(args)
+        return original(*args, **kwargs)
+
+    langgraph_runner.shutdown()
+    monkeypatch.setattr(langgraph_runner, "build_langgraph_app", counting_build)
+    first = OSINTAgent()
+    first.run(ProblemInput(text="ip 1.1.1.1"))
+    second = OSINTAgent()
+    second.run(ProblemInput(text="ip 9.9.9.9"))
+
+    assert len(builds) == 1
+    assert first.tools is second.tools
+    langgraph_runner.shutdown()
+
+
+def test_validator_only_sends_new_evidence(monkeypatch):
+    from types import SimpleNamespace
+
+    from osinthunter import langgraph_runner
+    from osinthunter.models import Evidence
+    from osinthunter.tools.base import Agent
+
+    class LoopingAgent(Agent):
+        depends_on = ("loop",)  # re-run every loop
+
+        def __init__(self):
+            super().__init__(name="looping", description="new fact each loop")
+            self.calls = 0
+
+        def run(self, problem):
+            self.calls += 1
+            return [Evidence(source=self.name, fact=f"finding number {self.calls} " + "x" * 500, confidence=0.5 + self.calls / 100)]
+
+    prompts = []
+
+    class RecordingLLM:
+        def invoke(self, prompt):
+            prompts.append(prompt)
+            return SimpleNamespace(content='{"flags": [], "stop": false}')
+
+    monkeypatch.setattr(langgraph_runner, "_make_llm", lambda config: RecordingLLM())
+    agent = OSINTAgent(tools=[LoopingAgent()])
+    result = agent.run(ProblemInput(text="no flag here"))
+
+    validator_prompts = [p for p in prompts if p.startswith("You are a validator")]
+    assert len(validator_prompts) == agent.config.max_iterations
+    last = validator_prompts[-1]
+    new_part = last.split("New evidence:")[1]
+    assert f"finding number {agent.config.max_iterations} " in new_part
+    assert "finding number 1 " not in new_part
+    # Earlier findings arrive as a bounded, trimmed summary.
+    assert "finding number 1 " in last and len(last) < 2 * len(validator_prompts[1])
+    assert sum(ev.source == "looping" for ev in result.evidence) == agent.config.max_iterations
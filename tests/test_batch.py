@@ -0,0 +1,36 @@
+import json
+
+from osinthunter.batch import completed_ids, run_batch
+
+
+def test_batch_writes_results_and_resumes(tmp_path):
+    problems = tmp_path / "problems.jsonl"
+    problems.write_text(
+        "\n".join(
+            [
+                json.dumps({"id": "a", "prompt": "flag{alpha} at https://example.com/@alice"}),
+                json.dumps({"id": "b", "prompt": "coordinates 35.6586, 139.7454"}),
+                "not json",
+            ]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+    output = tmp_path / "results.jsonl"
+    # Simulate a crash that left one finished record and a torn line behind.
+    output.write_text(json.dumps({"id": "a", "flag_candidates": ["flag{alpha}"]}) + '\n{"id": "b", "pl', encoding="utf-8")
+
+    counts = run_batch(problems, output, workers=2)
+    assert counts == {"succeeded": 1, "failed": 1, "skipped": 1}
+
+    records = {}
+    for line in output.read_text(encoding="utf-8").splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        records[record["id"]] = record
+    assert records["b"]["evidence"] and "plan" in records["b"]
+    assert "invalid JSON" in records["line-3"]["error"]
+    # The failed line is retried on the next run; finished ids are not.
+    assert completed_ids(output) == {"a", "b"}
@@ -0,0 +1,27 @@
+from benchmarks.corpus import KINDS, build_corpus
+from benchmarks.runner import bench_env, compare, run_benchmark
+from benchmarks.stub_server import StubProviderServer
+from osinthunter.langgraph_runner import shutdown
+
+
+def test_benchmark_runs_offline_against_stub(tmp_path):
+    problems = build_corpus(per_kind=1, image_dir=tmp_path)
+    assert {p["kind"] for p in problems} == set(KINDS)
+
+    with StubProviderServer(latency=0.0, error_rate=0.2, seed=1) as stub, bench_env(stub.base_url, tmp_path):
+        try:
+            report = run_benchmark(problems, measure_memory=False)
+        finally:
+            shutdown()
+        assert (tmp_path / "agent_runs.jsonl").exists()
+
+    assert report["problems"] == len(problems)
+    assert {"planner", "tools", "validator"} <= set(report["nodes"])
+    for tool in ("shodan", "censys", "web-search", "google-lens", "wayback"):
+        assert report["tools"][tool]["count"] >= 1
+    assert {"shodan", "censys", "serpapi", "builtwith", "hunter", "wayback"} <= set(stub.requests)
+    assert sum(stub.errors.values()) > 0
+
+    slower = {**report, "nodes": {k: {**v, "p95_ms": v["p95_ms"] * 3 + 50} for k, v in report["nodes"].items()}}
+    assert compare(report, report) == []
+    assert any(line.startswith("nodes.") for line in compare(slower, report))
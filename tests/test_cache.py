@@ -0,0 +1,52 @@
+import time
+
+from osinthunter.cache import ResponseCache, main
+from osinthunter.tools.http import normalize_request
+
+
+def test_roundtrip_ttl_and_negative_entries(tmp_path):
+    cache = ResponseCache(path=tmp_path / "c.sqlite3", ttls={"shodan": 60}, negative_ttl=1)
+    cache.put("shodan", "GET host/1.2.3.4", {"ports": [22]})
+    cache.put("shodan", "GET host/5.6.7.8", None, status=404, negative=True)
+
+    assert cache.get("shodan", "GET host/1.2.3.4").payload == {"ports": [22]}
+    assert cache.get("censys", "GET host/1.2.3.4") is None
+    missing = cache.get("shodan", "GET host/5.6.7.8")
+    assert missing.negative and missing.status == 404
+
+    cache.ttls["shodan"] = 0
+    cache.put("shodan", "GET host/9.9.9.9", {"ports": []})
+    time.sleep(0.01)
+    assert cache.get("shodan", "GET host/9.9.9.9") is None
+    cache.close()
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = ResponseCache(path=tmp_path / "c.sqlite3", max_bytes=2000)
+    for i in range(5):
+        cache.put("wayback", f"GET url={i}", {"blob": "x" * 500})
+        time.sleep(0.01)
+        cache.get("wayback", "GET url=0")
+    assert cache.get("wayback", "GET url=0") is not None
+    assert cache.get("wayback", "GET url=1") is None
+    assert sum(row["bytes"] for row in cache.stats()) <= 2000
+    cache.close()
+
+
+def test_normalized_request_drops_credentials():
+    a = normalize_request("https://API.shodan.io/shodan/host/1.2.3.4", {"key": "secret-a"})
+    b = normalize_request("https://api.shodan.io/shodan/host/1.2.3.4", {"key": "secret-b"})
+    assert a == b
+    assert "secret" not in a
+
+
+def test_cli_stats_and_purge(tmp_path, capsys):
+    path = tmp_path / "c.sqlite3"
+    cache = ResponseCache(path=path)
+    cache.put("hunter", "GET domain=example.com", {"data": {}})
+    cache.close()
+
+    main(["--path", str(path), "stats"])
+    assert "hunter: entries=1" in capsys.readouterr().out
+    main(["--path", str(path), "purge", "--provider", "hunter"])
+    assert "Purged 1 entries" in capsys.readouterr().out
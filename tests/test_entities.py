@@ -0,0 +1,37 @@
+from osinthunter.entities import build_entity_index, canonical_url
+from osinthunter.models import ProblemInput
+
+
+def test_single_pass_extracts_and_canonicalizes():
+    text = (
+        "See https://example.com/a). Mail bob@corp.io, ping @alice at 35.6812, 139.7671 "
+        "from 8.8.8.8 #CTF via files.example.org and https://x.com/@eve,"
+    )
+    index = build_entity_index(text, ["https://twitter.com/carol"])
+
+    assert index.text_urls == ["https://example.com/a", "https://x.com/@eve"]
+    assert index.urls[0] == "https://twitter.com/carol"
+    assert index.emails == ["bob@corp.io"]
+    assert index.handles == ["alice"]  # the email domain is not a handle
+    assert index.url_handles == ["carol", "eve"]
+    assert index.coordinates == [("35.6812", "139.7671")]
+    assert index.ips == ["8.8.8.8"]
+    assert index.hashtags == ["ctf"]
+    assert index.hosts == ["twitter.com", "example.com", "x.com", "corp.io", "files.example.org"]
+
+
+def test_ip_url_host_is_an_ip():
+    index = build_entity_index("Admin panel at http://203.0.113.7:8080/admin")
+    assert index.ips == ["203.0.113.7"]
+    assert index.hosts == []
+
+
+def test_canonical_url_keeps_balanced_brackets():
+    assert canonical_url("https://en.wikipedia.org/wiki/Foo_(bar)") == "https://en.wikipedia.org/wiki/Foo_(bar)"
+    assert canonical_url("https://example.com/path).") == "https://example.com/path"
+    assert canonical_url("https://example.com/。") == "https://example.com/"
+
+
+def test_problem_index_is_built_once():
+    problem = ProblemInput(text="ip 1.2.3.4")
+    assert problem.entities() is problem.entities()
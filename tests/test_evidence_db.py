@@ -0,0 +1,96 @@
+import gzip
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from osinthunter.agent import OSINTAgent
+from osinthunter.evidence_db import REJECTED, EvidenceDB, close_evidence_db, get_evidence_db, main
+from osinthunter.models import ProblemInput
+from osinthunter.runlog import close_run_logger
+
+
+def _record(run_id, text, evidence, flags=(), ts="2026-01-02T03:04:05+00:00"):
+    return {"run_id": run_id, "ts": ts, "input": text, "evidence": evidence, "flags": list(flags), "loop": 1}
+
+
+def test_entity_and_full_text_queries(tmp_path):
+    db = EvidenceDB(tmp_path / "ev.sqlite3")
+    shodan = {"source": "shodan", "fact": "Shodan: 203.0.113.7 org=ExampleNet open_ports=[22, 8443]", "confidence": 0.6, "metadata": {"ip": "203.0.113.7"}}
+    runs = [
+        _record("r1", "Who runs 203.0.113.7?", [shodan], ["flag{one}"]),
+        _record("r2", "Find @Alice_CTF", [{"source": "sns-osint", "fact": "Profile for alice_ctf on GitHub", "confidence": 0.5, "metadata": {"username": "alice_ctf"}}]),
+        _record("r3", "Another look", [dict(shodan, fact="Shodan: 203.0.113.7 banner mentions alice_ctf")], ts="2026-02-01T00:00:00+00:00"),
+    ]
+    assert db.record_runs(runs) == 3
+    assert db.record_runs(runs[:1]) == 0  # replay is a no-op
+
+    by_ip = db.runs_for_entity("203.0.113.7")
+    assert [r["run_id"] for r in by_ip] == ["r3", "r1"]  # newest first
+    assert by_ip[1]["flags"] == ["flag{one}"]
+    assert {r["run_id"] for r in db.runs_for_entity("@alice_ctf")} == {"r2"}
+    hits = db.search("alice_ctf")
+    assert {h["run_id"] for h in hits} == {"r2", "r3"}
+    assert [h["run_id"] for h in db.search("alice_ctf", source="shodan")] == ["r3"]
+    assert db.search("8443")[0]["run_id"] == "r1"
+    assert db.run("r1")["evidence"][0]["metadata"] == {"ip": "203.0.113.7"}
+    db.close()
+
+
+def test_runs_reach_the_database_through_the_run_log(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("OSINTHUNTER_LOG_PATH", str(tmp_path / "runs.jsonl"))
+    monkeypatch.setenv("OSINTHUNTER_EVIDENCE_DB_PATH", str(tmp_path / "ev.sqlite3"))
+    close_run_logger()
+    close_evidence_db()
+    try:
+        OSINTAgent().run(ProblemInput(text="Investigate 198.51.100.23 and @sample_user"))
+        close_run_logger()
+        runs = get_evidence_db().runs_for_entity("198.51.100.23")
+        assert len(runs) == 1 and runs[0]["input"].startswith("Investigate")
+    finally:
+        close_evidence_db()
+
+    # Rotated segments can be backfilled into another database.
+    segment = tmp_path / "runs.jsonl.20260101T000000000000Z.gz"
+    with gzip.open(segment, "wt", encoding="utf-8") as fh:
+        fh.write(json.dumps({"ts": "2026-01-01T00:00:00+00:00", "input": "old run @legacy", "evidence": [], "flags": []}) + "\n")
+        fh.write('{"ts": "2026-01-01T00:00:01+00:00", "input": "torn wri\n')
+        fh.write(json.dumps({"ts": "2026-01-01T00:00:02+00:00", "input": "later run @survivor", "evidence": [], "flags": []}) + "\n")
+    other = str(tmp_path / "backfill.sqlite3")
+    rejected = REJECTED.value()
+    assert main(["--path", other, "import", str(tmp_path / "runs.jsonl"), str(segment)]) == 0
+    # The corrupt line in the middle is skipped and counted; the runs around it are kept.
+    assert "Imported 3 run(s)" in capsys.readouterr().out
+    assert REJECTED.value() == rejected + 1
+    assert main(["--path", other, "runs", "legacy"]) == 0
+    assert main(["--path", other, "runs", "survivor"]) == 0
+    assert capsys.readouterr().out.count("1 run(s)") == 2
+
+
+def test_literal_search_bad_records_and_pruning(tmp_path):
+    db = EvidenceDB(tmp_path / "ev.sqlite3")
+    dns = {"source": "web-search", "fact": "Resolver 8.8.8.8 serves example.com, contact alice@example.com", "confidence": 0.5}
+    added = db.record_runs([
+        _record("old", "stale", [dns], ts="2026-01-01T00:00:00+00:00"),
+        {"run_id": "bad", "input": "broken", "evidence": ["not a dict"]},
+        _record("new", "fresh", [dns], ts="2026-03-01T00:00:00+00:00"),
+    ])
+    # The malformed record is skipped without rolling back its neighbours.
+    assert added == 2 and db.run("bad") is None
+
+    # Dots and @ are literal, not FTS5 syntax errors.
+    for query in ("8.8.8.8", "example.com", "alice@example.com"):
+        assert {h["run_id"] for h in db.search(query)} == {"old", "new"}
+    with pytest.raises(ValueError):
+        db.search('"unbalanced', raw=True)
+
+    db.retention_seconds = 30 * 24 * 3600
+    assert db.prune(now=datetime(2026, 3, 2, tzinfo=timezone.utc).timestamp()) == 1
+    assert [h["run_id"] for h in db.search("8.8.8.8")] == ["new"]
+    assert db.run("old") is None and db.stats()["runs"] == 1
+
+    # Over the byte budget the oldest runs go first; the newest is always kept.
+    db.retention_seconds, db.max_bytes = 0, 1
+    db.record_runs([_record("newest", "latest", [dns], ts="2026-03-02T00:00:00+00:00")])
+    assert db.stats()["runs"] == 1 and db.run("newest") is not None
+    db.close()
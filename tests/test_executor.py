@@ -0,0 +1,52 @@
+import time
+
+from osinthunter.executor import ToolExecutor
+from osinthunter.models import Evidence
+
+
+def _job(name, delay, fact=None):
+    def run():
+        time.sleep(delay)
+        return [Evidence(source=name, fact=fact or f"{name} done")]
+
+    return name, run
+
+
+def test_results_keep_submission_order():
+    executor = ToolExecutor(max_workers=4, timeout=5.0)
+    outcomes = executor.run([_job("slow", 0.2), _job("fast", 0.0), _job("mid", 0.1)])
+    executor.shutdown()
+    assert [o.name for o in outcomes] == ["slow", "fast", "mid"]
+    assert all(o.status == "ok" for o in outcomes)
+
+
+def test_timeout_and_errors_become_low_confidence_evidence():
+    def boom():
+        raise RuntimeError("provider down")
+
+    executor = ToolExecutor(max_workers=4, timeout=0.2)
+    start = time.monotonic()
+    outcomes = executor.run([_job("hang", 2.0), ("boom", boom), _job("ok", 0.0)])
+    elapsed = time.monotonic() - start
+    executor.shutdown()
+
+    assert elapsed < 1.5
+    by_name = {o.name: o for o in outcomes}
+    assert by_name["hang"].status == "timeout"
+    assert by_name["hang"].evidence[0].confidence <= 0.2
+    assert by_name["boom"].status == "error"
+    assert "provider down" in by_name["boom"].evidence[0].fact
+    assert by_name["ok"].evidence[0].fact == "ok done"
+
+
+def test_deadline_starts_when_a_tool_gets_a_thread():
+    # Three 0.15s tools through one thread take 0.45s; none exceeds its own 0.3s deadline.
+    executor = ToolExecutor(max_workers=1, timeout=0.3)
+    outcomes = executor.run([_job("a", 0.15), _job("b", 0.15), _job("c", 0.15)])
+    assert [o.status for o in outcomes] == ["ok", "ok", "ok"]
+
+    # A hung tool keeps the only thread after its deadline; the next tool is dropped unrun.
+    outcomes = executor.run([_job("hang", 1.0), _job("starved", 0.0)])
+    executor.shutdown()
+    assert [o.status for o in outcomes] == ["timeout", "timeout"]
+    assert "no worker thread" in outcomes[1].evidence[0].fact
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+import pytest
+
+from osinthunter import metrics
+from osinthunter.models import Evidence, ProblemInput
+from osinthunter.tools import http, ratelimit
+from osinthunter.tools.base import Agent
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    peers: set = set()
+
+    def do_GET(self):
+        self.peers.add(self.client_address)
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    _Handler.peers = set()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    http.close()
+
+
+def test_shared_client_reuses_connections(server):
+    for i in range(5):
+        resp = http.run_sync(http.aget(f"{server}/item/{i}"))
+        assert resp.json() == {"path": f"/item/{i}"}
+    assert len(_Handler.peers) == 1
+
+
+class _SyncAgent(Agent):
+    def __init__(self) -> None:
+        super().__init__(name="sync", description="sync only")
+
+    def run(self, problem: ProblemInput) -> List[Evidence]:
+        return [Evidence(source=self.name, fact=problem.text)]
+
+
+class _AsyncAgent(Agent):
+    def __init__(self) -> None:
+        super().__init__(name="async", description="async only")
+
+    async def arun(self, problem: ProblemInput) -> List[Evidence]:
+        await asyncio.sleep(0)
+        return [Evidence(source=self.name, fact=problem.text)]
+
+
+def test_run_and_arun_are_derived_from_each_other():
+    problem = ProblemInput(text="hello")
+    assert asyncio.run(_SyncAgent().arun(problem))[0].fact == "hello"
+    assert _AsyncAgent().run(problem)[0].fact == "hello"
+    with pytest.raises(NotImplementedError):
+        Agent(name="bare", description="").run(problem)
+    http.close()
+
+
+class _ThrottlingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits: list = []
+
+    def do_GET(self):
+        self.hits.append(time.monotonic())
+        throttled = len(self.hits) == 1
+        body = json.dumps({"n": len(self.hits)}).encode()
+        self.send_response(429 if throttled else 200)
+        if throttled:
+            self.send_header("Retry-After", "1")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_rate_limiter_spaces_calls_and_honours_retry_after(monkeypatch):
+    monkeypatch.setenv("OSINTHUNTER_CACHE", "false")
+    monkeypatch.setenv("OSINTHUNTER_RATE_LIMITS", "testprov=10:1:1")
+    _ThrottlingHandler.hits = []
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _ThrottlingHandler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{srv.server_address[1]}"
+    throttled = metrics.PROVIDER_THROTTLED.value(provider="testprov")
+
+    async def burst():
+        return await asyncio.gather(*(http.fetch_json("testprov", f"{base}/q/{i}", params={"key": "k"}) for i in range(3)))
+
+    try:
+        results = http.run_sync(burst())
+    finally:
+        srv.shutdown()
+        http.close()
+
+    assert sorted(r["n"] for r in results) == [2, 3, 4]
+    gaps = [b - a for a, b in zip(_ThrottlingHandler.hits, _ThrottlingHandler.hits[1:])]
+    assert gaps[0] >= 0.95  # waited out Retry-After before the retry
+    assert all(gap >= 0.09 for gap in gaps)  # never faster than 10/s
+    assert metrics.PROVIDER_THROTTLED.value(provider="testprov") == throttled + 1
+    assert ratelimit.limiter_key("google-lens", {"api_key": "a"}, None) == ratelimit.limiter_key("serpapi", {"api_key": "a"}, None)
+
+
+class _SlowHandler(_Handler):
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        time.sleep(0.2)
+        super().do_GET()
+
+
+def test_identical_concurrent_lookups_share_one_request(monkeypatch):
+    monkeypatch.setenv("OSINTHUNTER_CACHE", "false")
+    monkeypatch.setenv("OSINTHUNTER_RATE_LIMIT", "false")
+    _SlowHandler.hits = 0
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{srv.server_address[1]}"
+    coalesced = metrics.PROVIDER_REQUESTS.value(provider="sf", source="coalesced")
+
+    async def lookups():
+        # Different API keys still describe the same normalized request.
+        same = [http.fetch_json("sf", f"{base}/host/1.2.3.4", params={"key": f"k{i}"}) for i in range(5)]
+        return await asyncio.gather(*same, http.fetch_json("sf", f"{base}/host/5.6.7.8"))
+
+    try:
+        results = http.run_sync(lookups())
+    finally:
+        srv.shutdown()
+        http.close()
+
+    assert _SlowHandler.hits == 2
+    assert [r["path"].split("?")[0] for r in results] == ["/host/1.2.3.4"] * 5 + ["/host/5.6.7.8"]
+    assert metrics.PROVIDER_REQUESTS.value(provider="sf", source="coalesced") == coalesced + 4
@@ -0,0 +1,102 @@
+import random
+
+from PIL import Image, ImageDraw
+
+from osinthunter.models import ProblemInput
+from osinthunter.pivots import EntityGraph
+from osinthunter.tools import image_index
+from osinthunter.tools.image_index import MultiIndex, ImageIndex, hamming
+from osinthunter.tools.image_metadata import file_sha256
+from osinthunter.tools.image_osint import ImageOSINTAgent
+
+
+def _scene(seed: int) -> Image.Image:
+    rng = random.Random(seed)
+    img = Image.new("RGB", (400, 300), (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    draw = ImageDraw.Draw(img)
+    for _ in range(12):
+        x, y = rng.randrange(380), rng.randrange(280)
+        draw.ellipse((x, y, x + rng.randrange(20, 150), y + rng.randrange(20, 150)), fill=tuple(rng.randrange(256) for _ in range(3)))
+    return img
+
+
+def test_multi_index_matches_brute_force():
+    rng = random.Random(7)
+    hashes = {f"k{i}": rng.getrandbits(64) for i in range(2000)}
+    tree = MultiIndex()
+    for key, value in hashes.items():
+        tree.add(value, key)
+    probe = hashes["k42"] ^ 0b1011  # 3 bits away from k42
+    expected = sorted((hamming(probe, v), k) for k, v in hashes.items() if hamming(probe, v) <= 12)
+    assert tree.search(probe, 12) == expected
+    assert expected[0] == (3, "k42")
+
+
+def test_near_duplicate_returns_prior_findings(tmp_path, monkeypatch):
+    monkeypatch.setenv("OSINTHUNTER_CACHE", "false")
+    monkeypatch.setenv("OSINTHUNTER_IMAGE_INDEX_PATH", str(tmp_path / "index.sqlite3"))
+    image_index.close_image_index()
+
+    original, recompressed, other = tmp_path / "original.png", tmp_path / "repost.jpg", tmp_path / "other.png"
+    _scene(1).save(original)
+    _scene(1).crop((8, 6, 392, 294)).resize((300, 225)).save(recompressed, quality=40)
+    _scene(2).save(other)
+
+    image_index.record_runs([{
+        "run_id": "run-1",
+        "images": [str(original), str(other)],
+        "evidence": [
+            {"source": "image-osint", "fact": "Caption: Harbour Bridge flag{in_caption}", "confidence": 0.8, "metadata": {"path": str(original)}},
+            {"source": "image-osint", "fact": "GPS from EXIF: -33.852300, 151.210800", "confidence": 0.7, "metadata": {"path": str(original), "lat": -33.8523, "lon": 151.2108}},
+            {"source": "web-search", "fact": "Unrelated page", "confidence": 0.9},
+        ],
+        "flags": ["flag{from_other_image}"],
+    }])
+    index = image_index.get_image_index()
+    matches = index.lookup(recompressed, file_sha256(recompressed))
+    assert [m.name for m in matches] == ["original.png"]
+    # Only evidence about this image, and only flags it produced, were stored.
+    assert [ev["source"] for ev in matches[0].evidence] == ["image-osint", "image-osint"]
+    assert matches[0].flags == ["flag{in_caption}"] and matches[0].run_id == "run-1"
+    assert index.lookup(other, file_sha256(other))[0].flags == []
+
+    found = ImageOSINTAgent().run(ProblemInput(image_paths=[str(recompressed)]))
+    leads = [ev for ev in found if (ev.metadata or {}).get("prior_match")]
+    # The match carries the earlier run and its flags as structured metadata.
+    assert leads[0].metadata["prior_run_id"] == "run-1"
+    assert leads[0].metadata["prior_flags"] == ["flag{in_caption}"]
+    assert any("Harbour Bridge" in ev.fact for ev in leads)
+    # Earlier findings are pivots the planner acts on, but flag text stays out
+    # of facts so the validator does not take it as this run's flag.
+    assert all(ev.confidence >= 0.5 and "flag{" not in ev.fact for ev in leads)
+    graph = EntityGraph()
+    graph.ingest([{"source": ev.source, "fact": ev.fact, "metadata": ev.metadata} for ev in leads])
+    assert graph.next_frontier(set(), max_depth=1, max_width=10) == ["coordinates:-33.852300, 151.210800"]
+
+    # Reopening rebuilds the in-memory index from disk.
+    image_index.close_image_index()
+    reopened = ImageIndex(tmp_path / "index.sqlite3")
+    assert len(reopened) == 2 and reopened.lookup(recompressed, file_sha256(recompressed))[0].flags == ["flag{in_caption}"]
+    reopened.close()
+
+
+def test_index_without_run_ids_is_migrated(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "old.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE images (sha256 TEXT PRIMARY KEY, phash INTEGER NOT NULL, dhash INTEGER NOT NULL, name TEXT NOT NULL, "
+        "evidence TEXT NOT NULL, flags TEXT NOT NULL, first_seen REAL NOT NULL, last_seen REAL NOT NULL, runs INTEGER NOT NULL DEFAULT 1)"
+    )
+    conn.execute("INSERT INTO images VALUES ('abc', 1, 1, 'old.png', '[]', '[\"flag{old}\"]', 0, 0, 1)")
+    conn.commit()
+    conn.close()
+
+    image = tmp_path / "new.png"
+    _scene(3).save(image)
+    index = ImageIndex(path)
+    index.record(image, file_sha256(image), flags=["flag{new}"], run_id="run-2")
+    assert index.lookup(image, file_sha256(image))[0].run_id == "run-2"
+    assert index.stats()["images"] == 2
+    index.close()
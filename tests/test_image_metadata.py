@@ -0,0 +1,79 @@
+import io
+import struct
+
+from PIL import Image
+from PIL.TiffImagePlugin import IFDRational
+
+from osinthunter.models import ProblemInput
+from osinthunter.tools import image_metadata
+from osinthunter.tools.image_osint import ImageOSINTAgent
+
+
+def _segment(code: int, payload: bytes) -> bytes:
+    return b"\xff" + bytes([code]) + struct.pack(">H", len(payload) + 2) + payload
+
+
+def _jpeg_with_metadata(size=(640, 480)) -> bytes:
+    exif = Image.Exif()
+    exif[0x0110] = "EOS 5D"
+    exif.get_ifd(0x8769)[0x9003] = "2021:05:01 10:00:00"
+    gps = exif.get_ifd(0x8825)
+    gps.update({1: "S", 2: (IFDRational(33), IFDRational(51), IFDRational(0)), 3: "E", 4: (IFDRational(151), IFDRational(12), IFDRational(0))})
+    buf = io.BytesIO()
+    Image.new("RGB", size, (200, 10, 10)).save(buf, "JPEG", exif=exif.tobytes())
+    xmp = b'http://ns.adobe.com/xap/1.0/\x00<rdf:Description xmp:CreatorTool="GIMP" photoshop:City="Sydney"/>'
+    iim = b"\x1c\x02\x78" + struct.pack(">H", 14) + b"flag{in_iptc!}"
+    irb = b"8BIM" + struct.pack(">HxxI", 0x0404, len(iim)) + iim
+    data = buf.getvalue()
+    return data[:2] + _segment(0xE1, xmp) + _segment(0xED, b"Photoshop 3.0\x00" + irb) + data[2:]
+
+
+def test_reads_exif_xmp_iptc_without_pixel_data(tmp_path):
+    path = tmp_path / "photo.jpg"
+    data = _jpeg_with_metadata()
+    # Cut the file right after the start-of-scan marker: no pixel data at all.
+    path.write_bytes(data[: data.index(b"\xff\xda") + 2])
+
+    meta = image_metadata.read_metadata(path)
+    assert (meta["width"], meta["height"]) == (640, 480)
+    assert meta["exif"]["Model"] == "EOS 5D"
+    assert round(meta["gps"]["lat"], 3) == -33.85 and round(meta["gps"]["lon"], 1) == 151.2
+    assert meta["xmp"]["photoshop:City"] == "Sydney"
+    assert meta["iptc"]["Caption"] == "flag{in_iptc!}"
+
+
+def test_metadata_is_cached_by_content_hash(tmp_path, monkeypatch):
+    monkeypatch.setenv("OSINTHUNTER_CACHE", "false")
+    image_metadata.clear_memory_cache()
+    data = _jpeg_with_metadata()
+    paths = [tmp_path / f"copy{i}.jpg" for i in range(6)]
+    for path in paths:
+        path.write_bytes(data)
+
+    calls = []
+    real = image_metadata.read_metadata
+    monkeypatch.setattr(image_metadata, "read_metadata", lambda p: calls.append(p) or real(p))
+    results = image_metadata.image_metadata_many(paths)
+    assert len({r["sha256"] for r in results}) == 1
+    assert len(calls) == 1
+
+    evidence = ImageOSINTAgent().run(ProblemInput(image_paths=[str(paths[0])]))
+    facts = [ev.fact for ev in evidence]
+    assert "Caption: flag{in_iptc!}" in facts
+    assert any(f.startswith("GPS from EXIF: -33.85") for f in facts)
+    image_metadata.clear_memory_cache()
+
+
+def test_corrupt_segments_and_unreadable_paths_are_contained(tmp_path):
+    corrupt = tmp_path / "corrupt.jpg"
+    # A segment length of 1 would otherwise turn into read(-1), i.e. the whole file.
+    corrupt.write_bytes(b"\xff\xd8" + b"\xff\xe1\x00\x01" + b"\x00" * 4096)
+    assert image_metadata.read_metadata(corrupt) == {"format": "jpeg"}
+
+    folder = tmp_path / "not_an_image.jpg"
+    folder.mkdir()
+    evidence = ImageOSINTAgent().run(ProblemInput(image_paths=[str(folder), str(corrupt)]))
+    facts = [ev.fact for ev in evidence]
+    assert any(fact.startswith(f"Cannot read {folder}") for fact in facts)
+    # The readable image next to it is still inspected.
+    assert any(fact.startswith("Inspect corrupt.jpg") for fact in facts)
@@ -0,0 +1,17 @@
+import pytest
+
+from benchmarks.import_time import LAZY_MODULES, offline_run
+
+
+def test_offline_cli_run_skips_heavy_optional_imports():
+    _, loaded = offline_run()
+    assert loaded == [], f"offline text run imported {loaded} (lazy: {LAZY_MODULES})"
+
+
+def test_tool_registry_resolves_lazily():
+    import osinthunter.tools as tools
+
+    assert tools.ShodanAgent.__name__ == "ShodanAgent"
+    assert "ShodanAgent" in dir(tools)
+    with pytest.raises(AttributeError):
+        tools.NoSuchAgent
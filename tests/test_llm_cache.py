@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+from osinthunter import metrics
+from osinthunter.cache import close_response_cache
+from osinthunter.llm_cache import CachedLLM
+
+
+class CountingLLM:
+    def __init__(self):
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return SimpleNamespace(content=f"answer {len(self.prompts)}")
+
+
+def test_repeated_prompts_are_served_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("OSINTHUNTER_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    close_response_cache()
+    hits = metrics.LLM_CACHE.value(result="hit")
+    try:
+        inner = CountingLLM()
+        llm = CachedLLM(inner, model="gpt-4o-mini", base_url="https://openrouter.ai/api/v1")
+        assert llm.invoke("plan this").content == "answer 1"
+        assert llm.invoke("plan this").content == "answer 1"
+        assert llm.invoke("plan that").content == "answer 2"
+        assert len(inner.prompts) == 2
+        assert metrics.LLM_CACHE.value(result="hit") == hits + 1
+
+        # Another model or endpoint does not share answers.
+        CachedLLM(inner, model="gpt-4o").invoke("plan this")
+        assert len(inner.prompts) == 3
+
+        bypass = CachedLLM(inner, model="gpt-4o-mini", base_url="https://openrouter.ai/api/v1", bypass=True)
+        assert bypass.invoke("plan this").content == "answer 4"
+    finally:
+        close_response_cache()
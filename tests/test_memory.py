@@ -0,0 +1,27 @@
+from osinthunter.memory import EvidenceStore
+from osinthunter.models import Evidence
+
+
+def test_store_dedupes_and_indexes():
+    store = EvidenceStore()
+    assert store.add(Evidence(source="shodan", fact="Shodan: 1.2.3.4", confidence=0.6, metadata={"ip": "1.2.3.4"}))
+    # Same (source, fact) with different metadata is still a duplicate.
+    assert not store.add(Evidence(source="shodan", fact="Shodan: 1.2.3.4", confidence=0.6, metadata={"ports": [22]}))
+    store.add(Evidence(source="hunter.io", fact="Hunter: emails", confidence=0.6, metadata={"domain": "Example.com", "emails": ["a@example.com"]}))
+    store.add(Evidence(source="whois", fact="Run whois", confidence=0.35))
+    store.add(Evidence(source="whois", fact=""))
+
+    assert len(store) == 3
+    assert [ev.fact for ev in store.by_source("whois")] == ["Run whois"]
+    assert store.by_entity("1.2.3.4")[0].source == "shodan"
+    assert store.by_entity("example.com")[0].source == "hunter.io"
+    assert store.by_entity("a@example.com")
+    assert {ev.source for ev in store.by_confidence(0.5)} == {"shodan", "hunter.io"}
+    assert Evidence(source="whois", fact="Run whois") in store
+
+
+def test_evidence_is_slotted_and_interned():
+    a = Evidence(source="".join(["web", "-search"]), fact="x")
+    b = Evidence(source="web-search", fact="y")
+    assert a.source is b.source
+    assert not hasattr(a, "__dict__")
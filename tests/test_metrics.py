@@ -0,0 +1,38 @@
+import json
+
+from osinthunter import metrics
+from osinthunter.agent import OSINTAgent
+from osinthunter.models import ProblemInput
+from osinthunter.runlog import close_run_logger
+
+
+def test_histogram_and_counter_render_prometheus_text():
+    hist = metrics.Histogram("test_latency_seconds", "Test latency", buckets=(0.1, 1.0))
+    hist.observe(0.05, provider="a")
+    hist.observe(0.5, provider="a")
+    counter = metrics.Counter("test_errors_total", "Test errors")
+    counter.inc(provider='we"ird')
+
+    text = metrics.render()
+    assert "# TYPE test_latency_seconds histogram" in text
+    assert 'test_latency_seconds_bucket{provider="a",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{provider="a",le="+Inf"} 2' in text
+    assert 'test_latency_seconds_count{provider="a"} 2' in text
+    assert 'test_errors_total{provider="we\\"ird"} 1' in text
+
+
+def test_run_records_node_and_tool_timings(tmp_path, monkeypatch):
+    log_path = tmp_path / "runs.jsonl"
+    monkeypatch.setenv("OSINTHUNTER_LOG_PATH", str(log_path))
+    close_run_logger()
+    before = metrics.NODE_SECONDS.count(node="validator")
+
+    OSINTAgent().run(ProblemInput(text="flag{metrics} from @alice"))
+    close_run_logger()
+
+    record = json.loads(log_path.read_text(encoding="utf-8").splitlines()[-1])
+    timings = record["timings"]
+    assert {"planner", "tools", "validator", "flagger"} <= set(timings["nodes"])
+    assert "text-analysis" in timings["tools"]
+    assert metrics.NODE_SECONDS.count(node="validator") == before + 1
+    assert metrics.TOOL_OUTCOMES.value(tool="text-analysis", status="ok") >= 1
@@ -0,0 +1,74 @@
+from typing import List
+
+from osinthunter.agent import OSINTAgent
+from osinthunter.models import Evidence, ProblemInput
+from osinthunter.pivots import EntityGraph
+from osinthunter.tools.base import Agent
+from osinthunter.tools.sns_osint import SNSOSINTAgent
+
+
+def test_graph_links_metadata_and_expands_breadth_first():
+    graph = EntityGraph()
+    graph.add_input("Who is behind example.com?")
+    graph.ingest([
+        {"source": "hunter.io", "metadata": {"domain": "example.com", "emails": ["alice@example.com", "info@example.com"]}},
+        {"source": "shodan", "metadata": {"ip": "203.0.113.7", "ports": [22, 443]}},
+        {"source": "custom", "metadata": {"domain": "example.com", "ip": "203.0.113.7"}},
+    ])
+    assert "ip:203.0.113.7" in graph.neighbors("domain:example.com")
+    assert "port:203.0.113.7:22" in graph.neighbors("ip:203.0.113.7")
+
+    first = graph.next_frontier(set(), max_depth=2, max_width=10)
+    # Depth 1 (the IP) before depth 2 (the handle behind alice@); emails and ports are not pivoted.
+    assert first == ["ip:203.0.113.7", "handle:alice"]
+    assert graph.next_frontier(set(first), max_depth=2, max_width=10) == []
+    assert graph.next_frontier(set(), max_depth=1, max_width=2) == ["ip:203.0.113.7"]
+
+
+def test_unlinked_tool_entities_are_one_hop_from_the_input():
+    graph = EntityGraph()
+    graph.add_input("Who is behind example.com?")
+    # An IP with only its ports linked, reported by a search over the input.
+    graph.ingest([{"source": "shodan", "metadata": {"ip": "198.51.100.9", "ports": [80]}}])
+    assert graph.next_frontier(set(), max_depth=1, max_width=10) == ["ip:198.51.100.9"]
+
+
+def test_ip_url_host_is_an_ip_node():
+    graph = EntityGraph()
+    graph.add_input("Admin panel at http://203.0.113.7:8080/admin")
+    assert "ip:203.0.113.7" in graph.neighbors("url:http://203.0.113.7:8080/admin")
+    assert "domain:203.0.113.7" not in graph.nodes
+
+
+class _FakeHunter(Agent):
+    """Like HunterAgent, looks up only the first host of its input."""
+
+    depends_on = ("input",)
+    pivots = ("domain",)
+
+    def __init__(self) -> None:
+        super().__init__(name="fake-hunter", description="emails for a domain")
+        self.queries: List[str] = []
+
+    def run(self, problem: ProblemInput) -> List[Evidence]:
+        host = problem.entities().hosts[0]
+        self.queries.append(host)
+        emails = {"example.com": ["alice@example.com", "bob@other.org", "carol@mirror.example"]}.get(host, [])
+        return [Evidence(source=self.name, fact=f"emails for {host}", confidence=0.6, metadata={"domain": host, "emails": emails})]
+
+
+def test_planner_pivots_on_each_new_entity_once(monkeypatch):
+    hunter = _FakeHunter()
+    sns = SNSOSINTAgent()
+    handles: List[str] = []
+    real = sns.run
+    monkeypatch.setattr(sns, "run", lambda problem: handles.extend(problem.entities().handles) or real(problem))
+
+    result = OSINTAgent(tools=[hunter, sns]).run(ProblemInput(text="Find the owner of example.com"))
+
+    # Each domain behind a found email is looked up exactly once, in its own pivot.
+    assert hunter.queries[0] == "example.com"
+    assert sorted(hunter.queries) == sorted(set(hunter.queries))
+    assert {"other.org", "mirror.example"} <= set(hunter.queries)
+    assert handles.count("alice") == 1 and handles.count("bob") == 1
+    assert "Check handle 'alice' on X/Instagram/GitHub/Reddit" in [ev.fact for ev in result.evidence]
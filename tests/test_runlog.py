@@ -0,0 +1,52 @@
+import gzip
+import json
+import threading
+
+from osinthunter.runlog import RunLogger
+
+
+def test_concurrent_records_are_batched_and_not_interleaved(tmp_path):
+    path = tmp_path / "runs.jsonl"
+    logger = RunLogger(path=path, batch_size=16, flush_interval=0.05, max_bytes=0, max_age=0)
+
+    def produce(worker: int) -> None:
+        for i in range(50):
+            logger.log({"worker": worker, "i": i, "evidence": [{"fact": "x" * 200}]})
+
+    threads = [threading.Thread(target=produce, args=(w,)) for w in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert logger.flush()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 200
+    assert all("ts" in json.loads(line) for line in lines)
+    logger.close()
+
+
+def test_rotation_gzips_segments_and_keeps_backups(tmp_path):
+    path = tmp_path / "runs.jsonl"
+    logger = RunLogger(path=path, batch_size=1, max_bytes=300, backups=2)
+    for i in range(10):
+        logger.log({"i": i, "pad": "y" * 300})
+        logger.flush()
+    logger.close()
+
+    segments = sorted(tmp_path.glob("runs.jsonl.*.gz"))
+    assert len(segments) == 2
+    last = json.loads(gzip.decompress(segments[-1].read_bytes()).decode())
+    assert last["i"] == 9
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    logger = RunLogger(path=tmp_path / "runs.jsonl", max_queue=2, batch_size=1, flush_interval=0.01)
+    release = threading.Event()
+    write = logger._write
+    logger._write = lambda batch: (release.wait(5), write(batch))  # stall the writer thread
+
+    results = [logger.log({"i": i}) for i in range(10)]
+    assert results.count(False) >= 7
+    release.set()
+    assert logger.flush()
+    logger.close()
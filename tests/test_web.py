@@ -0,0 +1,243 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from osinthunter.web.concurrency import RunGate
+
+
+def test_gate_offloads_and_rejects_when_full():
+    release = threading.Event()
+
+    async def scenario():
+        gate = RunGate(max_concurrency=1, max_queue=1, queue_timeout=5.0)
+        running = asyncio.ensure_future(gate.run(release.wait))
+        await asyncio.sleep(0.05)
+        queued = asyncio.ensure_future(gate.run(lambda: "second"))
+        await asyncio.sleep(0.05)
+        assert gate.depth()["in_flight"] == 1 and gate.depth()["queued"] == 1
+
+        # The loop is still responsive while a run blocks a worker thread.
+        with pytest.raises(HTTPException) as exc:
+            await gate.run(lambda: "third")
+        assert exc.value.status_code == 429
+        assert exc.value.detail["queued"] == 1
+
+        release.set()
+        assert await running is True
+        assert await queued == "second"
+        gate.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_gate_times_out_waiting_for_slot():
+    release = threading.Event()
+
+    async def scenario():
+        gate = RunGate(max_concurrency=1, max_queue=4, queue_timeout=0.05)
+        running = asyncio.ensure_future(gate.run(release.wait))
+        await asyncio.sleep(0.02)
+        with pytest.raises(HTTPException) as exc:
+            await gate.run(lambda: None)
+        assert exc.value.status_code == 503
+        release.set()
+        await running
+        gate.shutdown()
+
+    asyncio.run(scenario())
+
+
+class _BlockingAgent:
+    def __init__(self, gate: threading.Event) -> None:
+        self.gate = gate
+
+    def stream(self, problem):
+        yield "planner", {"evidence": [], "flags": []}
+        self.gate.wait(5)
+        yield "tools", {"evidence": [{"source": "t", "fact": problem.text}], "flags": []}
+
+    def result_from_state(self, problem, state):
+        return state
+
+
+def test_job_scheduler_runs_cancels_and_retains():
+    from osinthunter.models import ProblemInput
+    from osinthunter.web.jobs import CANCELLED, SUCCEEDED, JobScheduler
+
+    gate = threading.Event()
+    scheduler = JobScheduler(agent_factory=lambda: _BlockingAgent(gate), max_workers=1, max_finished=1)
+    first = scheduler.submit(ProblemInput(text="first"))
+    second = scheduler.submit(ProblemInput(text="second"))
+    assert scheduler.cancel(second.id).status == CANCELLED  # still queued behind `first`
+
+    gate.set()
+    first.future.result(timeout=5)
+    assert scheduler.get(first.id).status == SUCCEEDED
+    assert scheduler.get(first.id).evidence[0]["fact"] == "first"
+    # Only one finished job is retained; the older cancelled one was pruned.
+    assert scheduler.get(second.id) is None
+    scheduler.shutdown()
+
+
+def test_job_scheduler_fails_job_when_agent_cannot_be_built():
+    from osinthunter.models import ProblemInput
+    from osinthunter.web.jobs import FAILED, JobScheduler
+
+    def broken_factory():
+        raise RuntimeError("no config")
+
+    scheduler = JobScheduler(agent_factory=broken_factory, max_workers=1)
+    job = scheduler.submit(ProblemInput(text="x"))
+    job.future.result(timeout=5)
+    assert scheduler.get(job.id).status == FAILED
+    assert scheduler.get(job.id).error == "no config"
+    assert scheduler.get(job.id).finished is not None
+    scheduler.shutdown()
+
+
+def test_stream_endpoint_emits_incremental_events():
+    import json
+
+    from fastapi.testclient import TestClient
+
+    from osinthunter.web.app import app
+
+    with TestClient(app) as client:
+        resp = client.post("/api/run/stream", json={"prompt": "find https://example.com/@alice"})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in resp.text.splitlines() if line]
+
+    kinds = [e["event"] for e in events]
+    assert kinds[0] == "plan"
+    assert "tool" in kinds and "validator" in kinds
+    assert kinds[-1] == "result"
+    # Tool evidence arrives before the validator looks at it.
+    assert kinds.index("tool") < kinds.index("validator")
+    assert any(e["evidence"] for e in events if e["event"] == "tool")
+
+
+def test_stream_endpoint_rejects_before_streaming(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from osinthunter.web import app as web_app
+
+    busy = RunGate(max_concurrency=1, max_queue=1, queue_timeout=0.05)
+    asyncio.run(busy.acquire())  # the only slot stays taken, so the request queues and times out
+    monkeypatch.setattr(web_app, "_gate", busy)
+
+    with TestClient(web_app.app) as client:
+        resp = client.post("/api/run/stream", json={"prompt": "find https://example.com/@alice"})
+
+    # A real 503, not an error event inside a 200 NDJSON stream.
+    assert resp.status_code == 503
+    assert "Retry-After" in resp.headers
+
+
+def test_metrics_endpoint_exposes_prometheus_text():
+    from fastapi.testclient import TestClient
+
+    from osinthunter.web.app import app
+
+    with TestClient(app) as client:
+        client.post("/api/run", json={"prompt": "metrics https://example.com"})
+        resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert "# TYPE osinthunter_node_seconds histogram" in resp.text
+    assert 'osinthunter_tool_outcomes_total{status="ok",tool="url-investigation"}' in resp.text
+    assert "osinthunter_runs_in_flight 0" in resp.text
+
+
+def test_upload_spool_streams_dedupes_and_aborts_over_limit(tmp_path):
+    import hashlib
+    import io
+
+    from starlette.datastructures import UploadFile
+
+    from osinthunter.web.uploads import UploadSpool
+
+    spool = UploadSpool(tmp_path, max_bytes=200 * 1024)
+    data = b"\xff\xd8" + b"x" * 150_000
+
+    async def scenario():
+        first = await spool.save(UploadFile(io.BytesIO(data), filename="a.JPG"))
+        second = await spool.save(UploadFile(io.BytesIO(data), filename="copy.jpg"))
+        with pytest.raises(HTTPException) as exc:
+            await spool.save(UploadFile(io.BytesIO(b"y" * 300_000), filename="big.jpg"))
+        return first, second, exc.value
+
+    first, second, too_big = asyncio.run(scenario())
+    assert first.sha256 == hashlib.sha256(data).hexdigest()
+    assert first.path.name == f"{first.sha256}.jpg" and first.path.read_bytes() == data
+    assert second.reused and second.path == first.path
+    assert too_big.status_code == 413
+    # Only the deduplicated file is left; the aborted partial is gone.
+    assert [p.name for p in tmp_path.iterdir()] == [first.path.name]
+
+
+def test_upload_spool_prunes_off_the_event_loop(tmp_path, monkeypatch):
+    import io
+    import os
+    import threading
+
+    from starlette.datastructures import UploadFile
+
+    from osinthunter.web.uploads import UploadSpool
+
+    spool = UploadSpool(tmp_path, max_bytes=1024, retention_seconds=60.0)
+    stale = tmp_path / "stale.jpg"
+    stale.write_bytes(b"old")
+    os.utime(stale, (0, 0))
+    threads = []
+    prune = spool.prune
+    monkeypatch.setattr(spool, "prune", lambda: threads.append(threading.current_thread()) or prune())
+
+    saved = asyncio.run(spool.save(UploadFile(io.BytesIO(b"new"), filename="new.jpg")))
+    assert threads and threads[0] is not threading.main_thread()
+    assert [p.name for p in tmp_path.iterdir()] == [saved.path.name]
+
+
+def test_gate_process_backend_recycles_warm_workers(tmp_path, monkeypatch):
+    import os
+    from functools import partial
+
+    from osinthunter.batch import run_problem
+    from osinthunter.models import ProblemInput
+    from osinthunter.web.concurrency import agent_process_pool
+
+    log_path = tmp_path / "runs.jsonl"
+    monkeypatch.setenv("OSINTHUNTER_LOG_PATH", str(log_path))
+    monkeypatch.setenv("OSINTHUNTER_EVIDENCE_DB", "false")
+
+    async def scenario():
+        gate = RunGate(max_concurrency=1, process_pool=partial(agent_process_pool, 1, 1))
+        forked = gate.prefork()
+        result = await gate.run_isolated(run_problem, ProblemInput(text="flag{proc} https://example.com/@alice"))
+        later = await gate.run_isolated(os.getpid)
+        gate.shutdown()
+        return forked, result, later
+
+    forked, result, later = asyncio.run(scenario())
+    assert "flag{proc}" in result.flag_candidates and result.evidence
+    # Each worker retires after one task, the warm-up call included, so every call lands on a fresh process.
+    assert len(forked) == 1 and later not in forked and later != os.getpid()
+    # The retired worker flushed its run log on the way out.
+    assert "flag{proc}" in log_path.read_text(encoding="utf-8")
+
+
+def test_form_post_renders_result_unless_streaming_requested():
+    from fastapi.testclient import TestClient
+
+    from osinthunter.web.app import app
+
+    with TestClient(app) as client:
+        plain = client.post("/run", data={"prompt": "flag{form_post} https://example.com/@alice"})
+        streamed = client.post("/run", data={"prompt": "flag{form_post}", "stream": "1"})
+
+    # Without JS the finished result is rendered server-side.
+    assert plain.status_code == 200
+    assert "<li>flag{form_post}</li>" in plain.text and "/api/run/stream" not in plain.text
+    assert "/api/run/stream" in streamed.text